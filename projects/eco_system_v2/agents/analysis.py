@@ -37,8 +37,15 @@ _USER_TEMPLATE = """\
 
 
 class AnalysisAgent(BaseAgent):
-    def __init__(self, api_key: str = "", model: str = "claude-sonnet-4-6") -> None:
-        super().__init__("analysis", max_retries=2, timeout_sec=60.0)
+    def __init__(
+        self,
+        api_key: str = "",
+        model: str = "claude-sonnet-4-6",
+        hedge: bool = False,
+    ) -> None:
+        super().__init__(
+            "analysis", max_retries=2, timeout_sec=60.0, hedge=hedge, hedge_after_sec=20.0
+        )
         self._api_key = api_key
         self._model = model
         self._client = None  # lazy init
@@ -50,14 +57,26 @@ class AnalysisAgent(BaseAgent):
         return self._client
 
     async def execute(self, market_data: MarketData, context: str = "") -> EconomicSignal:
-        if not self._api_key:
-            raise ValueError("AnalysisAgent: ANTHROPIC_API_KEY 없음")
-
         prompt = _USER_TEMPLATE.format(
             market_context=market_data.to_prompt_context(),
             context=context or "추가 컨텍스트 없음.",
         )
 
+        raw = await self._request(prompt)
+        parsed = _parse_json(raw)
+        logger.info(f"[analysis] signal={parsed.get('signal')} conf={parsed.get('confidence')}")
+
+        return EconomicSignal(
+            agent=self.name,
+            signal=Signal(parsed.get("signal", "NEUTRAL")),
+            confidence=float(parsed.get("confidence", 0.5)),
+            rationale=parsed.get("rationale", raw[:300]),
+        )
+
+    async def _call_api(self, prompt: str) -> str:
+        if not self._api_key:
+            raise ValueError("AnalysisAgent: ANTHROPIC_API_KEY 없음")
+
         # 동기 SDK → executor로 비동기 래핑
         loop = asyncio.get_event_loop()
         message = await loop.run_in_executor(
@@ -69,17 +88,7 @@ class AnalysisAgent(BaseAgent):
                 messages=[{"role": "user", "content": prompt}],
             ),
         )
-
-        raw = message.content[0].text
-        parsed = _parse_json(raw)
-        logger.info(f"[analysis] signal={parsed.get('signal')} conf={parsed.get('confidence')}")
-
-        return EconomicSignal(
-            agent=self.name,
-            signal=Signal(parsed.get("signal", "NEUTRAL")),
-            confidence=float(parsed.get("confidence", 0.5)),
-            rationale=parsed.get("rationale", raw[:300]),
-        )
+        return message.content[0].text
 
 
 def _parse_json(text: str) -> dict:
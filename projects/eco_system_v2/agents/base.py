@@ -2,8 +2,10 @@
 agents/base.py — BaseAgent
 
 모든 에이전트의 베이스 클래스.
-- async execute() 추상 메서드
+- async execute() / _call_api() 추상 메서드
 - run()에서 재시도 + asyncio.wait_for 타임아웃 처리
+- hedge=True이면 지연 백분위 임계값 초과 시 백업 시도를 띄우고 먼저 성공한 결과 채택
+- 외부 API 호출은 _request() → _call_api() 경유 (cassette가 있으면 기록/재생)
 
 규칙: BaseAgent를 상속하지 않은 에이전트는 Orchestrator에 등록 불가.
 """
@@ -13,6 +15,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from collections import deque
 
 from domain.signal import EconomicSignal
 from domain.market_data import MarketData
@@ -20,6 +23,28 @@ from domain.market_data import MarketData
 logger = logging.getLogger(__name__)
 
 
+class LatencyTracker:
+    """
+    성공한 execute() 지연(초)을 최근 window개만 보관 → 백분위 산출.
+
+    표본이 min_samples 미만이면 percentile()은 None (콜드 스타트).
+    """
+
+    def __init__(self, window: int = 50, min_samples: int = 5) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[idx]
+
+
 class BaseAgent(ABC):
     """
     에이전트 Bounded Context의 공통 인터페이스.
@@ -27,6 +52,10 @@ class BaseAgent(ABC):
     name: 에이전트 식별자 (로그, 합의 결과에 사용)
     max_retries: execute() 실패 시 최대 재시도 횟수
     timeout_sec: 단일 시도 타임아웃 (초)
+    hedge: True이면 헤지(백업) 요청 사용
+    hedge_after_sec: 지연 기록이 부족할 때 쓰는 헤지 임계값 (None → timeout_sec / 3)
+    hedge_percentile: 지연 기록이 충분할 때 헤지 임계값으로 쓰는 백분위
+    cassette: 기록/재생 어댑터 (infrastructure.cassette.Cassette, None → 항상 실제 호출)
     """
 
     def __init__(
@@ -34,26 +63,51 @@ class BaseAgent(ABC):
         name: str,
         max_retries: int = 2,
         timeout_sec: float = 30.0,
+        hedge: bool = False,
+        hedge_after_sec: float | None = None,
+        hedge_percentile: float = 0.95,
     ) -> None:
         self.name = name
         self.max_retries = max_retries
         self.timeout_sec = timeout_sec
+        self.hedge = hedge
+        self.hedge_after_sec = hedge_after_sec
+        self.hedge_percentile = hedge_percentile
+        self._latency = LatencyTracker()
+        self.cassette = None
 
     @abstractmethod
     async def execute(self, market_data: MarketData, context: str = "") -> EconomicSignal:
         """에이전트 핵심 로직. 서브클래스에서 구현."""
         ...
 
+    @abstractmethod
+    async def _call_api(self, prompt: str) -> str:
+        """외부 API 1회 호출 → 응답 원문. 서브클래스에서 구현 (미구현 시 생성 단계에서 TypeError)."""
+        ...
+
+    async def _request(self, prompt: str) -> str:
+        """_call_api() 래퍼 — cassette가 있으면 교환을 기록하거나 기록된 응답을 재생"""
+        if self.cassette is None:
+            return await self._call_api(prompt)
+        return await self.cassette.exchange(self.name, prompt, lambda: self._call_api(prompt))
+
     async def run(self, market_data: MarketData, context: str = "") -> EconomicSignal:
         """재시도 + 타임아웃 래퍼"""
         last_exc: Exception = RuntimeError(f"[{self.name}] 알 수 없는 오류")
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                return await asyncio.wait_for(
+                if self.hedge:
+                    return await self._execute_hedged(market_data, context)
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                result = await asyncio.wait_for(
                     self.execute(market_data, context),
                     timeout=self.timeout_sec,
                 )
+                self._latency.record(loop.time() - started)
+                return result
             except asyncio.TimeoutError:
                 last_exc = TimeoutError(
                     f"[{self.name}] attempt {attempt} timed out ({self.timeout_sec}s)"
@@ -67,3 +121,63 @@ class BaseAgent(ABC):
                 await asyncio.sleep(1.0)
 
         raise last_exc
+
+    def _hedge_delay(self) -> float:
+        """헤지 임계값: 지연 백분위 → hedge_after_sec → timeout_sec / 3 순"""
+        observed = self._latency.percentile(self.hedge_percentile)
+        if observed is not None:
+            return observed
+        if self.hedge_after_sec is not None:
+            return self.hedge_after_sec
+        return self.timeout_sec / 3
+
+    async def _execute_hedged(self, market_data: MarketData, context: str) -> EconomicSignal:
+        """
+        1차 시도가 헤지 임계값 안에 끝나지 않으면 백업 시도를 동시에 띄우고
+        먼저 성공한 결과를 반환. 전체 시도는 timeout_sec 안에 끝나야 한다.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout_sec
+        hedge_at = started + self._hedge_delay()
+
+        started_at = {asyncio.create_task(self.execute(market_data, context)): started}
+        pending = set(started_at)
+        hedged = False
+        last_exc: BaseException | None = None
+
+        try:
+            while pending:
+                now = loop.time()
+                if now >= deadline:
+                    raise asyncio.TimeoutError
+                wait_until = deadline if hedged else min(deadline, hedge_at)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wait_until - now),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        self._latency.record(loop.time() - started_at[task])
+                        if hedged:
+                            logger.info(f"[{self.name}] hedge 경쟁 종료 ({loop.time() - started:.1f}s)")
+                        return task.result()
+                    last_exc = exc
+                    logger.warning(f"[{self.name}] hedged 시도 실패: {exc}")
+
+                if not done and not hedged and loop.time() >= hedge_at:
+                    hedged = True
+                    logger.info(
+                        f"[{self.name}] {hedge_at - started:.1f}s 초과 — 백업 요청 발사 (hedge)"
+                    )
+                    backup = asyncio.create_task(self.execute(market_data, context))
+                    started_at[backup] = loop.time()
+                    pending.add(backup)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_exc or RuntimeError(f"[{self.name}] hedged 시도 결과 없음")
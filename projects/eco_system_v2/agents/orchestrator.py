@@ -17,7 +17,7 @@ from datetime import date
 from agents.base import BaseAgent
 from agents.research import ResearchAgent
 from agents.analysis import AnalysisAgent
-from domain.consensus import ConsensusService
+from domain.consensus import ConsensusService, ConsensusStrategy
 from domain.market_data import MarketData
 from domain.signal import EconomicSignal
 
@@ -56,6 +56,10 @@ class Orchestrator:
 
     quick 모드: AnalysisAgent만 실행 (30초 이내)
     full 모드: ResearchAgent + AnalysisAgent 병렬
+    hedge: 스포크별 헤지(백업) 요청 사용 — BaseAgent 참고
+    consensus: 합의 전략 (None → MajorityVote) — domain/consensus.py 참고
+    early_exit (run 인자): 합의 신호가 확정되면 남은 스포크를 기다리지 않고 취소
+    cassette: 스포크 API 교환 기록/재생 — infrastructure/cassette.py 참고
     """
 
     def __init__(
@@ -64,9 +68,19 @@ class Orchestrator:
         perplexity_api_key: str = "",
         claude_model: str = "claude-sonnet-4-6",
         perplexity_model: str = "sonar",
+        hedge: bool = False,
+        consensus: ConsensusStrategy | None = None,
+        cassette=None,
     ) -> None:
-        self._analysis = AnalysisAgent(api_key=anthropic_api_key, model=claude_model)
-        self._research = ResearchAgent(api_key=perplexity_api_key, model=perplexity_model)
+        self._analysis = AnalysisAgent(
+            api_key=anthropic_api_key, model=claude_model, hedge=hedge
+        )
+        self._research = ResearchAgent(
+            api_key=perplexity_api_key, model=perplexity_model, hedge=hedge
+        )
+        self._consensus = consensus
+        for spoke in (self._analysis, self._research):
+            spoke.cassette = cassette
 
     def _get_spokes(self, quick: bool) -> list[BaseAgent]:
         if quick:
@@ -78,15 +92,19 @@ class Orchestrator:
         market_data: MarketData,
         context: str = "",
         quick: bool = False,
+        early_exit: bool = False,
     ) -> EcoResult:
         spokes = self._get_spokes(quick)
         mode = "quick" if quick else "full"
         logger.info(f"[Orchestrator] {mode} 모드 — {len(spokes)}개 에이전트 병렬 실행")
 
-        raw_results = await asyncio.gather(
-            *[spoke.run(market_data, context) for spoke in spokes],
-            return_exceptions=True,
-        )
+        if early_exit:
+            raw_results = await self._gather_until_settled(spokes, market_data, context)
+        else:
+            raw_results = await asyncio.gather(
+                *[spoke.run(market_data, context) for spoke in spokes],
+                return_exceptions=True,
+            )
 
         valid: list[EconomicSignal] = []
         for r in raw_results:
@@ -95,7 +113,7 @@ class Orchestrator:
             else:
                 logger.warning(f"[Orchestrator] 에이전트 실패: {r}")
 
-        consensus = ConsensusService.compute(valid)
+        consensus = ConsensusService.compute(valid, self._consensus)
         logger.info(
             f"[Orchestrator] 합의 완료: {consensus.signal.value} "
             f"(conf={consensus.confidence:.0%})"
@@ -106,3 +124,46 @@ class Orchestrator:
             agent_signals=valid,
             market_data=market_data,
         )
+
+    async def _gather_until_settled(
+        self,
+        spokes: list[BaseAgent],
+        market_data: MarketData,
+        context: str,
+    ) -> list:
+        """
+        스포크를 병렬 실행하되 ConsensusService.is_settled()가 True가 되면
+        남은 스포크를 취소하고 반환. 결과 순서는 스포크 순서 유지 (다수결 동률 처리 일관성).
+        full 모드(스포크 2개)에서는 선순위 research가 먼저 도착하면 확정 — 동률이어도 research 신호가
+        이기므로 analysis를 기다리지 않는다. analysis가 먼저 오면 research를 기다린다.
+        """
+        tasks = [asyncio.create_task(spoke.run(market_data, context)) for spoke in spokes]
+        results: list = [None] * len(tasks)
+        pending = set(tasks)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    results[tasks.index(task)] = task.exception() or task.result()
+
+                arrived = [r for r in results if isinstance(r, EconomicSignal)]
+                # 대기 스포크가 모두 첫 도착 신호보다 뒤 순서면 동률은 그 신호 쪽으로 결정됨
+                first = next((i for i, r in enumerate(results) if isinstance(r, EconomicSignal)), None)
+                pending_after = first is not None and all(tasks.index(t) > first for t in pending)
+                if pending and ConsensusService.is_settled(
+                    arrived,
+                    pending=len(pending),
+                    strategy=self._consensus,
+                    pending_after=pending_after,
+                ):
+                    skipped = ", ".join(spokes[tasks.index(t)].name for t in pending)
+                    logger.info(f"[Orchestrator] 합의 조기 확정 — 대기 취소: {skipped}")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return [r for r in results if r is not None]
@@ -39,20 +39,34 @@ Analyze the current macroeconomic conditions and respond ONLY with valid JSON:
 
 
 class ResearchAgent(BaseAgent):
-    def __init__(self, api_key: str = "", model: str = "sonar") -> None:
-        super().__init__("research", max_retries=2, timeout_sec=45.0)
+    def __init__(self, api_key: str = "", model: str = "sonar", hedge: bool = False) -> None:
+        super().__init__(
+            "research", max_retries=2, timeout_sec=45.0, hedge=hedge, hedge_after_sec=15.0
+        )
         self._api_key = api_key
         self._model = model
 
     async def execute(self, market_data: MarketData, context: str = "") -> EconomicSignal:
-        if not self._api_key:
-            raise ValueError("ResearchAgent: PERPLEXITY_API_KEY 없음")
-
         prompt = _USER_TEMPLATE.format(
             market_context=market_data.to_prompt_context(),
             context=context or "No additional context.",
         )
 
+        raw = await self._request(prompt)
+        parsed = _parse_json(raw)
+        logger.info(f"[research] signal={parsed.get('signal')} conf={parsed.get('confidence')}")
+
+        return EconomicSignal(
+            agent=self.name,
+            signal=Signal(parsed.get("signal", "NEUTRAL")),
+            confidence=float(parsed.get("confidence", 0.5)),
+            rationale=parsed.get("rationale", raw[:300]),
+        )
+
+    async def _call_api(self, prompt: str) -> str:
+        if not self._api_key:
+            raise ValueError("ResearchAgent: PERPLEXITY_API_KEY 없음")
+
         async with httpx.AsyncClient(timeout=self.timeout_sec) as client:
             resp = await client.post(
                 "https://api.perplexity.ai/chat/completions",
@@ -66,17 +80,7 @@ class ResearchAgent(BaseAgent):
                 },
             )
             resp.raise_for_status()
-            raw = resp.json()["choices"][0]["message"]["content"]
-
-        parsed = _parse_json(raw)
-        logger.info(f"[research] signal={parsed.get('signal')} conf={parsed.get('confidence')}")
-
-        return EconomicSignal(
-            agent=self.name,
-            signal=Signal(parsed.get("signal", "NEUTRAL")),
-            confidence=float(parsed.get("confidence", 0.5)),
-            rationale=parsed.get("rationale", raw[:300]),
-        )
+            return resp.json()["choices"][0]["message"]["content"]
 
 
 def _parse_json(text: str) -> dict:
@@ -50,6 +50,22 @@ class Config:
     OUTPUT_DIR: str = field(
         default_factory=lambda: os.getenv("OUTPUT_DIR", "outputs")
     )
+    SIGNAL_DB: str = field(
+        default_factory=lambda: os.getenv("SIGNAL_DB", "outputs/signals.db")
+    )
+
+    # 지표 유니버스: "KEY=TICKER,KEY=TICKER" (TICKER만 쓰면 KEY=TICKER). 빈 값 → 기본 유니버스
+    MARKET_UNIVERSE: str = field(
+        default_factory=lambda: os.getenv("MARKET_UNIVERSE", "")
+    )
+
+    def market_universe(self) -> dict[str, str] | None:
+        """MARKET_UNIVERSE 파싱. 비어 있으면 None (collector 기본 유니버스 사용)."""
+        universe = {}
+        for item in filter(None, (s.strip() for s in self.MARKET_UNIVERSE.split(","))):
+            key, _, ticker = item.partition("=")
+            universe[key.strip()] = (ticker or key).strip()
+        return universe or None
 
     def validate(self, quick: bool = False) -> None:
         """필수 키 검증. quick 모드는 ANTHROPIC_API_KEY만 필요."""
@@ -1,6 +1,24 @@
 # domain — 순수 도메인 레이어 (외부 의존성 없음)
 from .signal import Signal, EconomicSignal
-from .market_data import MarketData
-from .consensus import ConsensusService
+from .market_data import MarketData, Indicator
+from .consensus import (
+    ConsensusService,
+    ConsensusStrategy,
+    MajorityVote,
+    WeightedVote,
+    BayesianVote,
+    build_strategy,
+)
 
-__all__ = ["Signal", "EconomicSignal", "MarketData", "ConsensusService"]
+__all__ = [
+    "Signal",
+    "EconomicSignal",
+    "MarketData",
+    "Indicator",
+    "ConsensusService",
+    "ConsensusStrategy",
+    "MajorityVote",
+    "WeightedVote",
+    "BayesianVote",
+    "build_strategy",
+]
@@ -1,18 +1,192 @@
 """
-domain/consensus.py — ConsensusService (Domain Service)
+domain/consensus.py — ConsensusService (Domain Service) + 합의 전략
 
 다수결 + 가중 신뢰도 합의 로직. 순수 함수, 외부 의존성 없음.
 
+전략 (ConsensusStrategy):
+  MajorityVote  : 다수결, 동의 에이전트 평균 신뢰도 (기본값)
+  WeightedVote  : 에이전트 가중치 × 신뢰도 합으로 투표 (가중치 없으면 신뢰도 가중)
+  BayesianVote  : 에이전트 신뢰성(reliability)을 정확도로 보는 베이즈 사후확률
+
+대량 재채점(백테스트)용 NumPy 벡터 구현은 infrastructure/consensus_accel.py —
+여기 전략 객체의 파라미터를 그대로 읽고 동점 처리용 등장 순서도 기록 순서로 재생하므로 두 경로의 결과가 같다.
+
 규칙: 이 파일은 stdlib 외 import 금지 (anthropic, httpx, yfinance 등 절대 금지).
 """
 
 from __future__ import annotations
 
-from collections import Counter
+import math
+from abc import ABC, abstractmethod
 from datetime import datetime
 
 from .signal import EconomicSignal, Signal
 
+# 가중치/신뢰성 정보가 없는 에이전트의 기본값
+DEFAULT_WEIGHT = 1.0
+DEFAULT_RELIABILITY = 0.6
+
+# BayesianVote 정확도 상한 (log(1-p) 발산 방지)
+MAX_ACCURACY = 0.99
+
+# 점수 비교 자릿수 — 합산 순서에 따른 부동소수 오차로 동점 판정이 갈리지 않도록
+SCORE_DECIMALS = 9
+
+
+def _first_seen(signals: list[EconomicSignal]) -> list[Signal]:
+    """등장 순서대로 중복 없는 신호 목록 — 동점 시 먼저 등장한 신호 우선"""
+    return list(dict.fromkeys(s.signal for s in signals))
+
+
+class ConsensusStrategy(ABC):
+    """
+    합의 전략 인터페이스.
+
+    scores(): 모든 Signal에 대한 점수 (높을수록 우세)
+    confidence(): 승자 신호의 합의 신뢰도 (0~1)
+    swing: 대기 중인 에이전트 1명이 1·2위 점수 차를 줄일 수 있는 최대폭 (조기 확정 판단용)
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def scores(self, signals: list[EconomicSignal]) -> dict[Signal, float]:
+        ...
+
+    @abstractmethod
+    def confidence(
+        self,
+        signals: list[EconomicSignal],
+        winner: Signal,
+        scores: dict[Signal, float],
+    ) -> float:
+        ...
+
+    @property
+    @abstractmethod
+    def swing(self) -> float:
+        ...
+
+    def decide(self, signals: list[EconomicSignal]) -> tuple[Signal, float]:
+        """표를 받은 신호 중 최고 점수 (동점 → 먼저 등장) + 신뢰도"""
+        scores = self.scores(signals)
+        winner = max(_first_seen(signals), key=lambda sig: round(scores[sig], SCORE_DECIMALS))
+        return winner, self.confidence(signals, winner, scores)
+
+
+class MajorityVote(ConsensusStrategy):
+    """다수결 신호 + 동의 에이전트 평균 신뢰도 (기존 ConsensusService 동작)"""
+
+    name = "majority"
+
+    def scores(self, signals: list[EconomicSignal]) -> dict[Signal, float]:
+        counts = {sig: 0.0 for sig in Signal}
+        for s in signals:
+            counts[s.signal] += 1.0
+        return counts
+
+    def confidence(self, signals, winner, scores) -> float:
+        agreeing = [s.confidence for s in signals if s.signal == winner]
+        return sum(agreeing) / len(agreeing)
+
+    @property
+    def swing(self) -> float:
+        return 1.0
+
+
+class WeightedVote(ConsensusStrategy):
+    """
+    에이전트 가중치 w × 신뢰도 c의 합으로 투표.
+
+    weights=None → 모든 에이전트 w=1 (신뢰도 가중 투표)
+    신뢰도 = Σ(동의 w·c) / Σ(전체 w) — 반대 의견이 많을수록 낮아진다.
+    """
+
+    def __init__(self, weights: dict[str, float] | None = None) -> None:
+        self.weights = dict(weights or {})
+        self.name = "reliability" if self.weights else "weighted"
+
+    def weight(self, agent: str) -> float:
+        return self.weights.get(agent, DEFAULT_WEIGHT)
+
+    def scores(self, signals: list[EconomicSignal]) -> dict[Signal, float]:
+        mass = {sig: 0.0 for sig in Signal}
+        for s in signals:
+            mass[s.signal] += self.weight(s.agent) * s.confidence
+        return mass
+
+    def confidence(self, signals, winner, scores) -> float:
+        total = sum(self.weight(s.agent) for s in signals)
+        return scores[winner] / total if total > 0 else 0.0
+
+    @property
+    def swing(self) -> float:
+        return max([DEFAULT_WEIGHT, *self.weights.values()])
+
+
+class BayesianVote(ConsensusStrategy):
+    """
+    각 에이전트를 정확도 p인 잡음 관측으로 보고 사후확률이 최대인 신호 선택.
+
+    p = 1/3 + (reliability - 1/3) × confidence  (confidence=0 → 무정보)
+    P(표=k | 실제=k) = p, P(표=j≠k | 실제=k) = (1-p)/2
+    신뢰도 = 승자 신호의 사후확률.
+    """
+
+    name = "bayesian"
+
+    def __init__(
+        self,
+        reliability: dict[str, float] | None = None,
+        prior: dict[Signal, float] | None = None,
+    ) -> None:
+        self.reliability = dict(reliability or {})
+        self.prior = dict(prior or {sig: 1.0 / len(Signal) for sig in Signal})
+
+    def accuracy(self, agent: str, confidence: float) -> float:
+        r = self.reliability.get(agent, DEFAULT_RELIABILITY)
+        p = 1.0 / 3 + (r - 1.0 / 3) * confidence
+        return min(max(p, 1.0 / 3), MAX_ACCURACY)
+
+    def scores(self, signals: list[EconomicSignal]) -> dict[Signal, float]:
+        log_post = {sig: math.log(self.prior[sig]) for sig in Signal}
+        for s in signals:
+            p = self.accuracy(s.agent, s.confidence)
+            for sig in Signal:
+                log_post[sig] += math.log(p) if s.signal == sig else math.log((1 - p) / 2)
+        return log_post
+
+    def confidence(self, signals, winner, scores) -> float:
+        top = max(scores.values())
+        norm = sum(math.exp(v - top) for v in scores.values())
+        return math.exp(scores[winner] - top) / norm
+
+    @property
+    def swing(self) -> float:
+        r = max([DEFAULT_RELIABILITY, *self.reliability.values()])
+        p = min(max(r, 1.0 / 3), MAX_ACCURACY)
+        return math.log(p) - math.log((1 - p) / 2)
+
+
+STRATEGIES = ("majority", "weighted", "reliability", "bayesian")
+
+
+def build_strategy(name: str, reliability: dict[str, float] | None = None) -> ConsensusStrategy:
+    """
+    이름 → 전략 객체. reliability는 에이전트별 적중률 (백테스트 학습 결과).
+
+    reliability 전략은 적중률을 가중치로 쓰는 WeightedVote.
+    """
+    if name == "majority":
+        return MajorityVote()
+    if name == "weighted":
+        return WeightedVote()
+    if name == "reliability":
+        return WeightedVote(weights=reliability or {})
+    if name == "bayesian":
+        return BayesianVote(reliability=reliability)
+    raise ValueError(f"알 수 없는 합의 전략: {name} (가능: {', '.join(STRATEGIES)})")
+
 
 class ConsensusService:
     """
@@ -21,12 +195,52 @@ class ConsensusService:
     사용법:
         signals = [signal_a, signal_b, ...]
         result = ConsensusService.compute(signals)
+        result = ConsensusService.compute(signals, strategy=BayesianVote(reliability))
+
+        # 응답 대기 중인 에이전트 수를 알면 조기 확정 여부 판단 가능
+        settled = ConsensusService.is_settled(signals, pending=1)
     """
 
     @staticmethod
-    def compute(signals: list[EconomicSignal]) -> EconomicSignal:
+    def is_settled(
+        signals: list[EconomicSignal],
+        pending: int,
+        strategy: ConsensusStrategy | None = None,
+        pending_after: bool = False,
+    ) -> bool:
+        """
+        남은 pending개 응답이 모두 도착해도 compute()의 합의 신호가 바뀔 수 없으면 True.
+
+        pending개가 전부 2위 신호에 몰려도(1명당 최대 strategy.swing) 1위를 넘거나
+        동률이 될 수 없어야 확정. 동률이면 compute()는 먼저 등장한 신호를 고르므로,
+        pending_after=True(대기 응답이 모두 signals 뒤에 붙음)이고 1위가 signals[0]의 신호면
+        동률까지는 1위가 유지되어 확정으로 본다 — 스포크 2개(full 모드)도 선순위 스포크가
+        먼저 도착하면 확정될 수 있다.
+        확정 이후 도착하는 동의 에이전트는 신호가 아니라 신뢰도만 바꾼다.
         """
-        다수결 신호 + 동의 에이전트 평균 신뢰도로 합의 EconomicSignal 반환.
+        if pending <= 0:
+            return True
+        if not signals:
+            return False
+        strategy = strategy or MajorityVote()
+        scores = strategy.scores(signals)
+        leader, _ = strategy.decide(signals)
+        runner_up = max(v for sig, v in scores.items() if sig != leader)
+        # 동률 판정은 decide()와 같은 자릿수 기준 — 부동소수 오차를 미확정 쪽으로 흡수
+        gap = round(scores[leader] - runner_up, SCORE_DECIMALS)
+        limit = round(pending * strategy.swing, SCORE_DECIMALS)
+        if pending_after and signals[0].signal == leader:
+            return gap >= limit
+        return gap > limit
+
+    @staticmethod
+    def compute(
+        signals: list[EconomicSignal],
+        strategy: ConsensusStrategy | None = None,
+    ) -> EconomicSignal:
+        """
+        합의 EconomicSignal 반환. strategy 생략 시 MajorityVote
+        (다수결 신호 + 동의 에이전트 평균 신뢰도).
 
         빈 리스트 → NEUTRAL, confidence=0.0
         """
@@ -39,27 +253,31 @@ class ConsensusService:
                 timestamp=datetime.now().isoformat(),
             )
 
-        # 다수결 신호 결정
-        signal_counts: Counter[Signal] = Counter(s.signal for s in signals)
-        majority_signal: Signal = signal_counts.most_common(1)[0][0]
-
-        # 다수결 신호에 동의한 에이전트만 신뢰도 평균
-        agreeing = [s for s in signals if s.signal == majority_signal]
-        avg_confidence = sum(s.confidence for s in agreeing) / len(agreeing)
+        strategy = strategy or MajorityVote()
+        winner, confidence = strategy.decide(signals)
+        confidence = min(max(confidence, 0.0), 1.0)
 
         # 합의 근거 요약
+        agreeing = [s for s in signals if s.signal == winner]
         names = ", ".join(s.agent for s in agreeing)
         total = len(signals)
-        rationale = (
-            f"{majority_signal.value} 합의 "
-            f"({len(agreeing)}/{total}명 동의: {names}), "
-            f"평균 신뢰도 {avg_confidence:.0%}"
-        )
+        if strategy.name == "majority":
+            rationale = (
+                f"{winner.value} 합의 "
+                f"({len(agreeing)}/{total}명 동의: {names}), "
+                f"평균 신뢰도 {confidence:.0%}"
+            )
+        else:
+            rationale = (
+                f"{winner.value} 합의 [{strategy.name}] "
+                f"({len(agreeing)}/{total}명 동의: {names}), "
+                f"신뢰도 {confidence:.0%}"
+            )
 
         return EconomicSignal(
             agent="consensus",
-            signal=majority_signal,
-            confidence=round(avg_confidence, 4),
+            signal=winner,
+            confidence=round(confidence, 4),
             rationale=rationale,
             timestamp=datetime.now().isoformat(),
         )
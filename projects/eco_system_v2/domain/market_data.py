@@ -10,6 +10,41 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
+@dataclass(frozen=True)
+class Indicator:
+    """
+    지표 유니버스 1개 종목의 파생 피처 — Value Object (불변).
+
+    key: 표시 이름 (DXY, US10Y, XLK ...)
+    ticker: yfinance 심볼
+    last: 최근 종가
+    return_30d: 22거래일 수익률 (%)
+    zscore: 수집 구간 평균 대비 현재 수준 z-score
+    realized_vol: 21거래일 실현 변동성 (연율화 %)
+    """
+
+    key: str
+    ticker: str
+    last: float
+    return_30d: float
+    zscore: float
+    realized_vol: float
+
+    def to_dict(self) -> dict:
+        return {
+            "key": self.key,
+            "ticker": self.ticker,
+            "last": self.last,
+            "return_30d": self.return_30d,
+            "zscore": self.zscore,
+            "realized_vol": self.realized_vol,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Indicator":
+        return cls(**{k: data[k] for k in ("key", "ticker", "last", "return_30d", "zscore", "realized_vol")})
+
+
 @dataclass(frozen=True)
 class MarketData:
     """
@@ -20,6 +55,7 @@ class MarketData:
     spx_return_30d: S&P500 30일 수익률 (%)
     fed_rate: 연방기금금리 (%)
     collected_at: 수집 시각 ISO 8601
+    indicators: 지표 유니버스 파생 피처 (금리, 달러, 크레딧, 섹터 ETF 등)
     """
 
     vix_current: float = 0.0
@@ -27,14 +63,22 @@ class MarketData:
     spx_return_30d: float = 0.0
     fed_rate: float = 0.0
     collected_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    indicators: tuple[Indicator, ...] = ()
 
     def to_prompt_context(self) -> str:
-        """에이전트 프롬프트에 삽입할 텍스트 요약"""
-        return (
+        """에이전트 프롬프트에 삽입할 텍스트 요약 (지표가 있으면 압축 테이블 추가)"""
+        summary = (
             f"VIX: {self.vix_current:.1f} (30d avg {self.vix_30d_avg:.1f}), "
             f"S&P500 30d return: {self.spx_return_30d:+.1f}%, "
             f"Fed Funds Rate: {self.fed_rate:.2f}%"
         )
+        if not self.indicators:
+            return summary
+        rows = [
+            f"{i.key}|{i.last:.2f}|{i.return_30d:+.1f}|{i.zscore:+.1f}|{i.realized_vol:.0f}"
+            for i in self.indicators
+        ]
+        return "\n".join([summary, "key|last|30d%|z|vol%", *rows])
 
     def to_dict(self) -> dict:
         return {
@@ -43,4 +87,17 @@ class MarketData:
             "spx_return_30d": self.spx_return_30d,
             "fed_rate": self.fed_rate,
             "collected_at": self.collected_at,
+            "indicators": [i.to_dict() for i in self.indicators],
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MarketData":
+        """to_dict() 역변환 (카세트 재생용)"""
+        return cls(
+            vix_current=data.get("vix_current", 0.0),
+            vix_30d_avg=data.get("vix_30d_avg", 0.0),
+            spx_return_30d=data.get("spx_return_30d", 0.0),
+            fed_rate=data.get("fed_rate", 0.0),
+            collected_at=data.get("collected_at", ""),
+            indicators=tuple(Indicator.from_dict(i) for i in data.get("indicators", [])),
+        )
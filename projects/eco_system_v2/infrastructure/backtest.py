@@ -0,0 +1,305 @@
+"""
+infrastructure/backtest.py
+
+SignalStore에 누적된 신호를 S&P500 선행 수익률과 조인해 신호 품질을 평가하는 백테스트 하네스.
+
+모든 계산은 pandas/numpy 벡터 연산 (행 단위 루프 없음).
+SPX 종가는 yfinance로 받아 outputs/spx_close.csv에 캐시 — 캐시가 기간을 덮으면 네트워크 호출 없음.
+
+strategy를 주면 저장된 합의 대신 consensus_accel로 과거 신호를 재채점해 평가한다.
+learn_reliability()는 에이전트별 적중률을 학습해 reliability/bayesian 전략 가중치로 쓴다.
+학습한 가중치를 평가할 때는 holdout_split()으로 구간을 나눠 학습 구간 밖에서만 평가한다 (look-ahead 방지).
+
+사용법:
+    from infrastructure.backtest import holdout_split, learn_reliability, run_backtest
+
+    with SignalStore("outputs/signals.db") as store:
+        report = run_backtest(store, horizon_days=21)
+        train_end, test_start = holdout_split(store, horizon_days=21)
+        reliability = learn_reliability(store, end=train_end)
+        bayes = run_backtest(store, start=test_start, strategy=BayesianVote(reliability))
+    print(report.to_dict())
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from domain.consensus import ConsensusStrategy
+from infrastructure.persistence.signal_store import SignalStore
+
+logger = logging.getLogger(__name__)
+
+# Signal → 방향 부호 (domain.Signal 값 문자열 기준)
+_DIRECTION = {"BULLISH": 1, "NEUTRAL": 0, "BEARISH": -1}
+
+_CALIBRATION_BINS = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+@dataclass
+class BacktestReport:
+    """
+    백테스트 결과.
+
+    horizon_days: 선행 수익률 계산 구간 (거래일)
+    neutral_band: |선행 수익률| < band 이면 NEUTRAL 실현으로 간주
+    evaluated: 선행 수익률이 확정된 합의 신호 수
+    hit_rate: 합의 신호 적중률
+    calibration: 신뢰도 구간별 [{bin, count, avg_confidence, hit_rate}]
+    agents: 에이전트별 [{agent, count, hit_rate, agreement, avg_signed_return}]
+    """
+
+    horizon_days: int
+    neutral_band: float
+    strategy: str = "stored"
+    evaluated: int = 0
+    hit_rate: float = 0.0
+    calibration: list[dict] = field(default_factory=list)
+    agents: list[dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "horizon_days": self.horizon_days,
+            "neutral_band": self.neutral_band,
+            "strategy": self.strategy,
+            "evaluated": self.evaluated,
+            "hit_rate": self.hit_rate,
+            "calibration": self.calibration,
+            "agents": self.agents,
+        }
+
+
+def load_spx_close(start: str, end: str, cache_path: str = "outputs/spx_close.csv"):
+    """
+    ^GSPC 일별 종가 Series (DatetimeIndex) 반환.
+
+    캐시가 [start, end]를 덮으면 캐시만 사용, 아니면 누락 구간만 받아 병합 저장.
+    """
+    import pandas as pd
+
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    cache = Path(cache_path)
+    cached = pd.Series(dtype="float64")
+    if cache.exists():
+        cached = pd.read_csv(cache, index_col=0, parse_dates=True).iloc[:, 0]
+
+    covered = (
+        not cached.empty
+        and cached.index.min() <= start_ts
+        and cached.index.max() >= end_ts - pd.Timedelta(days=4)  # 주말·휴장 여유
+    )
+    if covered:
+        return cached.loc[start_ts:end_ts]
+
+    import yfinance as yf
+
+    fetch_start = start_ts if cached.empty else min(start_ts, cached.index.max())
+    hist = yf.Ticker("^GSPC").history(start=fetch_start, end=end_ts + pd.Timedelta(days=1))
+    fresh = hist["Close"]
+    fresh.index = fresh.index.tz_localize(None).normalize()
+
+    merged = pd.concat([cached, fresh])
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    merged.name = "close"
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    merged.to_csv(cache)
+    logger.info(f"[backtest] SPX 캐시 갱신: {len(merged)}일 ({cache})")
+    return merged.loc[start_ts:end_ts]
+
+
+def _evaluate(
+    signals,
+    horizon_days: int,
+    neutral_band: float,
+    cache_path: str,
+):
+    """
+    신호 DataFrame × SPX 선행 수익률 → hit, signed_return 열이 붙은 DataFrame.
+
+    신호 날짜는 당일 또는 직후 첫 거래일 종가에 맞춘다 (merge_asof forward).
+    선행 수익률이 아직 확정되지 않은 행은 제외.
+    """
+    import numpy as np
+    import pandas as pd
+
+    signals["date"] = pd.to_datetime(signals["date"], errors="coerce")
+    signals = signals.dropna(subset=["date"])
+
+    # 선행 수익률 산출을 위해 horizon 이후 구간까지 종가 로드
+    span_end = signals["date"].max() + timedelta(days=int(horizon_days * 1.6) + 7)
+    close = load_spx_close(
+        start=signals["date"].min().strftime("%Y-%m-%d"),
+        end=min(span_end, datetime.today()).strftime("%Y-%m-%d"),
+        cache_path=cache_path,
+    )
+    prices = pd.DataFrame({
+        "trade_date": close.index,
+        "fwd_return": (close.shift(-horizon_days) / close - 1).to_numpy(),
+    })
+
+    joined = pd.merge_asof(
+        signals.sort_values("date"),
+        prices,
+        left_on="date",
+        right_on="trade_date",
+        direction="forward",
+    ).dropna(subset=["fwd_return"])
+
+    direction = joined["signal"].map(_DIRECTION).fillna(0).to_numpy()
+    fwd = joined["fwd_return"].to_numpy()
+    realized = np.where(np.abs(fwd) < neutral_band, 0, np.sign(fwd))
+    joined["hit"] = direction == realized
+    joined["signed_return"] = direction * fwd
+    return joined
+
+
+def holdout_split(
+    store: SignalStore,
+    train_fraction: float = 0.7,
+    horizon_days: int = 21,
+) -> tuple[str, str] | None:
+    """
+    실행 날짜 기준 학습/평가 구간 분할 → (train_end, test_start). 나눌 수 없으면 None.
+
+    앞쪽 train_fraction 비율의 날짜로 학습, test_start부터 평가.
+    학습 신호의 선행 수익률이 평가 구간에 걸치지 않도록 train_end는 test_start보다
+    horizon(달력일 환산)만큼 앞에서 끊는다.
+    """
+    dates = sorted({row["date"] for row in store.fetch(agent="consensus")})
+    if len(dates) < 2:
+        return None
+    cut = min(max(int(len(dates) * train_fraction), 1), len(dates) - 1)
+    test_start = dates[cut]
+    try:
+        embargo = timedelta(days=int(horizon_days * 1.6) + 1)
+        train_end = (datetime.strptime(test_start, "%Y-%m-%d") - embargo).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+    if dates[0] > train_end:
+        return None
+    return train_end, test_start
+
+
+def learn_reliability(
+    store: SignalStore,
+    horizon_days: int = 21,
+    neutral_band: float = 0.02,
+    cache_path: str = "outputs/spx_close.csv",
+    start: str | None = None,
+    end: str | None = None,
+) -> dict[str, float]:
+    """
+    에이전트별 적중률 학습 → {agent: reliability}. start/end로 학습 구간 제한.
+
+    라플라스 평활 (hits+1)/(n+2) — 표본이 적은 에이전트는 0.5 쪽으로 당겨진다.
+    평가 가능한 신호가 없으면 빈 dict (전략은 기본 가중치 사용).
+    같은 기간을 평가할 때는 holdout_split()의 train_end까지만 학습할 것.
+    """
+    import pandas as pd
+
+    signals = pd.DataFrame(store.fetch(start=start, end=end))
+    if signals.empty:
+        return {}
+    joined = _evaluate(signals, horizon_days, neutral_band, cache_path)
+    agents = joined[joined["agent"] != "consensus"]
+    if agents.empty:
+        return {}
+    stats = agents.groupby("agent")["hit"].agg(["sum", "size"])
+    reliability = ((stats["sum"] + 1) / (stats["size"] + 2)).round(4)
+    logger.info(f"[backtest] 신뢰성 학습: {reliability.to_dict()}")
+    return {str(k): float(v) for k, v in reliability.items()}
+
+
+def run_backtest(
+    store: SignalStore,
+    horizon_days: int = 21,
+    neutral_band: float = 0.02,
+    start: str | None = None,
+    end: str | None = None,
+    cache_path: str = "outputs/spx_close.csv",
+    strategy: ConsensusStrategy | None = None,
+) -> BacktestReport:
+    """
+    저장된 신호 × SPX 선행 수익률 조인 → 적중률, 신뢰도 보정, 에이전트별 기여도.
+
+    strategy가 있으면 합의 행을 consensus_accel.rescore_history() 결과로 교체해 평가.
+    """
+    import pandas as pd
+
+    report = BacktestReport(
+        horizon_days=horizon_days,
+        neutral_band=neutral_band,
+        strategy=strategy.name if strategy else "stored",
+    )
+
+    signals = pd.DataFrame(store.fetch(start=start, end=end))
+    if signals.empty:
+        logger.warning("[backtest] 저장된 신호 없음")
+        return report
+
+    if strategy is not None:
+        from infrastructure.consensus_accel import rescore_history
+
+        rescored = rescore_history(store, strategy, start=start, end=end)
+        signals = pd.concat(
+            [signals[signals["agent"] != "consensus"], rescored], ignore_index=True
+        )
+
+    joined = _evaluate(signals, horizon_days, neutral_band, cache_path)
+    if joined.empty:
+        logger.warning("[backtest] 선행 수익률이 확정된 신호 없음 (horizon 미경과)")
+        return report
+
+    consensus = joined[joined["agent"] == "consensus"]
+    report.evaluated = int(len(consensus))
+    if report.evaluated:
+        report.hit_rate = round(float(consensus["hit"].mean()), 4)
+
+        bins = pd.cut(consensus["confidence"], _CALIBRATION_BINS, include_lowest=True)
+        calib = consensus.groupby(bins, observed=True).agg(
+            count=("hit", "size"),
+            avg_confidence=("confidence", "mean"),
+            hit_rate=("hit", "mean"),
+        )
+        report.calibration = [
+            {
+                "bin": str(idx),
+                "count": int(row["count"]),
+                "avg_confidence": round(float(row["avg_confidence"]), 4),
+                "hit_rate": round(float(row["hit_rate"]), 4),
+            }
+            for idx, row in calib.iterrows()
+        ]
+
+    # 에이전트별: 적중률, 합의 동의율, 방향 부호 × 선행 수익률 평균
+    agents = joined[joined["agent"] != "consensus"]
+    if not agents.empty:
+        consensus_by_run = consensus.set_index("run_id")["signal"]
+        agents = agents.assign(
+            agree=agents["signal"].to_numpy() == agents["run_id"].map(consensus_by_run).to_numpy()
+        )
+        per_agent = agents.groupby("agent").agg(
+            count=("hit", "size"),
+            hit_rate=("hit", "mean"),
+            agreement=("agree", "mean"),
+            avg_signed_return=("signed_return", "mean"),
+        )
+        report.agents = [
+            {
+                "agent": name,
+                "count": int(row["count"]),
+                "hit_rate": round(float(row["hit_rate"]), 4),
+                "agreement": round(float(row["agreement"]), 4),
+                "avg_signed_return": round(float(row["avg_signed_return"]), 6),
+            }
+            for name, row in per_agent.iterrows()
+        ]
+
+    logger.info(
+        f"[backtest] [{report.strategy}] {report.evaluated}건 평가, 합의 적중률 {report.hit_rate:.0%} "
+        f"(horizon={horizon_days}d)"
+    )
+    return report
@@ -0,0 +1,160 @@
+"""
+infrastructure/cassette.py
+
+실행 1회의 수집 결과(MarketData)와 에이전트 API 교환(프롬프트 → 응답 원문)을
+카세트 파일에 기록하고, 네트워크 없이 그대로 재생하는 record/replay 어댑터.
+
+- 기록: 교환마다 (agent, 프롬프트 해시, 응답 또는 오류, 지연) 저장. 프롬프트 원문은 저장하지 않음
+- 재생: 같은 (agent, 프롬프트 해시) 순서대로 응답 반환. 기본은 지연 없이 최고 속도,
+        simulate_latency=True이면 기록된 지연을 그대로 재현
+- 파일: .json.gz (확장자가 .gz가 아니면 평문 JSON)
+
+사용법:
+    cassette = Cassette("outputs/cassettes/run.json.gz")        # 기록
+    cassette = Cassette.load("outputs/cassettes/run.json.gz")   # 재생
+    raw = await cassette.exchange("analysis", prompt, call)     # BaseAgent._request()가 호출
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+def _key(agent: str, request: str) -> str:
+    return hashlib.sha256(f"{agent}\n{request}".encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    """
+    mode: "record" | "replay"
+    meta: 재생에 필요한 실행 조건 (quick, context)
+    market_data: 기록된 MarketData.to_dict()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "record",
+        simulate_latency: bool = False,
+    ) -> None:
+        self.path = path
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.meta: dict = {}
+        self.market_data: dict = {}
+        self._exchanges: list[dict] = []
+        self._cursor: dict[str, int] = defaultdict(int)
+        self._by_key: dict[str, list[dict]] = defaultdict(list)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @classmethod
+    def load(cls, path: str, simulate_latency: bool = False) -> "Cassette":
+        p = Path(path)
+        if not p.exists():
+            raise ValueError(f"카세트 파일 없음: {path}")
+        opener = gzip.open if p.suffix == ".gz" else open
+        with opener(p, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        cassette = cls(path, mode="replay", simulate_latency=simulate_latency)
+        cassette.meta = data.get("meta", {})
+        cassette.market_data = data.get("market_data", {})
+        cassette._exchanges = data.get("exchanges", [])
+        for entry in cassette._exchanges:
+            cassette._by_key[entry["key"]].append(entry)
+        logger.info(f"[cassette] 재생 로드: {path} ({len(cassette._exchanges)}개 교환)")
+        return cassette
+
+    def save(self) -> str:
+        p = Path(self.path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": _VERSION,
+            "recorded_at": datetime.now().isoformat(),
+            "meta": self.meta,
+            "market_data": self.market_data,
+            "exchanges": self._exchanges,
+        }
+        opener = gzip.open if p.suffix == ".gz" else open
+        with opener(p, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        logger.info(f"[cassette] 기록 저장: {p} ({len(self._exchanges)}개 교환)")
+        return str(p)
+
+    def rewind(self) -> None:
+        """재생 커서 초기화 (벤치마크 반복용)"""
+        self._cursor.clear()
+
+    async def exchange(
+        self,
+        agent: str,
+        request: str,
+        call: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        replay: 기록된 응답 반환 (같은 키가 여러 번 기록됐으면 순서대로, 소진되면 마지막 반복)
+        record: call() 실행 후 응답/오류와 지연을 기록. 취소된 호출(헤지 패자)은 기록하지 않음
+        """
+        key = _key(agent, request)
+
+        if self.replaying:
+            entries = self._by_key.get(key)
+            if not entries:
+                raise LookupError(f"[cassette] {agent} 교환 기록 없음 (key={key})")
+            idx = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            entry = entries[idx]
+            if self.simulate_latency:
+                await asyncio.sleep(entry.get("latency", 0.0))
+            if "error" in entry:
+                raise RuntimeError(f"[cassette] 기록된 실패 재생: {entry['error']}")
+            return entry["response"]
+
+        started = time.perf_counter()
+        try:
+            response = await call()
+        except Exception as e:
+            self._exchanges.append({
+                "agent": agent,
+                "key": key,
+                "error": str(e),
+                "latency": round(time.perf_counter() - started, 4),
+            })
+            raise
+        self._exchanges.append({
+            "agent": agent,
+            "key": key,
+            "response": response,
+            "latency": round(time.perf_counter() - started, 4),
+        })
+        return response
+
+    def network_summary(self) -> dict:
+        """기록 당시 네트워크 시간: 에이전트별 합계/최대 (초)"""
+        per_agent: dict[str, list[float]] = defaultdict(list)
+        for entry in self._exchanges:
+            per_agent[entry["agent"]].append(entry.get("latency", 0.0))
+        return {
+            agent: {
+                "calls": len(lat),
+                "total_sec": round(sum(lat), 3),
+                "max_sec": round(max(lat), 3),
+            }
+            for agent, lat in per_agent.items()
+        }
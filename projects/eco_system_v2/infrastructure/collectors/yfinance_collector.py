@@ -1,7 +1,11 @@
 """
 infrastructure/collectors/yfinance_collector.py
 
-yfinance로 VIX, S&P500 데이터 수집 → MarketData(domain) 반환.
+yfinance로 지표 유니버스(VIX, S&P500, 금리, 달러, 크레딧, 섹터 ETF)를
+yf.download 한 번으로 일괄 수집 → MarketData(domain) 반환.
+
+파생 피처(30일 수익률, z-score, 실현 변동성)는 종가 DataFrame 전체에 대해
+한 번의 벡터 연산으로 계산한다 — 유니버스가 커져도 네트워크 호출은 1회.
 """
 
 from __future__ import annotations
@@ -9,41 +13,89 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 
-from domain.market_data import MarketData
+from domain.market_data import Indicator, MarketData
 
 logger = logging.getLogger(__name__)
 
+# 표시 이름 → yfinance 심볼. VIX, SPX는 MarketData 기본 필드 계산에 항상 필요.
+DEFAULT_UNIVERSE: dict[str, str] = {
+    "VIX": "^VIX",
+    "SPX": "^GSPC",
+    "US10Y": "^TNX",
+    "US5Y": "^FVX",
+    "US3M": "^IRX",
+    "DXY": "DX-Y.NYB",
+    "HYG": "HYG",   # 하이일드 회사채 (크레딧 스프레드 프록시)
+    "LQD": "LQD",   # 투자등급 회사채
+    "XLK": "XLK",
+    "XLF": "XLF",
+    "XLE": "XLE",
+    "XLV": "XLV",
+    "XLY": "XLY",
+    "XLP": "XLP",
+    "XLI": "XLI",
+    "XLU": "XLU",
+}
+
+_REQUIRED = {"VIX": "^VIX", "SPX": "^GSPC"}
+
+_WINDOW = 22  # 30일 ≈ 22거래일
+
 
-def collect_market(lookback_days: int = 90) -> MarketData:
+def collect_market(
+    lookback_days: int = 90,
+    universe: dict[str, str] | None = None,
+) -> MarketData:
     """
-    VIX와 S&P500 데이터 수집.
+    지표 유니버스 일괄 수집.
 
+    universe: 표시 이름 → 심볼 (None → DEFAULT_UNIVERSE). VIX, SPX는 자동 포함.
     실패 시 zero-value MarketData 반환 (fail-soft).
     """
+    universe = {**_REQUIRED, **(universe or DEFAULT_UNIVERSE)}
     end = datetime.today()
     start = end - timedelta(days=lookback_days)
 
     vix_current = 0.0
     vix_30d_avg = 0.0
     spx_return_30d = 0.0
+    indicators: tuple[Indicator, ...] = ()
 
     try:
         import yfinance as yf
 
-        vix = yf.Ticker("^VIX").history(start=start, end=end)
-        spx = yf.Ticker("^GSPC").history(start=start, end=end)
+        tickers = list(dict.fromkeys(universe.values()))
+        data = yf.download(
+            tickers,
+            start=start,
+            end=end,
+            auto_adjust=True,
+            progress=False,
+            group_by="column",
+            threads=True,
+        )
+        close = data["Close"]
+        if getattr(close, "ndim", 2) == 1:  # 단일 심볼이면 Series
+            close = close.to_frame(tickers[0])
+        close = close.dropna(how="all")
 
-        if not vix.empty:
-            vix_current = float(vix["Close"].iloc[-1])
-            vix_30d_avg = float(vix["Close"].tail(22).mean())
+        indicators = _derive(close, universe)
+        by_ticker = {i.ticker: i for i in indicators}
+
+        vix = close.get("^VIX")
+        if vix is not None and vix.notna().any():
+            vix = vix.dropna()
+            vix_current = float(vix.iloc[-1])
+            vix_30d_avg = float(vix.tail(_WINDOW).mean())
             logger.info(f"[yfinance] VIX={vix_current:.1f}, 30d avg={vix_30d_avg:.1f}")
 
-        if not spx.empty and len(spx) >= 22:
-            spx_return_30d = float(
-                (spx["Close"].iloc[-1] / spx["Close"].iloc[-22] - 1) * 100
-            )
+        spx = by_ticker.get("^GSPC")
+        if spx is not None and close["^GSPC"].notna().sum() >= _WINDOW:
+            spx_return_30d = spx.return_30d
             logger.info(f"[yfinance] SPX 30d return={spx_return_30d:+.1f}%")
 
+        logger.info(f"[yfinance] 지표 {len(indicators)}/{len(universe)}개 수집 (일괄 다운로드 1회)")
+
     except Exception as e:
         logger.warning(f"[yfinance] 수집 실패 (yfinance 미설치?): {e}")
 
@@ -51,4 +103,41 @@ def collect_market(lookback_days: int = 90) -> MarketData:
         vix_current=vix_current,
         vix_30d_avg=vix_30d_avg,
         spx_return_30d=spx_return_30d,
+        indicators=indicators,
     )
+
+
+def _derive(close, universe: dict[str, str]) -> tuple[Indicator, ...]:
+    """
+    종가 DataFrame (열=심볼) → 심볼별 파생 피처. 열 단위 벡터 연산 1회.
+
+    return_30d: 마지막 유효 종가 / 22거래일 전 종가 - 1 (%)
+    zscore: (현재 - 구간 평균) / 구간 표준편차
+    realized_vol: 최근 21개 로그수익률 표준편차 × √252 (%)
+    """
+    import numpy as np
+
+    filled = close.ffill()
+    last = filled.iloc[-1]
+    past = filled.shift(_WINDOW - 1).iloc[-1]
+    ret_30d = (last / past - 1) * 100
+
+    std = close.std()
+    zscore = ((last - close.mean()) / std.where(std > 0)).fillna(0.0)
+
+    log_ret = np.log(filled / filled.shift(1))
+    vol = log_ret.tail(_WINDOW - 1).std() * np.sqrt(252) * 100
+
+    out = []
+    for key, ticker in universe.items():
+        if ticker not in close.columns or np.isnan(last.get(ticker, np.nan)):
+            continue
+        out.append(Indicator(
+            key=key,
+            ticker=ticker,
+            last=round(float(last[ticker]), 4),
+            return_30d=round(float(np.nan_to_num(ret_30d[ticker])), 2),
+            zscore=round(float(zscore[ticker]), 2),
+            realized_vol=round(float(np.nan_to_num(vol[ticker])), 2),
+        ))
+    return tuple(out)
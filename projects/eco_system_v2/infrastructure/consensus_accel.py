@@ -0,0 +1,140 @@
+"""
+infrastructure/consensus_accel.py
+
+domain/consensus.py 합의 전략의 NumPy 벡터 구현 — 수천 건의 과거 신호 세트를 한 번에 재채점.
+
+domain/은 stdlib만 쓰므로 벡터 연산은 이 모듈이 담당한다.
+전략 객체(MajorityVote / WeightedVote / BayesianVote)의 파라미터를 그대로 읽어
+ConsensusService.compute()와 같은 신호·신뢰도를 낸다 (동점 → 먼저 등장한 신호).
+등장 순서는 SignalStore에 기록된 실행 내 순서(seq)를 그대로 재생한다.
+
+사용법:
+    from infrastructure.consensus_accel import rescore_history
+
+    with SignalStore("outputs/signals.db") as store:
+        frame = rescore_history(store, BayesianVote(reliability))
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from domain.consensus import (
+    DEFAULT_RELIABILITY,
+    DEFAULT_WEIGHT,
+    SCORE_DECIMALS,
+    BayesianVote,
+    ConsensusStrategy,
+    MAX_ACCURACY,
+    MajorityVote,
+    WeightedVote,
+)
+from domain.signal import Signal
+
+CLASSES: list[Signal] = list(Signal)
+_CODE = {sig.value: i for i, sig in enumerate(CLASSES)}
+
+
+def score_batch(
+    codes: np.ndarray,
+    confidence: np.ndarray,
+    agents: list[str],
+    strategy: ConsensusStrategy,
+    order: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    N개 신호 세트를 한 번에 채점.
+
+    codes: (N, A) int — CLASSES 인덱스, 해당 에이전트 응답 없으면 -1
+    confidence: (N, A) float — 응답 없는 칸은 무시됨
+    agents: 길이 A 에이전트 이름
+    order: (N, A) — 행마다 에이전트 등장 순서 (작을수록 먼저, compute()에 넘긴 리스트 순서).
+           None이면 열 순서가 곧 등장 순서
+    반환: (winner (N,) int — CLASSES 인덱스, confidence (N,) float)
+          표가 하나도 없는 행은 NEUTRAL, 0.0
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    conf = np.where(codes >= 0, np.asarray(confidence, dtype=np.float64), 0.0)
+    n, a = codes.shape
+    k = len(CLASSES)
+
+    present = codes >= 0
+    votes = codes[:, :, None] == np.arange(k)  # (N, A, K)
+    voted = votes.any(axis=1)  # (N, K)
+
+    if isinstance(strategy, MajorityVote):
+        scores = votes.sum(axis=1).astype(np.float64)
+    elif isinstance(strategy, WeightedVote):
+        w = np.array([strategy.weights.get(name, DEFAULT_WEIGHT) for name in agents])
+        scores = (votes * (w * conf)[:, :, None]).sum(axis=1)
+    elif isinstance(strategy, BayesianVote):
+        r = np.array([strategy.reliability.get(name, DEFAULT_RELIABILITY) for name in agents])
+        p = np.clip(1.0 / 3 + (r - 1.0 / 3) * conf, 1.0 / 3, MAX_ACCURACY)
+        hit, miss = np.log(p)[:, :, None], np.log((1 - p) / 2)[:, :, None]
+        per_agent = np.where(votes, hit, miss) * present[:, :, None]
+        log_prior = np.log([strategy.prior[sig] for sig in CLASSES])
+        scores = log_prior + per_agent.sum(axis=1)
+    else:
+        raise TypeError(f"벡터 구현 없는 전략: {type(strategy).__name__}")
+
+    # 승자: 표 받은 신호 중 최고점, 동점이면 먼저 등장한 신호
+    masked = np.where(voted, np.round(scores, SCORE_DECIMALS), -np.inf)
+    best = masked.max(axis=1, keepdims=True)
+    if order is None:
+        order = np.broadcast_to(np.arange(a), (n, a))
+    rank = np.where(present, np.asarray(order, dtype=np.float64), np.inf)
+    first_seen = np.where(votes, rank[:, :, None], np.inf).min(axis=1)  # (N, K) 신호별 첫 등장
+    tie_key = np.where((masked == best) & voted, first_seen, np.inf)
+    winner = tie_key.argmin(axis=1)
+    rows = np.arange(n)
+
+    if isinstance(strategy, MajorityVote):
+        agree = codes == winner[:, None]
+        counts = agree.sum(axis=1)
+        out = (conf * agree).sum(axis=1) / np.maximum(counts, 1)
+    elif isinstance(strategy, WeightedVote):
+        total = (w * present).sum(axis=1)
+        out = np.divide(scores[rows, winner], total, out=np.zeros(n), where=total > 0)
+    else:
+        shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+        out = shifted[rows, winner] / shifted.sum(axis=1)
+
+    empty = ~present.any(axis=1)
+    winner = np.where(empty, CLASSES.index(Signal.NEUTRAL), winner)
+    out = np.where(empty, 0.0, np.clip(out, 0.0, 1.0))
+    return winner, out
+
+
+def rescore_history(store, strategy: ConsensusStrategy, start: str | None = None, end: str | None = None):
+    """
+    SignalStore의 에이전트 신호를 strategy로 재채점 → DataFrame.
+
+    열: run_id, date, agent(="consensus"), signal, confidence
+    (SignalStore.fetch() 행과 같은 형태라 백테스트에 그대로 넣을 수 있다)
+    """
+    import pandas as pd
+
+    rows = pd.DataFrame(store.fetch(start=start, end=end))
+    if rows.empty:
+        return pd.DataFrame(columns=["run_id", "date", "agent", "signal", "confidence"])
+    rows = rows[rows["agent"] != "consensus"]
+
+    # pivot 열은 이름순 — 동점 처리는 실행 내 기록 순서(seq = compute()에 넘긴 순서)로 따로 재생
+    codes = rows.pivot(index="run_id", columns="agent", values="signal")
+    conf = rows.pivot(index="run_id", columns="agent", values="confidence")
+    order = rows.pivot(index="run_id", columns="agent", values="seq")
+    agents = list(codes.columns)
+    code_matrix = codes.apply(lambda col: col.map(_CODE)).fillna(-1).to_numpy(dtype=np.int64)
+
+    winner, confidence = score_batch(
+        code_matrix, conf.fillna(0.0).to_numpy(), agents, strategy, order=order.to_numpy(dtype=np.float64)
+    )
+
+    dates = rows.drop_duplicates("run_id").set_index("run_id")["date"]
+    return pd.DataFrame({
+        "run_id": codes.index,
+        "date": dates.reindex(codes.index).to_numpy(),
+        "agent": "consensus",
+        "signal": [CLASSES[i].value for i in winner],
+        "confidence": np.round(confidence, 4),
+    })
@@ -1,5 +1,6 @@
 # infrastructure/persistence
 from .json_writer import write
 from .portfolio_writer import write_portfolio
+from .signal_store import SignalStore
 
-__all__ = ["write", "write_portfolio"]
+__all__ = ["write", "write_portfolio", "SignalStore"]
@@ -73,6 +73,19 @@ def _render(result: dict, profile: dict) -> str:
     spx = md_data.get("spx_return_30d", 0.0)
     fed = md_data.get("fed_rate", 0.0)
 
+    # 지표 유니버스 테이블 (있을 때만)
+    indicator_rows = "".join(
+        f"| {i.get('key','')} | {i.get('last', 0.0):,.2f} | {i.get('return_30d', 0.0):+.1f}% "
+        f"| {i.get('zscore', 0.0):+.1f} | {i.get('realized_vol', 0.0):.0f}% |\n"
+        for i in md_data.get("indicators", [])
+    )
+    indicator_section = (
+        "\n| 지표 | 종가 | 30일 수익률 | z-score | 실현변동성 |\n"
+        "|------|------|------------|---------|-----------|\n"
+        f"{indicator_rows.rstrip()}\n"
+        if indicator_rows else ""
+    )
+
     # 역량 목록
     competencies = profile.get("key_competencies", [])
     keywords = profile.get("keywords", [])
@@ -115,7 +128,7 @@ def _render(result: dict, profile: dict) -> str:
 | VIX (30일 평균) | {vix_a:.1f} |
 | S&P500 30일 수익률 | {spx:+.1f}% |
 | 연방기금금리 | {fed:.2f}% |
-
+{indicator_section}
 ---
 
 ## {company} × {role} 직무 연관성
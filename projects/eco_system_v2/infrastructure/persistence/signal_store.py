@@ -0,0 +1,177 @@
+"""
+infrastructure/persistence/signal_store.py
+
+실행 결과(EcoResult.to_dict())를 SQLite에 누적 저장하는 append-only 신호 저장소.
+
+eco_{date}_{id}.json을 하나씩 파싱하지 않고 (date, agent) 인덱스로 조회.
+합의 신호는 agent="consensus" 행으로 signals 테이블에 함께 저장된다.
+
+사용법:
+    store = SignalStore("outputs/signals.db")
+    store.append(result_dict, run_id="eco_2026-02-26_a1b2c3")
+    rows = store.fetch(agent="consensus", start="2026-01-01")
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id         TEXT PRIMARY KEY,
+    date           TEXT NOT NULL,
+    vix_current    REAL,
+    vix_30d_avg    REAL,
+    spx_return_30d REAL,
+    fed_rate       REAL,
+    market_data    TEXT,
+    collected_at   TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    run_id     TEXT NOT NULL REFERENCES runs(run_id),
+    date       TEXT NOT NULL,
+    agent      TEXT NOT NULL,
+    signal     TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    rationale  TEXT,
+    timestamp  TEXT,
+    PRIMARY KEY (run_id, agent)
+);
+CREATE INDEX IF NOT EXISTS idx_signals_date_agent ON signals(date, agent);
+CREATE INDEX IF NOT EXISTS idx_signals_agent_date ON signals(agent, date);
+"""
+
+
+class SignalStore:
+    """
+    append-only SQLite 신호 저장소.
+
+    같은 run_id는 한 번만 기록된다 (INSERT OR IGNORE) — 재임포트해도 중복 없음.
+    """
+
+    def __init__(self, db_path: str = "outputs/signals.db") -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SignalStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, result: dict, run_id: str) -> bool:
+        """
+        EcoResult.to_dict() 1건 저장.
+
+        반환: 새로 기록했으면 True, 이미 있는 run_id면 False
+        """
+        date = result.get("date", "unknown")
+        md = result.get("market_data", {})
+
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    date,
+                    md.get("vix_current"),
+                    md.get("vix_30d_avg"),
+                    md.get("spx_return_30d"),
+                    md.get("fed_rate"),
+                    json.dumps(md, ensure_ascii=False),
+                    md.get("collected_at"),
+                ),
+            )
+            if cur.rowcount == 0:
+                return False
+
+            rows = [
+                (
+                    run_id,
+                    date,
+                    s.get("agent", ""),
+                    s.get("signal", "NEUTRAL"),
+                    float(s.get("confidence", 0.0)),
+                    s.get("rationale", ""),
+                    s.get("timestamp", ""),
+                )
+                for s in result.get("agent_signals", [])
+            ]
+            rows.append((
+                run_id,
+                date,
+                "consensus",
+                result.get("consensus_signal", "NEUTRAL"),
+                float(result.get("consensus_confidence", 0.0)),
+                result.get("consensus_rationale", ""),
+                md.get("collected_at", ""),
+            ))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+        logger.info(f"[signal_store] 기록: {run_id} ({len(rows)}개 신호)")
+        return True
+
+    def import_json_dir(self, output_dir: str = "outputs") -> int:
+        """
+        기존 eco_*.json 파일 일괄 임포트 (1회성 백필).
+
+        run_id는 파일명 stem. 반환: 새로 기록된 실행 수
+        """
+        imported = 0
+        for path in sorted(Path(output_dir).glob("eco_*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"[signal_store] 임포트 실패: {path.name} — {e}")
+                continue
+            if self.append(result, run_id=path.stem):
+                imported += 1
+        logger.info(f"[signal_store] {imported}개 실행 임포트 ({output_dir})")
+        return imported
+
+    def fetch(
+        self,
+        agent: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[dict]:
+        """
+        신호 행 조회 (date 오름차순). agent=None이면 합의 포함 전체.
+
+        각 행: run_id, date, agent, signal, confidence, timestamp, seq
+        seq = 기록 순서(rowid) — 한 실행 안에서는 agent_signals 순서, 즉 합의 계산 때의 등장 순서
+        """
+        clauses, params = [], []
+        if agent:
+            clauses.append("agent = ?")
+            params.append(agent)
+        if start:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end:
+            clauses.append("date <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur = self._conn.execute(
+            "SELECT run_id, date, agent, signal, confidence, timestamp, rowid AS seq "
+            f"FROM signals {where} ORDER BY date, run_id, agent",
+            params,
+        )
+        return [dict(r) for r in cur.fetchall()]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
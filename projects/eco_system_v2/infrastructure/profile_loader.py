@@ -8,6 +8,9 @@ job_assistant의 Analysis JSON을 읽어 eco_system_v2 에이전트용 context 
 
     profile = load_profile("/path/to/웨이브릿지_퀀트리서처_2026-02-26_analysis.json")
     context_str = profile.to_context()
+
+    # job_assistant 분석 저장소(data/analyses/)에서 회사/직무의 최신 분석
+    profile = load_profile("../self/job_assistant/data/analyses", target="웨이브릿지/퀀트리서처")
 """
 
 from __future__ import annotations
@@ -66,15 +69,44 @@ class ProfileData:
         }
 
 
-def load_profile(path: str) -> ProfileData:
+def _latest_in_store(directory: Path, target: str) -> Path:
+    """
+    분석 저장소 디렉토리 → target("회사" 또는 "회사/직무")에 맞는 가장 최근 *_analysis.json.
+    job_assistant는 같은 공고 분석을 재사용할 때도 파일 mtime을 갱신하므로 mtime 최신 = 최근 사용.
+    """
+    company, _, role = target.partition("/")
+    candidates = []
+    for p in directory.glob("*_analysis.json"):
+        if company:
+            try:
+                with open(p, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if data.get("company") != company.strip():
+                continue
+            if role and data.get("role") != role.strip():
+                continue
+        candidates.append(p)
+    if not candidates:
+        raise ValueError(f"저장소에 분석 없음: {directory} (target={target or '전체'})")
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def load_profile(path: str, target: str = "") -> ProfileData:
     """
     job_assistant Analysis JSON 파일을 읽어 ProfileData 반환.
 
+    path가 디렉토리(job_assistant 분석 저장소)면 target("회사" 또는 "회사/직무")에
+    맞는 가장 최근 분석을 읽는다 (target 없으면 저장소 전체에서 최신).
     파일이 없거나 파싱 실패 시 ValueError.
     """
     p = Path(path)
     if not p.exists():
         raise ValueError(f"프로필 파일 없음: {path}")
+    if p.is_dir():
+        p = _latest_in_store(p, target)
+        path = str(p)
 
     try:
         with open(p, encoding="utf-8") as f:
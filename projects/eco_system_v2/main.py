@@ -5,19 +5,35 @@ main.py — eco_system_v2 CLI 진입점
     python main.py --quick                          # AnalysisAgent만, ~30초
     python main.py --full                           # Research + Analysis 병렬, ~60초
     python main.py --full --context "Fed pivot 가능성 높음"
+    python main.py --full --hedge --early-exit      # 느린 스포크 꼬리 지연 완화
+
+    # 오프라인 기록/재생 (수집 결과 + 에이전트 API 교환을 카세트에 기록)
+    python main.py --full --record                  # → outputs/cassettes/eco_*.json.gz
+    python main.py --replay outputs/cassettes/eco_20260226_091500.json.gz
+    python main.py --replay CASSETTE --bench 50     # 오케스트레이션 오버헤드 벤치마크
+
+    # 신호 저장소 백테스트 (outputs/signals.db × SPX 선행 수익률)
+    python main.py --import-outputs                 # 기존 eco_*.json 백필 (1회)
+    python main.py --backtest --horizon 21
+    python main.py --backtest --consensus bayesian  # 과거 신호를 다른 합의 전략으로 재채점
 
     # 기업 타겟 분석 (job_assistant 연동)
     python main.py --quick --load-profile /path/to/웨이브릿지_퀀트리서처_2026-02-26_analysis.json
     python main.py --quick --load-profile /path/to/analysis.json --portfolio
+    python main.py --quick --load-profile ../self/job_assistant/data/analyses --profile-target 웨이브릿지/퀀트리서처
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import dataclasses
 import json
 import logging
+import statistics
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
 # 프로젝트 루트를 sys.path에 추가 (패키지 설치 없이 실행 가능)
@@ -25,9 +41,11 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config import config
 from infrastructure.collectors import collect_market, collect_fed_rate
-from infrastructure.persistence import write, write_portfolio
+from infrastructure.persistence import write, write_portfolio, SignalStore
 from infrastructure.profile_loader import load_profile
+from infrastructure.cassette import Cassette
 from agents.orchestrator import Orchestrator
+from domain.consensus import STRATEGIES, ConsensusStrategy, build_strategy
 from domain.market_data import MarketData
 
 logging.basicConfig(
@@ -47,59 +65,256 @@ def _parse_args() -> argparse.Namespace:
     mode.add_argument("--full", action="store_true", help="Research + Analysis 병렬 (~60s)")
     parser.add_argument("--context", default="", help="추가 컨텍스트 (자유 텍스트)")
     parser.add_argument("--no-save", action="store_true", help="JSON 저장 건너뜀")
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="지연 임계값 초과 시 백업 요청 발사, 먼저 성공한 응답 채택",
+    )
+    parser.add_argument(
+        "--early-exit",
+        action="store_true",
+        help="합의 신호가 확정되면 남은 에이전트를 기다리지 않음 (full 모드: research가 먼저 오면 analysis 취소)",
+    )
     parser.add_argument(
         "--load-profile",
         metavar="PATH",
         default="",
-        help="job_assistant Analysis JSON 경로 — 기업 타겟 분석 시 사용",
+        help="job_assistant Analysis JSON 경로 또는 분석 저장소 디렉토리 — 기업 타겟 분석 시 사용",
+    )
+    parser.add_argument(
+        "--profile-target",
+        metavar="COMPANY[/ROLE]",
+        default="",
+        help="--load-profile이 저장소 디렉토리일 때 고를 회사/직무 (기본: 가장 최근 분석)",
     )
     parser.add_argument(
         "--portfolio",
         action="store_true",
         help="--load-profile과 함께 사용 시 포트폴리오 마크다운 리포트 생성",
     )
+    parser.add_argument(
+        "--consensus",
+        choices=STRATEGIES,
+        default=None,
+        help="합의 전략 (기본: majority). reliability/bayesian은 신호 저장소에서 신뢰성 학습",
+    )
+    parser.add_argument(
+        "--import-outputs",
+        action="store_true",
+        help="OUTPUT_DIR의 기존 eco_*.json을 신호 저장소로 임포트 후 종료",
+    )
+    parser.add_argument(
+        "--backtest",
+        action="store_true",
+        help="신호 저장소 × SPX 선행 수익률 백테스트 후 종료",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=21,
+        help="--backtest 선행 수익률 구간 (거래일, 기본 21)",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="수집 결과 + 에이전트 API 교환을 카세트에 기록 (기본: outputs/cassettes/eco_*.json.gz)",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="PATH",
+        default="",
+        help="카세트 재생 — 네트워크/API 키 없이 기록된 실행 재현 (저장 건너뜀)",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="--replay 시 기록된 API 지연을 그대로 재현 (헤지/조기 확정 동작 확인용)",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        default=0,
+        metavar="N",
+        help="--replay와 함께: 오케스트레이션을 N회 반복 실행해 오버헤드 측정 후 종료",
+    )
     return parser.parse_args()
 
 
+def _build_consensus(
+    name: str | None, horizon: int, train_end: str | None = None
+) -> ConsensusStrategy | None:
+    """
+    --consensus 이름 → 전략. 신뢰성 학습 실패 시 기본 가중치로 진행 (fail-soft).
+
+    train_end: 이 날짜까지의 신호로만 학습 (백테스트 홀드아웃 — 평가 구간 look-ahead 방지)
+    """
+    if name is None:
+        return None
+    reliability: dict[str, float] = {}
+    if name in ("reliability", "bayesian"):
+        from infrastructure.backtest import learn_reliability
+
+        try:
+            with SignalStore(config.SIGNAL_DB) as store:
+                reliability = learn_reliability(
+                    store,
+                    horizon_days=horizon,
+                    cache_path=str(Path(config.OUTPUT_DIR) / "spx_close.csv"),
+                    end=train_end,
+                )
+        except Exception as e:
+            logger.warning(f"[consensus] 신뢰성 학습 실패 — 기본 가중치 사용: {e}")
+    return build_strategy(name, reliability)
+
+
+def _run_backtest(args: argparse.Namespace) -> None:
+    from infrastructure.backtest import holdout_split, run_backtest
+
+    with SignalStore(config.SIGNAL_DB) as store:
+        if args.import_outputs:
+            imported = store.import_json_dir(config.OUTPUT_DIR)
+            print(f"임포트 완료: {imported}건 (누적 {store.count()}건) → {config.SIGNAL_DB}")
+    if not args.backtest:
+        return
+
+    # 학습형 전략은 앞 구간에서 학습하고 뒤 구간에서만 평가 (같은 구간 학습·평가는 look-ahead)
+    learned = args.consensus in ("reliability", "bayesian")
+    split = None
+    if learned:
+        with SignalStore(config.SIGNAL_DB) as store:
+            split = holdout_split(store, horizon_days=args.horizon)
+    if learned and split is None:
+        logger.warning("[backtest] 학습/평가 구간을 나눌 표본 부족 — 신뢰성 학습 없이 기본 가중치로 평가")
+        strategy = build_strategy(args.consensus)
+    else:
+        strategy = _build_consensus(args.consensus, args.horizon, train_end=split[0] if split else None)
+    train_end, test_start = split or (None, None)
+    with SignalStore(config.SIGNAL_DB) as store:
+        report = run_backtest(
+            store,
+            horizon_days=args.horizon,
+            start=test_start,
+            cache_path=str(Path(config.OUTPUT_DIR) / "spx_close.csv"),
+            strategy=strategy,
+        )
+
+    print("\n" + "=" * 50)
+    print(f"합의 전략  : {report.strategy}")
+    if split:
+        print(f"학습 구간  : ~{train_end} / 평가 구간: {test_start}~")
+    print(f"평가 신호  : {report.evaluated}건 (horizon {report.horizon_days}거래일)")
+    print(f"합의 적중률: {report.hit_rate:.0%}")
+    for b in report.calibration:
+        print(f"  신뢰도 {b['bin']:<14} n={b['count']:<4} 평균 {b['avg_confidence']:.0%} → 적중 {b['hit_rate']:.0%}")
+    for a in report.agents:
+        print(
+            f"  [{a['agent']}] n={a['count']} 적중 {a['hit_rate']:.0%} "
+            f"합의동의 {a['agreement']:.0%} 부호수익 {a['avg_signed_return']:+.2%}"
+        )
+    print("=" * 50 + "\n")
+
+
+def _build_orchestrator(args: argparse.Namespace, cassette: Cassette | None) -> Orchestrator:
+    return Orchestrator(
+        anthropic_api_key=config.ANTHROPIC_API_KEY,
+        perplexity_api_key=config.PERPLEXITY_API_KEY,
+        claude_model=config.CLAUDE_MODEL,
+        perplexity_model=config.PERPLEXITY_MODEL,
+        hedge=args.hedge,
+        consensus=_build_consensus(args.consensus, args.horizon),
+        cassette=cassette,
+    )
+
+
+async def _run_bench(args: argparse.Namespace) -> None:
+    """
+    카세트 재생으로 파이프라인을 N회 실행 → 벽시계 시간 = 오케스트레이션 오버헤드
+    (프롬프트 렌더링, 파싱, 합의, 스케줄링). 기록 당시 네트워크 시간과 나란히 출력.
+    """
+    cassette = Cassette.load(args.replay, simulate_latency=args.replay_latency)
+    market_data = MarketData.from_dict(cassette.market_data)
+    quick = cassette.meta.get("quick", True)
+    context = cassette.meta.get("context", "")
+    orchestrator = _build_orchestrator(args, cassette)
+
+    logging.getLogger().setLevel(logging.WARNING)  # 반복 실행 로그 억제
+    walls: list[float] = []
+    for _ in range(args.bench):
+        cassette.rewind()
+        started = time.perf_counter()
+        await orchestrator.run(
+            market_data=market_data, context=context, quick=quick, early_exit=args.early_exit
+        )
+        walls.append(time.perf_counter() - started)
+    logging.getLogger().setLevel(logging.INFO)
+
+    ordered = sorted(walls)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    print("\n" + "=" * 50)
+    print(f"카세트     : {args.replay} ({'quick' if quick else 'full'} 모드)")
+    print(f"재생 {len(walls)}회  : 평균 {statistics.mean(walls) * 1000:.2f}ms, "
+          f"p50 {statistics.median(walls) * 1000:.2f}ms, p95 {p95 * 1000:.2f}ms"
+          f"{' (기록 지연 재현)' if args.replay_latency else ''}")
+    for agent, net in cassette.network_summary().items():
+        print(f"  [{agent}] 기록 네트워크 {net['calls']}회, 합계 {net['total_sec']:.2f}s, 최대 {net['max_sec']:.2f}s")
+    print("=" * 50 + "\n")
+
+
 async def _run(args: argparse.Namespace) -> dict:
     quick = args.quick or (not args.full)  # 기본값은 quick
 
+    cassette: Cassette | None = None
+    if args.replay:
+        cassette = Cassette.load(args.replay, simulate_latency=args.replay_latency)
+    elif args.record is not None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        cassette = Cassette(
+            args.record or str(Path(config.OUTPUT_DIR) / "cassettes" / f"eco_{stamp}.json.gz")
+        )
+
     # 0. 프로필 로드 (있을 경우)
     profile = None
     context = args.context
     if args.load_profile:
-        profile = load_profile(args.load_profile)
+        profile = load_profile(args.load_profile, target=args.profile_target)
         profile_context = profile.to_context()
         context = f"{profile_context}\n\n{context}".strip() if context else profile_context
         logger.info(f"[profile] {profile.company} / {profile.role} 컨텍스트 로드")
 
-    # 1. 설정 검증
-    config.validate(quick=quick)
+    # 재생: 기록 당시 모드/컨텍스트를 그대로 써야 프롬프트가 일치한다
+    if cassette is not None and cassette.replaying:
+        quick = cassette.meta.get("quick", quick)
+        context = cassette.meta.get("context", context)
+
+    # 1. 설정 검증 (재생은 API 키 불필요)
+    if cassette is None or not cassette.replaying:
+        config.validate(quick=quick)
 
     # 2. 데이터 수집 (Phase 1)
     logger.info("=== Phase 1: 데이터 수집 ===")
-    market_base = collect_market()
-    fed_rate = collect_fed_rate()
-    market_data = MarketData(
-        vix_current=market_base.vix_current,
-        vix_30d_avg=market_base.vix_30d_avg,
-        spx_return_30d=market_base.spx_return_30d,
-        fed_rate=fed_rate,
-    )
+    if cassette is not None and cassette.replaying:
+        market_data = MarketData.from_dict(cassette.market_data)
+    else:
+        market_base = collect_market(universe=config.market_universe())
+        fed_rate = collect_fed_rate()
+        market_data = dataclasses.replace(market_base, fed_rate=fed_rate)
+        if cassette is not None:
+            cassette.market_data = market_data.to_dict()
+            cassette.meta = {"quick": quick, "context": context}
     logger.info(f"수집 완료: {market_data.to_prompt_context()}")
 
     # 3. 에이전트 분석 (Phase 2)
     logger.info(f"=== Phase 2: 분석 ({'quick' if quick else 'full'} 모드) ===")
-    orchestrator = Orchestrator(
-        anthropic_api_key=config.ANTHROPIC_API_KEY,
-        perplexity_api_key=config.PERPLEXITY_API_KEY,
-        claude_model=config.CLAUDE_MODEL,
-        perplexity_model=config.PERPLEXITY_MODEL,
-    )
+    orchestrator = _build_orchestrator(args, cassette)
     result = await orchestrator.run(
         market_data=market_data,
         context=context,
         quick=quick,
+        early_exit=args.early_exit,
     )
 
     # 4. 결과 출력 (Phase 3)
@@ -114,10 +329,15 @@ async def _run(args: argparse.Namespace) -> dict:
     print(f"근거       : {result_dict['consensus_rationale']}")
     print("=" * 50 + "\n")
 
-    # 5. 저장
-    if not args.no_save:
+    if cassette is not None and not cassette.replaying:
+        print(f"카세트 기록: {cassette.save()}")
+
+    # 5. 저장 (재생 결과는 신호 저장소를 오염시키지 않도록 저장하지 않음)
+    if not args.no_save and not args.replay:
         filepath = write(result_dict, config.OUTPUT_DIR)
         print(f"저장 완료: {filepath}")
+        with SignalStore(config.SIGNAL_DB) as store:
+            store.append(result_dict, run_id=Path(filepath).stem)
 
         # 포트폴리오 리포트 (--portfolio 플래그 + 프로필이 있을 때)
         if args.portfolio and profile:
@@ -138,6 +358,17 @@ def main() -> None:
         print("ERROR: --portfolio는 --load-profile과 함께 사용해야 합니다.")
         sys.exit(1)
 
+    if args.import_outputs or args.backtest:
+        _run_backtest(args)
+        return
+
+    if args.bench:
+        if not args.replay:
+            print("ERROR: --bench는 --replay와 함께 사용해야 합니다.")
+            sys.exit(1)
+        asyncio.run(_run_bench(args))
+        return
+
     result = asyncio.run(_run(args))
 
     # 비정상 신호 시 exit code 1 (CI/모니터링 연동용)
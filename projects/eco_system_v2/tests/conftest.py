@@ -0,0 +1,6 @@
+"""eco_system_v2 테스트 공통 — 프로젝트 루트를 import 경로에 추가 (main.py와 같은 import 기준)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,77 @@
+"""consensus_accel 벡터 채점 ↔ ConsensusService.compute() 일치 (특히 동점 처리)"""
+
+import numpy as np
+import pytest
+
+from domain.consensus import BayesianVote, ConsensusService, MajorityVote, WeightedVote
+from domain.signal import EconomicSignal, Signal
+from infrastructure.consensus_accel import CLASSES, rescore_history, score_batch
+from infrastructure.persistence.signal_store import SignalStore
+
+STRATEGIES = [
+    MajorityVote(),
+    WeightedVote(),
+    WeightedVote({"research": 0.7, "analysis": 0.7}),
+    BayesianVote({"research": 0.6, "analysis": 0.6}),
+]
+
+
+def _signal(agent: str, signal: Signal, confidence: float = 0.8) -> EconomicSignal:
+    return EconomicSignal(agent=agent, signal=signal, confidence=confidence, rationale="")
+
+
+def _batch(signals: list[EconomicSignal], agents: list[str], strategy):
+    """signals(등장 순서)를 agents 열 순서의 1행 배치로 채점"""
+    by_agent = {s.agent: (i, s) for i, s in enumerate(signals)}
+    codes = np.array([[CLASSES.index(by_agent[a][1].signal) for a in agents]])
+    conf = np.array([[by_agent[a][1].confidence for a in agents]])
+    order = np.array([[by_agent[a][0] for a in agents]])
+    winner, confidence = score_batch(codes, conf, agents, strategy, order=order)
+    return CLASSES[winner[0]], float(confidence[0])
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: s.name)
+@pytest.mark.parametrize("first, second", [(Signal.BULLISH, Signal.BEARISH), (Signal.BEARISH, Signal.BULLISH)])
+def test_tie_follows_arrival_order_not_column_order(strategy, first, second):
+    # 오케스트레이터 순서 [research, analysis] — 열은 이름순 [analysis, research]
+    signals = [_signal("research", first), _signal("analysis", second)]
+    expected = ConsensusService.compute(signals, strategy)
+
+    winner, confidence = _batch(signals, ["analysis", "research"], strategy)
+
+    assert expected.signal == first
+    assert winner == expected.signal
+    assert confidence == pytest.approx(expected.confidence, abs=1e-4)
+
+
+def test_rescore_history_replays_recorded_order(tmp_path):
+    signals = [_signal("research", Signal.BULLISH, 0.7), _signal("analysis", Signal.BEARISH, 0.9)]
+    consensus = ConsensusService.compute(signals)
+    result = {
+        "date": "2026-01-05",
+        "consensus_signal": consensus.signal.value,
+        "consensus_confidence": consensus.confidence,
+        "agent_signals": [s.to_dict() for s in signals],
+        "market_data": {},
+    }
+    with SignalStore(str(tmp_path / "signals.db")) as store:
+        store.append(result, run_id="eco_tie")
+        frame = rescore_history(store, MajorityVote())
+
+    assert frame["signal"].tolist() == [consensus.signal.value] == ["BULLISH"]
+    assert frame["confidence"].tolist() == [pytest.approx(consensus.confidence)]
+
+
+def test_holdout_split_keeps_training_labels_out_of_test_window(tmp_path):
+    from infrastructure.backtest import holdout_split
+
+    with SignalStore(str(tmp_path / "signals.db")) as store:
+        for day in range(1, 31):
+            store.append(
+                {"date": f"2026-03-{day:02d}", "consensus_signal": "NEUTRAL", "agent_signals": [], "market_data": {}},
+                run_id=f"eco_{day}",
+            )
+        train_end, test_start = holdout_split(store, train_fraction=0.7, horizon_days=5)
+
+    assert test_start == "2026-03-22"
+    assert train_end == "2026-03-13"  # test_start - (5 × 1.6 + 1)일
@@ -0,0 +1,71 @@
+"""합의 조기 확정 — is_settled() 판정과 Orchestrator의 스포크 취소 경로"""
+
+import asyncio
+
+import pytest
+
+from domain.consensus import BayesianVote, ConsensusService, MajorityVote
+from domain.signal import EconomicSignal, Signal
+
+
+def _signal(agent: str, signal: Signal = Signal.BULLISH, confidence: float = 0.8) -> EconomicSignal:
+    return EconomicSignal(agent=agent, signal=signal, confidence=confidence, rationale="")
+
+
+def test_two_spokes_settle_when_first_in_order_arrives_first():
+    arrived = [_signal("research")]
+    # 남은 1명이 반대해도 동률 → 먼저 등장한 research 신호 유지
+    assert ConsensusService.is_settled(arrived, pending=1, pending_after=True)
+    # bayesian: 확신 1.0 신호는 반대 1표(최대 swing)와 동률까지만 → 확정, 확신이 낮으면 뒤집힐 수 있어 미확정
+    sure = [_signal("research", confidence=1.0)]
+    assert ConsensusService.is_settled(sure, pending=1, strategy=BayesianVote(), pending_after=True)
+    assert not ConsensusService.is_settled(arrived, pending=1, strategy=BayesianVote(), pending_after=True)
+    tie = ConsensusService.compute([_signal("research"), _signal("analysis", Signal.BEARISH)], MajorityVote())
+    assert tie.signal == Signal.BULLISH
+
+
+def test_two_spokes_wait_when_later_spoke_arrives_first():
+    # analysis만 도착 — research가 반대하면 동률에서 research가 이기므로 미확정
+    assert not ConsensusService.is_settled([_signal("analysis")], pending=1, pending_after=False)
+
+
+def test_gap_still_required_beyond_a_tie():
+    arrived = [_signal("a"), _signal("b", Signal.BEARISH)]
+    assert not ConsensusService.is_settled(arrived, pending=1, pending_after=True)
+    arrived = [_signal("a"), _signal("b"), _signal("c", Signal.BEARISH)]
+    assert ConsensusService.is_settled(arrived, pending=1, pending_after=True)
+    assert not ConsensusService.is_settled(arrived, pending=2, pending_after=True)
+
+
+def test_orchestrator_cancels_pending_spoke():
+    pytest.importorskip("httpx")
+    pytest.importorskip("anthropic")
+    from agents.base import BaseAgent
+    from agents.orchestrator import Orchestrator
+    from domain.market_data import MarketData
+
+    class Spoke(BaseAgent):
+        def __init__(self, name: str, delay: float, signal: Signal) -> None:
+            super().__init__(name, max_retries=1, timeout_sec=5)
+            self.delay, self.signal, self.cancelled = delay, signal, False
+
+        async def execute(self, market_data, context=""):
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            return _signal(self.name, self.signal)
+
+        async def _call_api(self, prompt: str) -> str:
+            return ""
+
+    orchestrator = Orchestrator()
+    orchestrator._research = Spoke("research", 0.01, Signal.BULLISH)
+    orchestrator._analysis = Spoke("analysis", 2.0, Signal.BEARISH)
+
+    result = asyncio.run(orchestrator.run(MarketData(), early_exit=True))
+
+    assert orchestrator._analysis.cancelled
+    assert [s.agent for s in result.agent_signals] == ["research"]
+    assert result.consensus.signal == Signal.BULLISH
@@ -0,0 +1,173 @@
+"""
+대규모 상관 엔진 — mcp_market_server 상관 도구의 계산 본문 (NumPy, float32)
+
+섹터·지수 구성종목(수백 개) 상관 스캔용. N×N 행렬을 그대로 직렬화하지 않고 요약만 반환한다.
+
+  - pairwise-complete: 티커마다 상장일·휴장일이 달라도 두 티커가 모두 있는 날짜로 쌍별 계산
+    (마스크 행렬곱 몇 번으로 N×N 전체를 한 번에 — 쌍별 루프 없음)
+  - spearman: 열별 순위로 바꾼 뒤 같은 계산 — 근사. 순위를 쌍의 공통 관측치가 아니라 열 전체 기준으로 매기므로
+    결측이 없으면 pandas와 같지만, 결측이 있으면 pandas의 쌍별 재순위와 달라진다
+    (결측 10% 기준 최대 절대 차이: 관측치 250개 ~0.01, 60개 ~0.05, 30개 ~0.1).
+    순위·스캔용 요약에만 쓰고, 정확한 값이 필요한 소수 종목 행렬은 pandas corr("spearman")로
+  - top_pairs: 상삼각에서 argpartition으로 가장 높은/낮은 k쌍
+  - cluster_order: 상관 유사도 그래프의 Fiedler 벡터 순서 (비슷한 종목끼리 인접 — 히트맵·블록 확인용)
+  - shrink: Ledoit-Wolf 방식 축소 (목표: identity 또는 평균 상관 constant)
+  - rolling_mean_corr: 창마다 평균 쌍별 상관 (시장 전체 상관 레짐)
+
+    returns = close.pct_change(fill_method=None).to_numpy(np.float32)
+    corr, overlap = pairwise_corr(returns, min_periods=60)
+    pairs = top_pairs(corr, names, k=10)
+"""
+
+import numpy as np
+
+
+def _rank(x: np.ndarray) -> np.ndarray:
+    """열별 순위 (결측 유지, 동순위는 평균 순위)"""
+    out = np.full(x.shape, np.nan, dtype=np.float32)
+    for j in range(x.shape[1]):
+        col = x[:, j]
+        valid = ~np.isnan(col)
+        values = col[valid]
+        order = values.argsort(kind="mergesort")
+        ranks = np.empty(values.size, dtype=np.float64)
+        ranks[order] = np.arange(1, values.size + 1)
+        # 동순위 평균
+        uniq, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+        if uniq.size < values.size:
+            sums = np.bincount(inverse, weights=ranks)
+            ranks = (sums / counts)[inverse]
+        out[valid, j] = ranks
+    return out
+
+
+def pairwise_corr(
+    x: np.ndarray, min_periods: int = 20, method: str = "pearson"
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    x: (관측치 T, 종목 N) — NaN은 결측.
+    → (corr N×N float32, 겹치는 관측치 수 N×N int). 겹침이 min_periods 미만인 쌍은 NaN.
+    method="spearman"은 열 전체 순위 기반 근사 (모듈 설명 참고).
+    """
+    x = np.asarray(x, dtype=np.float32)
+    if method == "spearman":
+        x = _rank(x)
+    mask = ~np.isnan(x)
+    # 열 평균을 먼저 빼 float32 누적 오차(큰 수끼리 빼기)를 줄임
+    with np.errstate(invalid="ignore"):
+        x = x - np.nanmean(x, axis=0, dtype=np.float64).astype(np.float32)
+    m = mask.astype(np.float32)
+    z = np.where(mask, x, np.float32(0))
+
+    n = m.T @ m                      # 쌍별 겹치는 관측치 수
+    sx = z.T @ m                     # [i, j]: j가 있는 날짜에서 i의 합
+    sxx = (z * z).T @ m
+    sxy = z.T @ z
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_i = sxx - sx * sx / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    overlap = n.astype(np.int64)
+    corr[overlap < max(min_periods, 3)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    np.fill_diagonal(corr, 1.0)
+    return corr.astype(np.float32), overlap
+
+
+def top_pairs(corr: np.ndarray, names: list[str], k: int = 10, overlap: np.ndarray | None = None) -> dict:
+    """상삼각 쌍 중 상관이 가장 높은/낮은 k개 → {"most": [...], "least": [...]}"""
+    iu, ju = np.triu_indices(corr.shape[0], k=1)
+    values = corr[iu, ju]
+    valid = ~np.isnan(values)
+    iu, ju, values = iu[valid], ju[valid], values[valid]
+    if values.size == 0:
+        return {"most": [], "least": []}
+    k = min(k, values.size)
+
+    def _pairs(idx: np.ndarray) -> list[dict]:
+        return [
+            {
+                "a": names[iu[p]],
+                "b": names[ju[p]],
+                "corr": round(float(values[p]), 3),
+                **({"n": int(overlap[iu[p], ju[p]])} if overlap is not None else {}),
+            }
+            for p in idx
+        ]
+
+    most = np.argpartition(-values, k - 1)[:k]
+    least = np.argpartition(values, k - 1)[:k]
+    return {
+        "most": _pairs(most[np.argsort(-values[most])]),
+        "least": _pairs(least[np.argsort(values[least])]),
+    }
+
+
+def cluster_order(corr: np.ndarray) -> np.ndarray:
+    """
+    유사도 W = (1 + corr) / 2 그래프 라플라시안의 Fiedler 벡터로 정렬한 인덱스.
+    상관이 높은 종목끼리 가까이 놓임 (scipy 없이 N×N 고유분해 한 번).
+    """
+    n = corr.shape[0]
+    if n < 3:
+        return np.arange(n)
+    w = np.nan_to_num((1.0 + corr.astype(np.float64)) / 2.0, nan=0.5)
+    np.fill_diagonal(w, 0.0)
+    degree = w.sum(axis=1)
+    inv_sqrt = 1.0 / np.sqrt(np.maximum(degree, 1e-12))
+    laplacian = np.eye(n) - inv_sqrt[:, None] * w * inv_sqrt[None, :]
+    _, vectors = np.linalg.eigh(laplacian)
+    return np.argsort(vectors[:, 1] * inv_sqrt, kind="mergesort")
+
+
+def shrink(corr: np.ndarray, x: np.ndarray, target: str = "constant") -> tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf 방식 축소 → (축소된 corr, 강도 0~1).
+    표준화 수익률(결측 0)로 추정 오차(pi)와 목표와의 거리(gamma)를 구해 강도 = clip(pi / gamma / T).
+    target: identity(비대각 → 0) 또는 constant(비대각 → 평균 상관). constant의 rho 보정항은 생략한 근사.
+    """
+    x = np.asarray(x, dtype=np.float32)
+    mask = ~np.isnan(x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - np.nanmean(x, axis=0)) / np.nanstd(x, axis=0)
+    z = np.where(mask, z, np.float32(0)).astype(np.float32)
+    t = max(int(mask.any(axis=1).sum()), 1)
+
+    sample = np.nan_to_num(corr.astype(np.float32), nan=0.0)
+    n = sample.shape[0]
+    off = ~np.eye(n, dtype=bool)
+    if target == "identity":
+        goal = np.eye(n, dtype=np.float32)
+    else:
+        mean_corr = float(sample[off].mean()) if n > 1 else 0.0
+        goal = np.full((n, n), mean_corr, dtype=np.float32)
+        np.fill_diagonal(goal, 1.0)
+
+    # pi = Σ_ij Var(z_i z_j) — (z²)ᵀ(z²)/T - S² 로 행렬곱 한 번
+    z2 = z * z
+    pi = float(((z2.T @ z2) / t - sample * sample)[off].sum())
+    gamma = float(((sample - goal) ** 2)[off].sum())
+    intensity = 0.0 if gamma <= 0 else float(np.clip(pi / gamma / t, 0.0, 1.0))
+    shrunk = intensity * goal + (1.0 - intensity) * sample
+    np.fill_diagonal(shrunk, 1.0)
+    return shrunk.astype(np.float32), intensity
+
+
+def mean_offdiag(corr: np.ndarray) -> float:
+    n = corr.shape[0]
+    if n < 2:
+        return float("nan")
+    values = corr[~np.eye(n, dtype=bool)]
+    return float(np.nanmean(values)) if np.isfinite(values).any() else float("nan")
+
+
+def rolling_mean_corr(x: np.ndarray, window: int, step: int = 5, min_periods: int = 20) -> list[tuple[int, float]]:
+    """창(window개 관측치)을 step씩 밀며 평균 쌍별 상관 → [(창 마지막 행 인덱스, 평균 상관)]"""
+    x = np.asarray(x, dtype=np.float32)
+    out = []
+    last = x.shape[0]
+    # 마지막 창이 항상 포함되도록 끝에서부터 step 간격
+    for end in range(last, window - 1, -step):
+        corr, _ = pairwise_corr(x[end - window:end], min_periods=min(min_periods, window))
+        out.append((end - 1, mean_offdiag(corr)))
+    return out[::-1]
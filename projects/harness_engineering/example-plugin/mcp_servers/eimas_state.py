@@ -0,0 +1,153 @@
+"""
+EIMAS 파일 모드 상태 캐시 — mcp_eimas_server 전용
+
+도구 호출마다 outputs/를 glob·정렬하고 큰 JSON을 다시 파싱하지 않도록
+파싱 결과를 메모리에 두고 mtime으로 변경을 감지한다.
+
+  - 디렉토리 목록: OUTPUTS_DIR의 mtime이 바뀔 때만 다시 glob (파일 추가·삭제 시 디렉토리 mtime 변경)
+  - 파일 내용: 파일마다 (mtime_ns, size)가 바뀔 때만 다시 파싱 (제자리 덮어쓰기도 감지)
+    → 변경이 없으면 호출당 stat 몇 번
+  - regime_history.json: RegimeHistory로 파싱 — 레짐별 위치 색인 + 타임스탬프 이분 탐색
+
+반환되는 dict/list는 캐시와 공유되므로 읽기 전용으로 다룬다.
+
+    state = OutputsState(OUTPUTS_DIR)
+    analysis = state.main_result()
+    state.regime_history().query(regime="BULLISH", since="2025-01-01", limit=10)
+"""
+
+import bisect
+import glob
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+
+# 파싱 결과를 보관할 최대 파일 수 (새 분석 파일이 생기면 오래된 항목부터 버림)
+_MAX_FILES = 16
+
+# until 날짜 포함 비교용 — "2025-01-31" + _END는 그날의 어떤 ISO 타임스탬프보다 큼
+_END = "\uffff"
+
+
+@dataclass
+class RegimeHistory:
+    """regime_history.json 레코드 + 색인 (레코드 순서 = 파일 순서, 보통 시간순)"""
+
+    records: list = field(default_factory=list)
+    by_regime: dict[str, list[int]] = field(default_factory=dict)
+    timestamps: list[str] = field(default_factory=list)
+    time_ordered: bool = True
+
+    @classmethod
+    def build(cls, records: list) -> "RegimeHistory":
+        by_regime: dict[str, list[int]] = {}
+        timestamps = []
+        for i, record in enumerate(records):
+            regime = str(record.get("regime", "")).upper() if isinstance(record, dict) else ""
+            by_regime.setdefault(regime, []).append(i)
+            timestamps.append(str(record.get("timestamp", "")) if isinstance(record, dict) else "")
+        ordered = all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+        return cls(records, by_regime, timestamps, ordered)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def latest(self) -> Optional[dict]:
+        return self.records[-1] if self.records else None
+
+    def query(self, regime: str = "", since: str = "", until: str = "", limit: int = 10) -> tuple[int, list]:
+        """
+        필터에 맞는 레코드 → (일치 개수, 최신순 최대 limit개).
+        since/until은 타임스탬프 문자열 접두 비교 (YYYY-MM-DD 또는 ISO — until은 그 날짜 포함)
+        """
+        positions = self.by_regime.get(regime.upper(), []) if regime else range(len(self.records))
+        if since or until:
+            if self.time_ordered:
+                ts = self.timestamps
+                lo = bisect.bisect_left(positions, since, key=lambda i: ts[i]) if since else 0
+                hi = (bisect.bisect_right(positions, until + _END, key=lambda i: ts[i])
+                      if until else len(positions))
+                positions = positions[lo:hi]
+            else:
+                positions = [
+                    i for i in positions
+                    if (not since or self.timestamps[i] >= since)
+                    and (not until or self.timestamps[i] <= until + _END)
+                ]
+        matched = len(positions)
+        return matched, [self.records[i] for i in positions[-limit:]][::-1] if limit else []
+
+
+class OutputsState:
+    """outputs/ 디렉토리의 파싱 결과 캐시"""
+
+    def __init__(self, outputs_dir: Path):
+        self.outputs_dir = Path(outputs_dir)
+        self._lock = threading.Lock()
+        self._dir_mtime: Optional[int] = None
+        self._latest_names: dict[str, Optional[str]] = {}
+        self._files: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+    # ── 디렉토리 목록 ───────────────────────────────────────────────────
+
+    def latest_path(self, pattern: str) -> Optional[Path]:
+        """패턴에 맞는 파일 중 이름순 최신 (타임스탬프 파일명 기준) — 디렉토리가 바뀐 경우에만 다시 glob"""
+        try:
+            mtime = os.stat(self.outputs_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime != self._dir_mtime:
+                self._dir_mtime = mtime
+                self._latest_names.clear()
+            if pattern not in self._latest_names:
+                files = glob.glob(str(self.outputs_dir / pattern))
+                self._latest_names[pattern] = max(files) if files else None
+            name = self._latest_names[pattern]
+        return Path(name) if name else None
+
+    # ── 파일 내용 ───────────────────────────────────────────────────────
+
+    def load(self, path: Path, parse=None) -> Optional[Any]:
+        """JSON 파일 → 파싱 결과 (mtime·크기가 같으면 캐시). 없거나 깨졌으면 None"""
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, TypeError):
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            hit = self._files.get(path)
+            if hit and hit[0] == stamp:
+                return hit[1]
+        try:
+            with open(path) as f:
+                value = json.load(f)
+            if parse is not None:
+                value = parse(value)
+        except Exception:
+            return None
+        with self._lock:
+            self._files.pop(path, None)
+            self._files[path] = (stamp, value)
+            while len(self._files) > _MAX_FILES:
+                self._files.pop(next(iter(self._files)))
+        return value
+
+    def latest(self, pattern: str) -> Optional[Any]:
+        path = self.latest_path(pattern)
+        return self.load(path) if path else None
+
+    def main_result(self) -> Optional[dict]:
+        """최신 EIMAS 분석 결과 (eimas_*.json 우선, real_analysis_result.json 폴백)"""
+        return self.latest("eimas_*.json") or self.load(self.outputs_dir / "real_analysis_result.json")
+
+    def regime_history(self) -> RegimeHistory:
+        history = self.load(
+            self.outputs_dir / "regime_history.json",
+            parse=lambda data: RegimeHistory.build(data if isinstance(data, list) else []),
+        )
+        return history if history is not None else RegimeHistory()
@@ -0,0 +1,213 @@
+"""
+EIMAS events.db 접근 계층 — mcp_eimas_server 전용
+
+  - 읽기 전용 연결 풀: 호출마다 connect/close 하지 않고 연결을 재사용
+    (연결별 statement 캐시 → 같은 SQL 텍스트 + ? 파라미터는 다시 컴파일하지 않음)
+  - 스키마 캐시: 이벤트 테이블·컬럼·인덱스 탐색은 PRAGMA schema_version이 바뀔 때만 다시
+  - 이벤트 조회: 원시 timestamp 범위 비교(timestamp >= ?) — date(timestamp)처럼 컬럼을 함수로 감싸지 않아 인덱스 사용 가능
+      TEXT(ISO) 컬럼은 'YYYY-MM-DD' 문자열, INTEGER/REAL 컬럼은 epoch초로 비교
+  - 인덱스 권고: EXPLAIN QUERY PLAN + 기존 인덱스 확인 → CREATE INDEX 제안
+    (적용은 EIMAS_EVENTS_INDEX_WRITE=true일 때만 — 평소에는 DB에 쓰지 않음)
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+ALLOW_INDEX_WRITE = os.environ.get("EIMAS_EVENTS_INDEX_WRITE", "false").lower() == "true"
+
+_NUMERIC_TYPES = ("INT", "REAL", "FLOA", "DOUB", "NUM")
+
+# 풀이 모두 사용 중일 때 반납을 기다리는 최대 시간(초) — 도구 타임아웃(15초)보다 짧게
+POOL_WAIT_SEC = 10.0
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class EventsDB:
+    def __init__(self, path: Path, pool_size: int = 4):
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._schema: Optional[dict] = None
+        self._schema_version: Optional[int] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    # ── 연결 풀 ─────────────────────────────────────────────────────────
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False, cached_statements=64
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _acquire(self, timeout: float) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._opened < self.pool_size
+            if create:
+                self._opened += 1
+        if not create:
+            try:
+                return self._pool.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"events.db 연결 대기 {timeout:g}초 초과") from None
+        try:
+            return self._open()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def connection(self, timeout: float = POOL_WAIT_SEC) -> Iterator[sqlite3.Connection]:
+        """
+        풀에서 연결 하나 (pool_size개까지 만들고, 다 쓰이면 timeout초까지 반납을 기다림).
+        DatabaseError(파일 교체 등)가 난 연결은 버리고, 그 밖의 경우(다른 예외 포함)는 항상 반납.
+        """
+        conn = self._acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            broken = True
+            raise
+        finally:
+            if broken:
+                conn.close()
+                with self._lock:
+                    self._opened -= 1
+            else:
+                self._pool.put(conn)
+
+    # ── 스키마 ──────────────────────────────────────────────────────────
+
+    def schema(self) -> dict:
+        """
+        {"tables", "event_table", "columns": {이름: 선언 타입}, "timestamp_col", "type_col", "indexes": [[컬럼...]]}
+        schema_version이 같으면 캐시 반환.
+        """
+        with self.connection() as conn:
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            with self._lock:
+                if self._schema is not None and version == self._schema_version:
+                    return self._schema
+            tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+            event_table = next((t for t in tables if "event" in t.lower()), None)
+            columns, indexes = {}, []
+            if event_table:
+                for row in conn.execute(f"PRAGMA table_info({_quote(event_table)})"):
+                    columns[row["name"]] = (row["type"] or "").upper()
+                for index in conn.execute(f"PRAGMA index_list({_quote(event_table)})"):
+                    cols = [r["name"] for r in conn.execute(f"PRAGMA index_info({_quote(index['name'])})")]
+                    indexes.append(cols)
+        schema = {
+            "tables": tables,
+            "event_table": event_table,
+            "columns": columns,
+            "timestamp_col": "timestamp" if "timestamp" in columns else None,
+            "type_col": "event_type" if "event_type" in columns else None,
+            "indexes": indexes,
+        }
+        with self._lock:
+            self._schema, self._schema_version = schema, version
+        return schema
+
+    # ── 조회 ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _event_query(schema: dict, since: bool, event_type: bool) -> str:
+        """조건 조합별 고정 SQL 텍스트 (값은 모두 ? 파라미터) → 연결의 statement 캐시에 걸림"""
+        table = _quote(schema["event_table"])
+        ts_col = schema["timestamp_col"]
+        where = []
+        if event_type:
+            where.append(f"{_quote(schema['type_col'])} = ?")
+        if since and ts_col:
+            where.append(f"{_quote(ts_col)} >= ?")
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {_quote(ts_col)} DESC" if ts_col else " ORDER BY rowid DESC"
+        return sql + " LIMIT ?"
+
+    def _since_param(self, schema: dict, since: datetime):
+        declared = schema["columns"].get(schema["timestamp_col"], "")
+        if any(t in declared for t in _NUMERIC_TYPES):
+            return since.timestamp()
+        return since.strftime("%Y-%m-%d")
+
+    def query_events(self, since: Optional[datetime] = None, event_type: str = "", limit: int = 20) -> list[dict]:
+        schema = self.schema()
+        if event_type and not schema["type_col"]:
+            raise ValueError(f"{schema['event_table']}에 event_type 컬럼 없음")
+        sql = self._event_query(schema, since is not None, bool(event_type))
+        params: list = []
+        if event_type:
+            params.append(event_type)
+        if since is not None and schema["timestamp_col"]:
+            params.append(self._since_param(schema, since))
+        params.append(int(limit))
+        with self.connection() as conn:
+            return [dict(r) for r in conn.execute(sql, params)]
+
+    # ── 인덱스 권고 ─────────────────────────────────────────────────────
+
+    def advise(self) -> dict:
+        """현재 쿼리 계획과 빠진 인덱스 → {"plans": {...}, "indexes": [...], "suggestions": [SQL]}"""
+        schema = self.schema()
+        table, ts_col, type_col = schema["event_table"], schema["timestamp_col"], schema["type_col"]
+        plans = {}
+        # 풀 연결의 캐시된 EXPLAIN은 인덱스 생성 전 계획을 돌려줄 수 있어 점검용 연결을 따로 연다
+        conn = self._open()
+        try:
+            for label, with_type in (("by_time", False), ("by_type_and_time", True)):
+                if with_type and not type_col:
+                    continue
+                sql = self._event_query(schema, True, with_type)
+                params = (["x"] if with_type else []) + (["2000-01-01"] if ts_col else []) + [1]
+                plans[label] = [r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        finally:
+            conn.close()
+
+        wanted = []
+        if ts_col:
+            wanted.append([ts_col])
+        if ts_col and type_col:
+            wanted.append([type_col, ts_col])
+        suggestions = [
+            f"CREATE INDEX IF NOT EXISTS {_quote('idx_' + table + '_' + '_'.join(cols))} "
+            f"ON {_quote(table)}({', '.join(_quote(c) for c in cols)})"
+            for cols in wanted
+            if not any(index[:len(cols)] == cols for index in schema["indexes"])
+        ]
+        return {"table": table, "indexes": schema["indexes"], "plans": plans, "suggestions": suggestions}
+
+    def create_indexes(self, statements: list[str]) -> list[str]:
+        """advise()의 CREATE INDEX 적용 (EIMAS_EVENTS_INDEX_WRITE=true일 때만, 별도 쓰기 연결)"""
+        if not ALLOW_INDEX_WRITE:
+            raise PermissionError("인덱스 생성은 EIMAS_EVENTS_INDEX_WRITE=true일 때만 허용")
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                for statement in statements:
+                    conn.execute(statement)
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return statements
@@ -0,0 +1,111 @@
+"""
+FRED 시계열 분석 — mcp_fred_server 분석 도구의 계산 본문
+
+관측치 저장소(fred_store)의 전체 이력 위에서 pandas/NumPy 벡터 연산으로 계산하고
+LLM 컨텍스트에는 요약(최신값·분포·최근 몇 개 점)만 돌려준다.
+
+    s = transform(store.series("CPIAUCSL"), "yoy")       # 전년 대비 %
+    z = rolling_zscore(s, window=36)
+    frame = align({"DGS10": s10, "DGS2": s2}, "d")       # 공통 날짜로 정렬
+"""
+
+import numpy as np
+import pandas as pd
+
+from fred_store import resample
+
+# 주기 코드(frequency_short) — 거친 순서, 정렬 시 가장 거친 주기를 공통 주기로 사용
+FREQ_ORDER = ["D", "W", "BW", "M", "Q", "SA", "A"]
+
+# 롤링 z-score 기본 창 (관측치 수, 대략 3년 — 일간은 1년)
+DEFAULT_WINDOW = {"D": 252, "W": 52, "BW": 26, "M": 36, "Q": 12, "SA": 6, "A": 5}
+
+TRANSFORMS = ("level", "diff", "mom", "yoy")
+_OFFSETS = {"mom": pd.DateOffset(months=1), "yoy": pd.DateOffset(years=1)}
+
+
+def transform(series: pd.Series, how: str = "level") -> pd.Series:
+    """
+    level: 원값 / diff: 직전 관측치 대비 차분 / mom·yoy: 1개월·1년 전 값 대비 변화율(%).
+    mom·yoy는 날짜 기준(asof) — 일간·주간 시계열도 같은 날짜 간격으로 비교.
+    """
+    if how == "level" or series.empty:
+        return series
+    if how == "diff":
+        return series.diff().dropna()
+    offset = _OFFSETS.get(how)
+    if offset is None:
+        raise ValueError(f"알 수 없는 변환: {how} (가능: {', '.join(TRANSFORMS)})")
+    base = series.asof(series.index - offset).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (series.to_numpy() / base - 1.0) * 100.0
+    out = pd.Series(change, index=series.index, name=series.name)
+    return out.replace([np.inf, -np.inf], np.nan).dropna()
+
+
+def rolling_zscore(series: pd.Series, window: int) -> pd.Series:
+    """직전 window개 관측치 기준 z-score (창의 절반 이상 채워져야 계산)"""
+    rolling = series.rolling(window, min_periods=max(2, window // 2))
+    z = (series - rolling.mean()) / rolling.std()
+    return z.replace([np.inf, -np.inf], np.nan).dropna()
+
+
+def summarize(series: pd.Series, tail: int = 12, digits: int = 4) -> dict:
+    """최신값·전체 분포·최신값의 백분위·최근 tail개 점"""
+    if series.empty:
+        return {"count": 0}
+    values = series.to_numpy()
+    latest = float(values[-1])
+    return {
+        "count": int(values.size),
+        "start": series.index[0].strftime("%Y-%m-%d"),
+        "latest_date": series.index[-1].strftime("%Y-%m-%d"),
+        "latest": round(latest, digits),
+        "mean": round(float(values.mean()), digits),
+        "std": round(float(values.std(ddof=1)), digits) if values.size > 1 else None,
+        "min": round(float(values.min()), digits),
+        "max": round(float(values.max()), digits),
+        "percentile": round(float((values <= latest).mean() * 100), 1),
+        "recent": [
+            {"date": d.strftime("%Y-%m-%d"), "value": round(float(v), digits)}
+            for d, v in series.iloc[-tail:].items()
+        ] if tail else [],
+    }
+
+
+def coarsest(frequencies: list[str]) -> str:
+    """주기 코드 목록 중 가장 거친 주기 → fetch_series frequency 값(d/w/m/q/a)"""
+    ranks = [FREQ_ORDER.index(f.upper()) for f in frequencies if f and f.upper() in FREQ_ORDER]
+    code = FREQ_ORDER[max(ranks)] if ranks else "D"
+    return {"D": "d", "W": "w", "BW": "w", "M": "m", "Q": "q", "SA": "a", "A": "a"}[code]
+
+
+def align(series: dict[str, pd.Series], frequency: str = "d", how: str = "avg") -> pd.DataFrame:
+    """시리즈들을 같은 주기로 변환해 모두 값이 있는 날짜만 남긴 DataFrame (열 = series_id)"""
+    columns = {sid: resample(s, frequency, how) for sid, s in series.items()}
+    return pd.concat(columns, axis=1, join="inner").dropna()
+
+
+def spread_summary(spread: pd.Series, window: int, digits: int = 4) -> dict:
+    """스프레드 요약 + 롤링 z-score + 음(-)인 기간 비중 (역전 판단용)"""
+    summary = summarize(spread, tail=0, digits=digits)
+    summary.pop("recent", None)
+    if spread.empty:
+        return summary
+    z = rolling_zscore(spread, window)
+    summary["zscore"] = round(float(z.iloc[-1]), 2) if not z.empty else None
+    summary["negative_share"] = round(float((spread.to_numpy() < 0).mean() * 100), 1)
+    return summary
+
+
+def correlation(frame: pd.DataFrame, on: str = "diff", digits: int = 3) -> dict:
+    """정렬된 DataFrame의 상관행렬 (on: level 또는 diff — 수준 상관은 추세에 끌려가기 쉬움)"""
+    data = frame.diff().dropna() if on == "diff" else frame
+    if len(data) < 3:
+        return {}
+    matrix = np.corrcoef(data.to_numpy(dtype=np.float64), rowvar=False)
+    names = list(frame.columns)
+    return {
+        a: {b: round(float(matrix[i, j]), digits) for j, b in enumerate(names) if j != i}
+        for i, a in enumerate(names)
+    }
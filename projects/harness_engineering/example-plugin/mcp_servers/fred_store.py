@@ -0,0 +1,206 @@
+"""
+FRED 관측치 로컬 저장소 (SQLite) — mcp_fred_server 전용
+
+시리즈별 전체 관측 이력을 로컬에 두고 변경분만 동기화한다.
+도구는 저장소에서 답하고 구간 자르기·주기 변환은 로컬(pandas)에서 처리.
+
+동기화 규칙 (sync):
+  1. 마지막 동기화 후 FRED_SYNC_TTL(기본 1시간) 이내 → 네트워크 호출 없음
+  2. series 메타데이터의 last_updated가 저장값과 같음 → 관측치 호출 없음 (메타 1회)
+  3. 바뀌었으면 저장된 최대 날짜 - 개정 구간(주기별)부터 다시 받아 덮어씀
+     - FRED 관측치는 현재 빈티지(realtime = 오늘) 값 → 개정된 과거 값은 개정 구간 안에서 교체
+     - 행마다 해당 값의 realtime_start(빈티지 시작일) 보관
+  4. 처음이거나 force=True → 전체 이력 다운로드 (기존 행 교체)
+
+    store = FredStore(path, fetch=fred_get)
+    store.sync("DGS10")
+    s = store.series("DGS10", start="2024-01-01")     # pandas Series (날짜 인덱스, 결측 제외)
+    m = resample(s, "m", "avg")                       # FRED frequency/aggregation_method와 같은 의미
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+DEFAULT_DB = Path(os.environ.get(
+    "FRED_STORE_DB",
+    str(Path.home() / ".cache" / "finance-harness" / "fred_observations.db"),
+))
+SYNC_TTL_SEC = float(os.environ.get("FRED_SYNC_TTL", "3600"))
+
+# 주기(frequency_short)별 개정 구간 — 이 기간 안의 과거 값은 재동기화 때 다시 받아 덮어씀
+REVISION_LOOKBACK_DAYS = {
+    "D": 45,
+    "W": 90,
+    "BW": 90,
+    "M": 400,
+    "Q": 3 * 365,
+    "SA": 3 * 365,
+    "A": 5 * 365,
+}
+
+# FRED frequency 코드 → pandas 리샘플 규칙 (FRED처럼 기간 시작일로 표기)
+_RESAMPLE_RULES = {"w": "W-FRI", "m": "MS", "q": "QS", "a": "YS"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    series_id      TEXT PRIMARY KEY,
+    frequency      TEXT,
+    units          TEXT,
+    last_updated   TEXT,
+    synced_at      REAL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    series_id      TEXT NOT NULL,
+    date           TEXT NOT NULL,
+    value          REAL,
+    realtime_start TEXT,
+    PRIMARY KEY (series_id, date)
+) WITHOUT ROWID;
+"""
+
+
+class FredStore:
+    def __init__(self, path: Path | str = DEFAULT_DB, fetch: Optional[Callable[[str, dict], dict]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fetch = fetch
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._series_locks: dict[str, threading.Lock] = {}
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (도구는 ToolExecutor 스레드 풀에서 실행됨)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _series_lock(self, series_id: str) -> threading.Lock:
+        with self._write_lock:
+            return self._series_locks.setdefault(series_id, threading.Lock())
+
+    # ── 동기화 ──────────────────────────────────────────────────────────
+
+    def meta(self, series_id: str) -> Optional[dict]:
+        row = self._conn().execute(
+            "SELECT frequency, units, last_updated, synced_at FROM series WHERE series_id = ?",
+            (series_id,),
+        ).fetchone()
+        if not row:
+            return None
+        return dict(zip(("frequency", "units", "last_updated", "synced_at"), row))
+
+    def sync(self, series_id: str, force: bool = False) -> dict:
+        """
+        변경분만 동기화 → {"mode": "fresh"|"unchanged"|"incremental"|"full", "fetched": 행 수}
+        같은 시리즈 동시 요청은 하나만 네트워크를 타고 나머지는 결과를 기다림.
+        """
+        with self._series_lock(series_id):
+            meta = self.meta(series_id)
+            if meta and not force and time.time() - (meta["synced_at"] or 0) < SYNC_TTL_SEC:
+                return {"mode": "fresh", "fetched": 0}
+
+            info = (self._fetch("series", {"series_id": series_id}).get("seriess") or [{}])[0]
+            last_updated = info.get("last_updated", "")
+            frequency = info.get("frequency_short", (meta or {}).get("frequency") or "")
+            units = info.get("units", (meta or {}).get("units") or "")
+
+            if meta and not force and last_updated and last_updated == meta["last_updated"]:
+                self._touch(series_id, frequency, units, last_updated)
+                return {"mode": "unchanged", "fetched": 0}
+
+            params = {"series_id": series_id}
+            max_date = self._max_date(series_id)
+            mode = "full"
+            if meta and max_date and not force:
+                lookback = REVISION_LOOKBACK_DAYS.get(frequency.upper(), 400)
+                start = datetime.strptime(max_date, "%Y-%m-%d") - timedelta(days=lookback)
+                params["observation_start"] = start.strftime("%Y-%m-%d")
+                mode = "incremental"
+
+            obs = self._fetch("series/observations", params).get("observations", [])
+            rows = [
+                (series_id, o["date"], None if o["value"] == "." else float(o["value"]), o.get("realtime_start"))
+                for o in obs
+            ]
+            with self._write_lock:
+                conn = self._conn()
+                with conn:
+                    if mode == "full":
+                        conn.execute("DELETE FROM observations WHERE series_id = ?", (series_id,))
+                    else:
+                        conn.execute(
+                            "DELETE FROM observations WHERE series_id = ? AND date >= ?",
+                            (series_id, params["observation_start"]),
+                        )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)", rows
+                    )
+                    self._upsert_series(conn, series_id, frequency, units, last_updated)
+            return {"mode": mode, "fetched": len(rows)}
+
+    def _max_date(self, series_id: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _touch(self, series_id: str, frequency: str, units: str, last_updated: str) -> None:
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                self._upsert_series(conn, series_id, frequency, units, last_updated)
+
+    @staticmethod
+    def _upsert_series(conn, series_id: str, frequency: str, units: str, last_updated: str) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)",
+            (series_id, frequency, units, last_updated, time.time()),
+        )
+
+    # ── 조회 ────────────────────────────────────────────────────────────
+
+    def series(self, series_id: str, start: str = "", end: str = "") -> pd.Series:
+        """저장된 관측치 → float Series (DatetimeIndex, 결측 제외, 날짜 오름차순)"""
+        query = "SELECT date, value FROM observations WHERE series_id = ? AND value IS NOT NULL"
+        params: list = [series_id]
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        rows = self._conn().execute(query + " ORDER BY date", params).fetchall()
+        if not rows:
+            return pd.Series(dtype="float64", name=series_id)
+        dates, values = zip(*rows)
+        return pd.Series(values, index=pd.to_datetime(dates), name=series_id, dtype="float64")
+
+
+def resample(series: pd.Series, frequency: str = "", how: str = "avg") -> pd.Series:
+    """
+    FRED frequency(d/w/m/q/a)·aggregation_method(avg/sum/eop)를 로컬에서 재현.
+    d 또는 빈 값 → 원본 그대로. 기간 라벨은 FRED처럼 기간 시작일(주간은 금요일 종료).
+    """
+    rule = _RESAMPLE_RULES.get(frequency.lower()) if frequency else None
+    if rule is None or series.empty:
+        return series
+    grouped = series.resample(rule)
+    if how == "sum":
+        out = grouped.sum(min_count=1)
+    elif how == "eop":
+        out = grouped.last()
+    else:
+        out = grouped.mean()
+    return out.dropna()
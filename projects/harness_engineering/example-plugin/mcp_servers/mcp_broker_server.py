@@ -11,8 +11,11 @@ TastyTrade 브로커 연동 MCP 서버 (tasty-agent 패턴 기반)
   - get_quotes(symbols)  — 실시간 주가
   - get_greeks(options)  — 옵션 Greeks (δ, γ, θ)
   - place_order(legs)    — 주문 실행 (Dry Run 기본)
+  - subscribe_quotes(symbols)   — 시세·Greeks 스트리밍 구독 (Dry Run은 로컬 시뮬레이터)
+  - read_quotes(symbols, since) — 구독 중인 최신 시세 표 조회 (since=seq로 변경분만)
 
-Rate limiting: 2 req/s 자동 제한
+Rate limiting: 2 req/s 토큰 버킷 (asyncio — 대기 중에도 이벤트 루프를 막지 않음)
+시세·Greeks: 동시에 들어온 요청을 모아 심볼 배치로 조회
 """
 
 import asyncio
@@ -23,6 +26,8 @@ from typing import Any
 
 import httpx
 
+from quote_stream import DxLinkStream, QuoteTable, SimulatedStream
+
 try:
     from mcp.server import Server
     from mcp.server.stdio import stdio_server
@@ -40,25 +45,100 @@ BROKER_DRY_RUN = os.environ.get("BROKER_DRY_RUN", "true").lower() != "false"
 TASTYTRADE_BASE = "https://api.tastytrade.com"
 
 # ── Rate Limiter (2 req/s) ────────────────────────────────────────────────────
-_last_request_time: float = 0.0
-_MIN_INTERVAL = 0.5  # 500ms = 2 req/s
-
-
-def _rate_limit() -> None:
-    global _last_request_time
-    elapsed = time.monotonic() - _last_request_time
-    if elapsed < _MIN_INTERVAL:
-        time.sleep(_MIN_INTERVAL - elapsed)
-    _last_request_time = time.monotonic()
+_RATE_PER_SEC = 2.0   # TastyTrade 권장 상한
+_BURST = 2            # 한 번에 몰아 쓸 수 있는 토큰 수
+
+# 여러 심볼 조회는 짧은 창 동안 모아 한 번에 — 동시에 들어온 get_quotes/get_greeks 호출도 합쳐짐
+_BATCH_WINDOW_SEC = 0.02
+_MAX_SYMBOLS_PER_REQUEST = 100
+
+
+class AsyncTokenBucket:
+    """asyncio 토큰 버킷 — 토큰이 없으면 이벤트 루프를 막지 않고 다음 토큰까지 await"""
+
+    def __init__(self, rate: float = _RATE_PER_SEC, capacity: int = _BURST) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:  # 대기 순서 = 요청 순서
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _SymbolBatcher:
+    """
+    심볼 단위 요청을 window초 동안 모아 max_batch개씩 fetch(symbols) 한 번으로 조회.
+    fetch는 {symbol: item}을 반환 — 응답에 없는 심볼은 결과에서 빠짐.
+    """
+
+    def __init__(self, fetch, max_batch: int = _MAX_SYMBOLS_PER_REQUEST, window: float = _BATCH_WINDOW_SEC) -> None:
+        self._fetch = fetch
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def get(self, symbols: list[str]) -> dict:
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for sym in dict.fromkeys(symbols):
+            futures[sym] = loop.create_future()
+            self._pending.setdefault(sym, []).append(futures[sym])
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        values = await asyncio.gather(*futures.values())
+        return {sym: item for sym, item in zip(futures, values) if item is not None}
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        symbols = list(pending)
+        chunks = [symbols[i:i + self.max_batch] for i in range(0, len(symbols), self.max_batch)]
+        await asyncio.gather(*(self._resolve(chunk, pending) for chunk in chunks))
+
+    async def _resolve(self, chunk: list[str], pending: dict[str, list[asyncio.Future]]) -> None:
+        try:
+            items = await self._fetch(chunk)
+        except Exception as e:
+            for sym in chunk:
+                for future in pending[sym]:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for sym in chunk:
+            for future in pending[sym]:
+                if not future.done():
+                    future.set_result(items.get(sym))
 
 
 # ── TastyTrade HTTP 클라이언트 ────────────────────────────────────────────────
 class TastyTradeClient:
-    """TastyTrade API 클라이언트 (동기 래퍼)"""
+    """
+    TastyTrade API 클라이언트 (async)
+    - 공유 httpx.AsyncClient (연결 재사용), 모든 요청은 AsyncTokenBucket을 거침
+    - 시세·Greeks는 _SymbolBatcher로 묶어 최소 호출 수로 조회
+    - LIVE 모드에서 세션 토큰이 없으면 첫 요청 때 로그인
+    """
 
     def __init__(self) -> None:
         self._session_token: str = ""
         self._account_number: str = ""
+        self._bucket = AsyncTokenBucket()
+        self._http: httpx.AsyncClient | None = None
+        self._auth_lock = asyncio.Lock()
+        self._quotes = _SymbolBatcher(self._fetch_quotes)
+        self._greeks = _SymbolBatcher(self._fetch_greeks)
 
     def _headers(self) -> dict:
         return {
@@ -66,16 +146,32 @@ class TastyTradeClient:
             "Content-Type": "application/json",
         }
 
-    def authenticate(self) -> bool:
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=TASTYTRADE_BASE,
+                timeout=10,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        await self._bucket.acquire()
+        return await self._client().request(method, path, headers=self._headers(), **kwargs)
+
+    async def authenticate(self) -> bool:
         """세션 토큰 발급"""
         if not TASTYTRADE_USER or not TASTYTRADE_PASS:
             return False
-        _rate_limit()
         try:
-            resp = httpx.post(
-                f"{TASTYTRADE_BASE}/sessions",
+            resp = await self._request(
+                "POST", "/sessions",
                 json={"login": TASTYTRADE_USER, "password": TASTYTRADE_PASS},
-                timeout=10,
             )
             if resp.status_code == 201:
                 data = resp.json()["data"]
@@ -86,77 +182,68 @@ class TastyTradeClient:
             pass
         return False
 
-    def _get_account_number(self) -> str:
+    async def _ensure_session(self) -> None:
+        if self._session_token:
+            return
+        async with self._auth_lock:  # 동시 요청이 로그인을 여러 번 하지 않도록
+            if not self._session_token:
+                await self.authenticate()
+
+    async def _get(self, path: str, **kwargs) -> Any:
+        await self._ensure_session()
+        resp = await self._request("GET", path, **kwargs)
+        return resp.json()["data"]
+
+    async def _get_account_number(self) -> str:
         """계좌 번호 조회"""
         if self._account_number:
             return self._account_number
-        _rate_limit()
-        resp = httpx.get(
-            f"{TASTYTRADE_BASE}/customers/me/accounts",
-            headers=self._headers(),
-            timeout=10,
-        )
-        accounts = resp.json()["data"]["items"]
+        accounts = (await self._get("/customers/me/accounts"))["items"]
         if accounts:
             self._account_number = accounts[0]["account"]["account-number"]
         return self._account_number
 
-    def get_balances(self) -> dict:
+    async def get_balances(self) -> dict:
         """계좌 잔고·매수여력 조회"""
         if BROKER_DRY_RUN and not self._session_token:
             return _dry_run_balances()
-        _rate_limit()
-        acct = self._get_account_number()
-        resp = httpx.get(
-            f"{TASTYTRADE_BASE}/accounts/{acct}/balances",
-            headers=self._headers(),
-            timeout=10,
-        )
-        return resp.json()["data"]
+        acct = await self._get_account_number()
+        return await self._get(f"/accounts/{acct}/balances")
 
-    def get_positions(self) -> list:
+    async def get_positions(self) -> list:
         """보유 포지션·평가손익 조회"""
         if BROKER_DRY_RUN and not self._session_token:
             return _dry_run_positions()
-        _rate_limit()
-        acct = self._get_account_number()
-        resp = httpx.get(
-            f"{TASTYTRADE_BASE}/accounts/{acct}/positions",
-            headers=self._headers(),
-            timeout=10,
-        )
-        return resp.json()["data"]["items"]
-
-    def get_quotes(self, symbols: list[str]) -> dict:
-        """실시간 주가 조회"""
+        acct = await self._get_account_number()
+        return (await self._get(f"/accounts/{acct}/positions"))["items"]
+
+    async def get_quotes(self, symbols: list[str]) -> dict:
+        """실시간 주가 조회 (동시 요청과 합쳐 배치 조회)"""
         if BROKER_DRY_RUN and not self._session_token:
             return _dry_run_quotes(symbols)
-        _rate_limit()
-        params = {"symbols[]": symbols}
-        resp = httpx.get(
-            f"{TASTYTRADE_BASE}/market-metrics",
-            headers=self._headers(),
-            params=params,
-            timeout=10,
-        )
-        items = resp.json()["data"]["items"]
-        return {item["symbol"]: item for item in items}
-
-    def get_greeks(self, options: list[str]) -> dict:
-        """옵션 Greeks (δ, γ, θ, ν, ρ) 조회"""
+        return await self._quotes.get(symbols)
+
+    async def _fetch_quotes(self, symbols: list[str]) -> dict:
+        data = await self._get("/market-metrics", params={"symbols[]": symbols})
+        return {item["symbol"]: item for item in data["items"]}
+
+    async def get_greeks(self, options: list[str]) -> dict:
+        """옵션 Greeks (δ, γ, θ, ν, ρ) 조회 (동시 요청과 합쳐 배치 조회)"""
         if BROKER_DRY_RUN and not self._session_token:
             return _dry_run_greeks(options)
-        _rate_limit()
-        params = {"symbols[]": options}
-        resp = httpx.get(
-            f"{TASTYTRADE_BASE}/option-chains/greeks",
-            headers=self._headers(),
-            params=params,
-            timeout=10,
-        )
-        return resp.json()["data"]
+        items = await self._greeks.get(options)
+        return {"items": list(items.values())}
+
+    async def _fetch_greeks(self, options: list[str]) -> dict:
+        data = await self._get("/option-chains/greeks", params={"symbols[]": options})
+        return {item["symbol"]: item for item in data.get("items", [])}
+
+    async def get_quote_token(self) -> tuple[str, str]:
+        """DXLink 스트리밍 토큰 → (token, dxlink_url)"""
+        data = await self._get("/api-quote-tokens")
+        return data["token"], data["dxlink-url"]
 
-    def place_order(self, legs: list[dict], dry_run: bool = True) -> dict:
+    async def place_order(self, legs: list[dict], dry_run: bool = True) -> dict:
         """
         주문 실행
         legs: [{"instrument-type": "Equity", "symbol": "SPY", "quantity": 1,
@@ -165,19 +252,14 @@ class TastyTradeClient:
         """
         if BROKER_DRY_RUN or dry_run:
             return _dry_run_order(legs)
-        _rate_limit()
-        acct = self._get_account_number()
+        await self._ensure_session()
+        acct = await self._get_account_number()
         payload = {
             "time-in-force": "Day",
             "order-type": "Market",
             "legs": legs,
         }
-        resp = httpx.post(
-            f"{TASTYTRADE_BASE}/accounts/{acct}/orders/dry-run",
-            headers=self._headers(),
-            json=payload,
-            timeout=10,
-        )
+        resp = await self._request("POST", f"/accounts/{acct}/orders/dry-run", json=payload)
         return resp.json()["data"]
 
 
@@ -250,6 +332,20 @@ def _dry_run_order(legs: list[dict]) -> dict:
 # ── MCP 서버 구현 ─────────────────────────────────────────────────────────────
 _client = TastyTradeClient()
 
+# 스트리밍 시세 표 — subscribe_quotes로 구독, read_quotes는 표만 읽음 (REST 호출 없음)
+_quote_table = QuoteTable()
+_stream: SimulatedStream | DxLinkStream | None = None
+
+
+def _get_stream() -> SimulatedStream | DxLinkStream:
+    global _stream
+    if _stream is None:
+        if BROKER_DRY_RUN and not _client._session_token:
+            _stream = SimulatedStream(_quote_table)
+        else:
+            _stream = DxLinkStream(_quote_table, _client.get_quote_token)
+    return _stream
+
 TOOLS: list[dict] = [
     {
         "name": "get_balances",
@@ -311,22 +407,79 @@ TOOLS: list[dict] = [
             "required": ["legs"],
         },
     },
+    {
+        "name": "subscribe_quotes",
+        "description": (
+            "시세·Greeks 스트리밍 구독 (포지션 모니터링용 — get_quotes 반복 호출 대신). "
+            "구독 후 read_quotes로 최신 값을 즉시 읽음. BROKER_DRY_RUN=true이면 로컬 시뮬레이터."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "티커 또는 옵션 스트리머 심볼 (예: 'SPY', '.SPY240315C500')",
+                },
+                "unsubscribe": {
+                    "type": "boolean",
+                    "description": "true이면 구독 해제",
+                    "default": False,
+                },
+            },
+            "required": ["symbols"],
+        },
+    },
+    {
+        "name": "read_quotes",
+        "description": (
+            "구독 중인 최신 시세 표 조회 (네트워크 호출 없음). "
+            "since에 이전 응답의 seq를 넘기면 그 뒤 바뀐 심볼만 반환."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "조회할 심볼 (기본: 구독 중 전체)",
+                },
+                "since": {
+                    "type": "integer",
+                    "description": "이전 응답의 seq (기본 0: 전체 스냅샷)",
+                    "default": 0,
+                },
+            },
+            "required": [],
+        },
+    },
 ]
 
 
-def _call_tool(name: str, arguments: dict) -> Any:
+async def _call_tool(name: str, arguments: dict) -> Any:
     """도구 실행 디스패처"""
     if name == "get_balances":
-        return _client.get_balances()
+        return await _client.get_balances()
     elif name == "get_positions":
-        return _client.get_positions()
+        return await _client.get_positions()
     elif name == "get_quotes":
-        return _client.get_quotes(arguments["symbols"])
+        return await _client.get_quotes(arguments["symbols"])
     elif name == "get_greeks":
-        return _client.get_greeks(arguments["options"])
+        return await _client.get_greeks(arguments["options"])
     elif name == "place_order":
         dry = arguments.get("dry_run", True)
-        return _client.place_order(arguments["legs"], dry_run=dry)
+        return await _client.place_order(arguments["legs"], dry_run=dry)
+    elif name == "subscribe_quotes":
+        stream = _get_stream()
+        if arguments.get("unsubscribe"):
+            await stream.unsubscribe(arguments["symbols"])
+        else:
+            await stream.subscribe(arguments["symbols"])
+        return {"stream": stream.name, "subscribed": sorted(stream.symbols), "seq": _quote_table.seq}
+    elif name == "read_quotes":
+        if _stream is None or not _stream.symbols:
+            return {"error": "구독 중인 심볼 없음 — subscribe_quotes를 먼저 호출하세요"}
+        return _quote_table.read(arguments.get("symbols"), arguments.get("since", 0))
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -349,9 +502,7 @@ if MCP_AVAILABLE:
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, _call_tool, name, arguments
-            )
+            result = await _call_tool(name, arguments)
             return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
         except Exception as e:
             return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
@@ -359,8 +510,13 @@ if MCP_AVAILABLE:
     async def main() -> None:
         dry_label = "DRY RUN" if BROKER_DRY_RUN else "LIVE"
         print(f"[broker] MCP 서버 시작 ({dry_label} 모드)")
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, server.create_initialization_options())
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+        finally:
+            if _stream is not None:
+                await _stream.close()
+            await _client.aclose()
 
     if __name__ == "__main__":
         asyncio.run(main())
@@ -368,14 +524,18 @@ if MCP_AVAILABLE:
 else:
     # mcp 패키지 없을 때 — 직접 호출 테스트용
     if __name__ == "__main__":
-        print("[broker] 스텁 모드 — MCP 없이 도구 테스트")
-        print("get_balances:", json.dumps(_client.get_balances(), indent=2))
-        print("get_positions:", json.dumps(_client.get_positions(), indent=2))
-        print("get_quotes:", json.dumps(_client.get_quotes(["SPY", "QQQ"]), indent=2))
-        print("get_greeks:", json.dumps(_client.get_greeks(["SPY240315C00500000"]), indent=2))
-        print("place_order:", json.dumps(_client.place_order([{
-            "instrument-type": "Equity",
-            "symbol": "SPY",
-            "quantity": 1,
-            "action": "Buy to Open",
-        }]), indent=2))
+        async def _stub_main() -> None:
+            print("[broker] 스텁 모드 — MCP 없이 도구 테스트")
+            print("get_balances:", json.dumps(await _client.get_balances(), indent=2))
+            print("get_positions:", json.dumps(await _client.get_positions(), indent=2))
+            print("get_quotes:", json.dumps(await _client.get_quotes(["SPY", "QQQ"]), indent=2))
+            print("get_greeks:", json.dumps(await _client.get_greeks(["SPY240315C00500000"]), indent=2))
+            print("place_order:", json.dumps(await _client.place_order([{
+                "instrument-type": "Equity",
+                "symbol": "SPY",
+                "quantity": 1,
+                "action": "Buy to Open",
+            }]), indent=2))
+            await _client.aclose()
+
+        asyncio.run(_stub_main())
@@ -12,9 +12,7 @@ EIMAS MCP Server — Economic Intelligence Multi-Agent System 연결
 
 import json
 import os
-import sqlite3
 import sys
-import glob
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -33,6 +31,10 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+from eimas_state import OutputsState, RegimeHistory
+from events_db import EventsDB
+from tool_executor import ToolBusy, ToolExecutor, ToolTimeout
+
 # EIMAS 경로 설정
 EIMAS_ROOT = Path(os.environ.get(
     "EIMAS_ROOT",
@@ -44,6 +46,22 @@ DATA_DIR = EIMAS_ROOT / "data"
 
 app = Server("eimas")
 
+# 도구 본문(API 호출, 파일·events.db 읽기)은 스레드 풀에서 실행 — API 대기가 다른 도구 호출을 막지 않음
+_executor = ToolExecutor(
+    "eimas",
+    max_workers=8,
+    default_limit=4,
+    default_timeout=15,
+    limits={"query_events": 4, "events_db_maintenance": 1, "get_latest_analysis": 2, "get_ai_report": 2},
+)
+
+# 파일 모드 상태 — outputs/ 파싱 결과를 메모리에 두고 mtime이 바뀐 파일만 다시 읽음
+_state = OutputsState(OUTPUTS_DIR)
+
+# events.db — 읽기 전용 연결 풀(query_events 동시 실행 수만큼) + 스키마 캐시
+_events = EventsDB(DATA_DIR / "events.db", pool_size=4)
+QUERY_EVENTS_MAX_LIMIT = 500
+
 
 # ============================================================================
 # 헬퍼: API vs 파일 이중 모드
@@ -61,63 +79,14 @@ def _api_get(endpoint: str, params: dict = None) -> Optional[dict]:
         return None
 
 
-def _latest_json(pattern: str) -> Optional[dict]:
-    """outputs/ 에서 패턴에 맞는 가장 최신 JSON 파일 읽기."""
-    files = sorted(glob.glob(str(OUTPUTS_DIR / pattern)), reverse=True)
-    if not files:
-        return None
-    try:
-        with open(files[0]) as f:
-            return json.load(f)
-    except Exception:
-        return None
-
-
 def _eimas_main_result() -> Optional[dict]:
     """최신 EIMAS 분석 결과 로드 (eimas_*.json 우선, real_analysis_result.json 폴백)."""
-    # 타임스탬프 있는 파일 먼저
-    data = _latest_json("eimas_*.json")
-    if data:
-        return data
-    # 고정 파일 폴백
-    fixed = OUTPUTS_DIR / "real_analysis_result.json"
-    if fixed.exists():
-        try:
-            with open(fixed) as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return None
+    return _state.main_result()
 
 
-def _regime_history() -> list:
-    """regime_history.json 읽기."""
-    path = OUTPUTS_DIR / "regime_history.json"
-    if path.exists():
-        try:
-            with open(path) as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except Exception:
-            pass
-    return []
-
-
-def _query_events_db(query: str, limit: int = 20) -> list:
-    """events.db SQLite 쿼리 (읽기 전용)."""
-    db_path = DATA_DIR / "events.db"
-    if not db_path.exists():
-        return []
-    try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute(query)
-        rows = [dict(r) for r in cur.fetchmany(limit)]
-        conn.close()
-        return rows
-    except Exception as e:
-        return [{"error": str(e)}]
+def _regime_history() -> RegimeHistory:
+    """regime_history.json (레짐·타임스탬프 색인 포함)."""
+    return _state.regime_history()
 
 
 # ============================================================================
@@ -181,6 +150,14 @@ async def list_tools() -> list[Tool]:
                     "regime_filter": {
                         "type": "string",
                         "description": "특정 레짐만 필터 (BULLISH, BEARISH, NEUTRAL 등, 빈값=전체)"
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "이 날짜 이후 기록만 (YYYY-MM-DD, 빈값=처음부터)"
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "이 날짜까지의 기록만 (YYYY-MM-DD 포함, 빈값=최신까지)"
                     }
                 }
             }
@@ -244,12 +221,30 @@ async def list_tools() -> list[Tool]:
                     },
                     "limit": {
                         "type": "integer",
-                        "description": "최대 결과 수 (기본: 20)",
+                        "description": "최대 결과 수 (기본: 20, 최대: 500)",
                         "default": 20
                     }
                 }
             }
         ),
+        Tool(
+            name="events_db_maintenance",
+            description=(
+                "events.db 인덱스 점검. query_events 쿼리 계획(EXPLAIN QUERY PLAN)과 기존 인덱스를 보고 "
+                "timestamp / (event_type, timestamp) 인덱스 생성 SQL을 제안. "
+                "apply=true는 EIMAS_EVENTS_INDEX_WRITE=true일 때만 실제 생성."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "apply": {
+                        "type": "boolean",
+                        "description": "제안된 인덱스 생성 (기본: false — 권고만)",
+                        "default": False
+                    }
+                }
+            }
+        ),
         Tool(
             name="get_ai_report",
             description=(
@@ -282,13 +277,13 @@ async def list_tools() -> list[Tool]:
 # 도구 실행
 # ============================================================================
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+def _call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """도구 실행 디스패처 (블로킹 — call_tool이 스레드 풀에서 실행)"""
 
     # ── eimas_status ──────────────────────────────────────────────────────────
     if name == "eimas_status":
         api_live = _api_get("/health") is not None
-        latest_files = sorted(glob.glob(str(OUTPUTS_DIR / "eimas_*.json")), reverse=True)
+        latest_file = _state.latest_path("eimas_*.json")
         result = {
             "api_server": "running" if api_live else "offline",
             "api_url": EIMAS_API,
@@ -296,7 +291,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             "outputs_dir_exists": OUTPUTS_DIR.exists(),
             "data_dir_exists": DATA_DIR.exists(),
             "events_db_exists": (DATA_DIR / "events.db").exists(),
-            "latest_analysis_file": Path(latest_files[0]).name if latest_files else None,
+            "latest_analysis_file": latest_file.name if latest_file else None,
             "regime_history_exists": (OUTPUTS_DIR / "regime_history.json").exists(),
             "mode": "api" if api_live else "file"
         }
@@ -323,9 +318,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 "regime_context": regime_ctx,
             }
             # regime_history에서 최신 항목으로 보완
-            history = _regime_history()
-            if history:
-                latest = history[-1]
+            latest = _regime_history().latest()
+            if latest:
                 result.update({
                     "regime": latest.get("regime", result["regime"]),
                     "confidence": latest.get("confidence", result["confidence"]),
@@ -343,11 +337,15 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         limit = arguments.get("limit", 10)
         regime_filter = arguments.get("regime_filter", "").upper()
         history = _regime_history()
-        if regime_filter:
-            history = [h for h in history if h.get("regime", "").upper() == regime_filter]
-        recent = history[-limit:][::-1]  # 최신 순
+        matched, recent = history.query(  # 최신 순
+            regime=regime_filter,
+            since=arguments.get("since", ""),
+            until=arguments.get("until", ""),
+            limit=limit,
+        )
         result = {
-            "total_records": len(_regime_history()),
+            "total_records": len(history),
+            "matched": matched,
             "returned": len(recent),
             "filter": regime_filter or "none",
             "history": recent
@@ -445,9 +443,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             data["source"] = "api"
             return [TextContent(type="text", text=json.dumps(data, ensure_ascii=False))]
         # Fallback: regime_history의 sector_rotation 필드
-        history = _regime_history()
-        if history:
-            latest = history[-1]
+        latest = _regime_history().latest()
+        if latest:
             result = {
                 "source": "file",
                 "timestamp": latest.get("timestamp"),
@@ -461,27 +458,32 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     elif name == "query_events":
         event_type = arguments.get("event_type", "")
         since_days = arguments.get("since_days", 30)
-        limit = arguments.get("limit", 20)
-        since = (datetime.now() - timedelta(days=since_days)).strftime("%Y-%m-%d")
-
-        # events.db 테이블 구조 먼저 확인
-        tables = _query_events_db("SELECT name FROM sqlite_master WHERE type='table'", limit=20)
-        if not tables or "error" in (tables[0] if tables else {}):
-            return [TextContent(type="text", text=json.dumps({"error": "events.db 접근 불가", "db_path": str(DATA_DIR / "events.db")}, ensure_ascii=False))]
-
-        table_names = [t.get("name") for t in tables]
-        # 이벤트 테이블 탐색
-        event_table = next((t for t in table_names if "event" in t.lower()), None)
+        try:
+            limit = int(arguments.get("limit", 20))
+            since_days = int(since_days)
+        except (TypeError, ValueError):
+            return [TextContent(type="text", text='{"error": "limit·since_days는 정수"}')]
+        limit = max(1, min(limit, QUERY_EVENTS_MAX_LIMIT))
+        since_days = max(0, min(since_days, 36500))
+        since = datetime.now() - timedelta(days=since_days)
+        db_error = json.dumps({"error": "events.db 접근 불가", "db_path": str(_events.path)}, ensure_ascii=False)
+        if not _events.exists():
+            return [TextContent(type="text", text=db_error)]
+
+        # 테이블 구조는 스키마 캐시에서 (schema_version이 바뀔 때만 다시 탐색)
+        try:
+            schema = _events.schema()
+        except Exception:
+            return [TextContent(type="text", text=db_error)]
+        event_table = schema["event_table"]
         if not event_table:
-            return [TextContent(type="text", text=json.dumps({"tables": table_names, "note": "이벤트 테이블 없음. 가용 테이블 목록 반환"}, ensure_ascii=False))]
-
-        # 동적 쿼리 (injection 방지: 파라미터 사용)
-        where_clauses = [f"date(timestamp) >= '{since}'"]
-        if event_type:
-            where_clauses.append(f"event_type = '{event_type}'")
-        where = " AND ".join(where_clauses)
-        q = f"SELECT * FROM {event_table} WHERE {where} ORDER BY timestamp DESC LIMIT {limit}"
-        rows = _query_events_db(q, limit=limit)
+            return [TextContent(type="text", text=json.dumps({"tables": schema["tables"], "note": "이벤트 테이블 없음. 가용 테이블 목록 반환"}, ensure_ascii=False))]
+
+        # 파라미터 쿼리 — timestamp 원시 범위 비교라 인덱스 사용 가능
+        try:
+            rows = _events.query_events(since=since, event_type=event_type, limit=limit)
+        except Exception as e:
+            rows = [{"error": str(e)}]
         result = {
             "table": event_table,
             "since_days": since_days,
@@ -491,28 +493,39 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         }
         return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, default=str))]
 
+    # ── events_db_maintenance ─────────────────────────────────────────────────
+    elif name == "events_db_maintenance":
+        if not _events.exists():
+            return [TextContent(type="text", text=json.dumps({"error": "events.db 없음", "db_path": str(_events.path)}, ensure_ascii=False))]
+        try:
+            if not _events.schema()["event_table"]:
+                return [TextContent(type="text", text='{"error": "이벤트 테이블 없음"}')]
+            result = _events.advise()
+            if arguments.get("apply", False) and result["suggestions"]:
+                result["applied"] = _events.create_indexes(result["suggestions"])
+                result["after"] = _events.advise()
+        except Exception as e:
+            return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+
     # ── get_ai_report ─────────────────────────────────────────────────────────
     elif name == "get_ai_report":
         section = arguments.get("section", "executive_summary")
         # outputs/ai_report_*.json 또는 ai_report_*.md 탐색
-        report_files = sorted(glob.glob(str(OUTPUTS_DIR / "ai_report_*.json")), reverse=True)
-        if report_files:
-            try:
-                with open(report_files[0]) as f:
-                    report = json.load(f)
-                if section == "executive_summary":
-                    result = {
-                        "source": Path(report_files[0]).name,
-                        "timestamp": report.get("timestamp"),
-                        "executive_summary": report.get("executive_summary"),
-                        "final_recommendation": report.get("final_recommendation"),
-                        "confidence": report.get("confidence"),
-                    }
-                else:
-                    result = {"source": Path(report_files[0]).name, **report}
-                return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, default=str))]
-            except Exception as e:
-                pass
+        report_file = _state.latest_path("ai_report_*.json")
+        report = _state.load(report_file) if report_file else None
+        if isinstance(report, dict):
+            if section == "executive_summary":
+                result = {
+                    "source": report_file.name,
+                    "timestamp": report.get("timestamp"),
+                    "executive_summary": report.get("executive_summary"),
+                    "final_recommendation": report.get("final_recommendation"),
+                    "confidence": report.get("confidence"),
+                }
+            else:
+                result = {"source": report_file.name, **report}
+            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, default=str))]
         # Fallback: 분석 파일의 executive_summary
         analysis = _eimas_main_result()
         if analysis:
@@ -529,6 +542,14 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     return [TextContent(type="text", text=f'{{"error": "알 수 없는 도구: {name}"}}')]
 
 
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    try:
+        return await _executor.run(name, _call_tool, name, arguments)
+    except (ToolTimeout, ToolBusy) as e:
+        return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+
+
 # ============================================================================
 # 서버 실행
 # ============================================================================
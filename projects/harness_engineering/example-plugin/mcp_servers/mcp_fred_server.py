@@ -3,14 +3,22 @@ FRED MCP Server — Federal Reserve Economic Data
 .mcp.json에서 "fred-api" 서버로 등록됨
 
 실행: python -m mcp_fred_server
-의존성: pip install mcp requests
+의존성: pip install mcp requests pandas
+
+fetch_series는 로컬 관측치 저장소(fred_store.py, SQLite)에서 답한다.
+시리즈별 전체 이력을 한 번 받아 두고 이후에는 변경분만 동기화 — 경로는 FRED_STORE_DB.
+series_stats·compare_series는 저장된 전체 이력으로 서버에서 계산(fred_analytics.py)하고 요약만 반환.
 """
 
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 
 # MCP SDK (pip install mcp)
 try:
@@ -21,28 +29,118 @@ except ImportError:
     print("Error: mcp 패키지 필요. pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+import fred_analytics as fa
+from fred_store import FredStore, resample
+from tool_executor import ToolBusy, ToolExecutor, ToolTimeout
+
 FRED_BASE = "https://api.stlouisfed.org/fred"
 API_KEY = os.environ.get("FRED_API_KEY", "")
 
 app = Server("fred-api")
 
+# 공유 세션 — 연결(keep-alive) 재사용, 곡선 동시 조회 수만큼 풀 확보
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# 국채 수익률 곡선 만기 → FRED 시리즈 (짧은 만기부터)
+YIELD_CURVE_SERIES = {
+    "1M": "DGS1MO",
+    "3M": "DGS3MO",
+    "6M": "DGS6MO",
+    "1Y": "DGS1",
+    "2Y": "DGS2",
+    "3Y": "DGS3",
+    "5Y": "DGS5",
+    "7Y": "DGS7",
+    "10Y": "DGS10",
+    "20Y": "DGS20",
+    "30Y": "DGS30",
+}
+DEFAULT_CURVE = ["3M", "2Y", "5Y", "10Y", "30Y"]
+
+# 최신 관측치 캐시 (레짐 체크마다 곡선을 다시 부르므로 짧게 보관)
+LATEST_TTL_SEC = float(os.environ.get("FRED_LATEST_TTL", "300"))
+_latest_cache: dict[tuple[str, str], tuple[float, dict | None]] = {}
+_latest_lock = threading.Lock()
+_fetch_pool = ThreadPoolExecutor(max_workers=len(YIELD_CURVE_SERIES), thread_name_prefix="fred-fetch")
+
+# 도구 본문은 스레드 풀에서 실행 — 느린 FRED 호출이 다른 도구 호출을 막지 않음
+_executor = ToolExecutor(
+    "fred",
+    max_workers=8,
+    limits={
+        "fetch_series": 4, "search_series": 2, "fetch_yield_curve": 2,
+        "series_stats": 4, "compare_series": 2,
+    },
+    timeouts={
+        "fetch_series": 30, "search_series": 15, "fetch_yield_curve": 30,
+        "series_stats": 30, "compare_series": 60,
+    },
+)
+
 
 def fred_get(endpoint: str, params: dict) -> dict:
     """FRED API 공통 호출"""
     if not API_KEY:
         raise ValueError("FRED_API_KEY 환경변수가 설정되지 않았습니다")
     params.update({"api_key": API_KEY, "file_type": "json"})
-    r = requests.get(f"{FRED_BASE}/{endpoint}", params=params, timeout=10)
+    r = _session.get(f"{FRED_BASE}/{endpoint}", params=params, timeout=10)
     r.raise_for_status()
     return r.json()
 
 
+def fred_latest(series_id: str, as_of: str = "") -> dict | None:
+    """
+    시리즈의 최신 유효 관측치 {"date", "value"} (as_of 지정 시 그 날짜 이전 최신).
+    LATEST_TTL_SEC 동안 캐시. 결측(".")만 있으면 None.
+    """
+    key = (series_id, as_of)
+    now = time.monotonic()
+    with _latest_lock:
+        hit = _latest_cache.get(key)
+        if hit and now - hit[0] < LATEST_TTL_SEC:
+            return hit[1]
+
+    params = {"series_id": series_id, "sort_order": "desc", "limit": 5}
+    if as_of:
+        params["observation_end"] = as_of
+    obs = fred_get("series/observations", params).get("observations", [])
+    latest = next(
+        ({"date": o["date"], "value": float(o["value"])} for o in obs if o["value"] != "."),
+        None,
+    )
+    with _latest_lock:
+        _latest_cache[key] = (now, latest)
+    return latest
+
+
+# 관측치 저장소 — fetch_series의 구간 자르기·주기 변환은 여기서 로컬 처리
+_store = FredStore(fetch=fred_get)
+
+
+def _sync_all(series_ids: list[str]) -> dict[str, str]:
+    """여러 시리즈 동시 동기화 → {series_id: sync mode}"""
+    modes = _fetch_pool.map(lambda sid: _store.sync(sid)["mode"], series_ids)
+    return dict(zip(series_ids, modes))
+
+
+def _window(frequency: str, native: str, requested: int = 0) -> int:
+    """롤링 창 (요청값 없으면 변환 주기 — 없으면 원 주기 — 기준 기본값)"""
+    if requested:
+        return requested
+    code = (frequency or native or "D").upper()
+    return fa.DEFAULT_WINDOW.get(code, 36)
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     return [
         Tool(
             name="fetch_series",
-            description="FRED 시계열 데이터 조회. 거시경제 지표(GDP, CPI, 금리 등) 수집에 사용.",
+            description=(
+                "FRED 시계열 데이터 조회. 거시경제 지표(GDP, CPI, 금리 등) 수집에 사용. "
+                "로컬 저장소에서 답하고 FRED에서는 변경분만 동기화."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -62,6 +160,17 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "집계 주기: d(일), w(주), m(월), q(분기), a(연)",
                         "enum": ["d", "w", "m", "q", "a"]
+                    },
+                    "aggregation_method": {
+                        "type": "string",
+                        "description": "주기 변환 방식: avg(평균, 기본), sum(합계), eop(기간 말 값)",
+                        "enum": ["avg", "sum", "eop"],
+                        "default": "avg"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "true이면 전체 이력을 다시 받음 (기본: 변경분만 동기화)",
+                        "default": False
                     }
                 },
                 "required": ["series_id"]
@@ -88,52 +197,151 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="fetch_yield_curve",
-            description="현재 미국 국채 수익률 곡선 전체 조회 (3M, 2Y, 5Y, 10Y, 30Y).",
+            description=(
+                "미국 국채 수익률 곡선 조회 (기본: 3M, 2Y, 5Y, 10Y, 30Y / full=true: 1M~30Y 11개 만기). "
+                "만기별 동시 조회, 최신 관측치는 짧게 캐시. 일부 만기 조회 실패는 null + errors에 사유."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "date": {
                         "type": "string",
                         "description": "기준일 YYYY-MM-DD (기본: 최근 영업일)"
+                    },
+                    "maturities": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": list(YIELD_CURVE_SERIES)},
+                        "description": "조회할 만기 목록 (예: ['2Y', '10Y'])"
+                    },
+                    "full": {
+                        "type": "boolean",
+                        "description": "true이면 1M~30Y 전체 곡선",
+                        "default": False
                     }
                 }
             }
+        ),
+        Tool(
+            name="series_stats",
+            description=(
+                "FRED 시계열 하나를 서버에서 분석해 요약만 반환 (원 관측치 대신 사용). "
+                "변환(level/diff/mom/yoy) 후 최신값·분포·백분위·롤링 z-score·최근 몇 개 점."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "series_id": {"type": "string", "description": "FRED 시계열 ID (예: CPIAUCSL)"},
+                    "transform": {
+                        "type": "string",
+                        "description": "level(원값), diff(차분), mom(전월 대비 %), yoy(전년 대비 %)",
+                        "enum": list(fa.TRANSFORMS),
+                        "default": "level"
+                    },
+                    "frequency": {
+                        "type": "string",
+                        "description": "변환 전 집계 주기 (기본: 원 주기)",
+                        "enum": ["d", "w", "m", "q", "a"]
+                    },
+                    "aggregation_method": {
+                        "type": "string",
+                        "enum": ["avg", "sum", "eop"],
+                        "default": "avg"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "분석 시작일 YYYY-MM-DD (기본: 전체 이력)"
+                    },
+                    "zscore_window": {
+                        "type": "integer",
+                        "description": "롤링 z-score 창 (관측치 수, 기본: 일간 252 / 월간 36 등)"
+                    },
+                    "tail": {
+                        "type": "integer",
+                        "description": "함께 반환할 최근 점 개수 (기본: 12)",
+                        "default": 12
+                    }
+                },
+                "required": ["series_id"]
+            }
+        ),
+        Tool(
+            name="compare_series",
+            description=(
+                "여러 FRED 시계열을 공통 주기·날짜로 정렬해 서버에서 비교. "
+                "최신값, 스프레드 요약(z-score·음수 비중), 상관행렬, 최근 정렬된 행만 반환."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "series_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 2,
+                        "maxItems": 10,
+                        "description": "FRED 시계열 ID 목록 (예: ['DGS10', 'DGS2', 'FEDFUNDS'])"
+                    },
+                    "spreads": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "스프레드 목록 'A-B' (기본: 첫 시리즈 - 나머지 각각)"
+                    },
+                    "transform": {
+                        "type": "string",
+                        "description": "정렬 후 각 시리즈에 적용할 변환",
+                        "enum": list(fa.TRANSFORMS),
+                        "default": "level"
+                    },
+                    "frequency": {
+                        "type": "string",
+                        "description": "공통 주기 (기본: 가장 거친 원 주기)",
+                        "enum": ["d", "w", "m", "q", "a"]
+                    },
+                    "correlation_on": {
+                        "type": "string",
+                        "description": "상관 계산 기준: diff(변화분, 기본) 또는 level(수준)",
+                        "enum": ["diff", "level"],
+                        "default": "diff"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "비교 시작일 YYYY-MM-DD (기본: 10년 전)"
+                    },
+                    "tail": {
+                        "type": "integer",
+                        "description": "함께 반환할 최근 정렬 행 개수 (기본: 5)",
+                        "default": 5
+                    }
+                },
+                "required": ["series_ids"]
+            }
         )
     ]
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+def _call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """도구 실행 디스패처 (블로킹 — call_tool이 스레드 풀에서 실행)"""
     if name == "fetch_series":
         series_id = arguments["series_id"]
         end = arguments.get("end_date", datetime.today().strftime("%Y-%m-%d"))
         start = arguments.get("start_date", (datetime.today() - timedelta(days=3*365)).strftime("%Y-%m-%d"))
         freq = arguments.get("frequency", "")
 
-        params = {
-            "series_id": series_id,
-            "observation_start": start,
-            "observation_end": end,
-        }
-        if freq:
-            params["frequency"] = freq
-
-        data = fred_get("series/observations", params)
-        obs = data.get("observations", [])
+        sync = _store.sync(series_id, force=arguments.get("refresh", False))
+        values = resample(_store.series(series_id, start, end), freq, arguments.get("aggregation_method", "avg"))
+        dates = values.index.strftime("%Y-%m-%d")
 
-        # 결측치 필터링
-        valid = [o for o in obs if o["value"] != "."]
         result = {
             "series_id": series_id,
-            "count": len(valid),
-            "start": valid[0]["date"] if valid else None,
-            "end": valid[-1]["date"] if valid else None,
-            "latest_value": float(valid[-1]["value"]) if valid else None,
-            "latest_date": valid[-1]["date"] if valid else None,
+            "count": len(values),
+            "start": dates[0] if len(values) else None,
+            "end": dates[-1] if len(values) else None,
+            "latest_value": float(values.iloc[-1]) if len(values) else None,
+            "latest_date": dates[-1] if len(values) else None,
             "observations": [
-                {"date": o["date"], "value": float(o["value"])}
-                for o in valid[-100:]  # 최근 100개 반환
-            ]
+                {"date": d, "value": float(v)}
+                for d, v in zip(dates[-100:], values.iloc[-100:])  # 최근 100개 반환
+            ],
+            "sync": sync["mode"],
         }
         return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
 
@@ -155,26 +363,28 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         return [TextContent(type="text", text=json.dumps(series_list, ensure_ascii=False))]
 
     elif name == "fetch_yield_curve":
-        maturities = {
-            "3M": "DGS3MO",
-            "2Y": "DGS2",
-            "5Y": "DGS5",
-            "10Y": "DGS10",
-            "30Y": "DGS30"
-        }
-        curve = {}
-        for label, sid in maturities.items():
+        as_of = arguments.get("date", "")
+        if arguments.get("full"):
+            labels = list(YIELD_CURVE_SERIES)
+        else:
+            requested = arguments.get("maturities") or DEFAULT_CURVE
+            labels = [m for m in YIELD_CURVE_SERIES if m in {r.upper() for r in requested}]
+
+        def _point(label: str) -> tuple[dict | None, str]:
+            """(최신 관측치, 오류) — 키 누락(ValueError)·인증/요청 오류(400/401/403)는 그대로 올림"""
             try:
-                data = fred_get("series/observations", {
-                    "series_id": sid,
-                    "sort_order": "desc",
-                    "limit": 1
-                })
-                obs = data.get("observations", [])
-                if obs and obs[0]["value"] != ".":
-                    curve[label] = float(obs[0]["value"])
-            except Exception:
-                curve[label] = None
+                return fred_latest(YIELD_CURVE_SERIES[label], as_of), ""
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code in (400, 401, 403):
+                    raise
+                return None, str(e)
+            except requests.RequestException as e:
+                return None, str(e)
+
+        points = dict(zip(labels, _fetch_pool.map(_point, labels)))
+        curve = {label: (p["value"] if p else None) for label, (p, _) in points.items()}
+        dates = {label: p["date"] for label, (p, _) in points.items() if p}
+        errors = {label: err for label, (_, err) in points.items() if err}
 
         # 스프레드 계산
         spreads = {}
@@ -183,12 +393,94 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         if curve.get("10Y") and curve.get("3M"):
             spreads["10Y-3M"] = round(curve["10Y"] - curve["3M"], 3)
 
-        result = {"yields": curve, "spreads": spreads}
+        result = {"yields": curve, "spreads": spreads, "as_of": dates}
+        if errors:
+            result["errors"] = errors
+        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+
+    elif name == "series_stats":
+        series_id = arguments["series_id"]
+        how = arguments.get("transform", "level")
+        freq = arguments.get("frequency", "")
+        sync = _store.sync(series_id)["mode"]
+        native = (_store.meta(series_id) or {}).get("frequency", "")
+
+        values = resample(
+            _store.series(series_id, arguments.get("start_date", "")),
+            freq,
+            arguments.get("aggregation_method", "avg"),
+        )
+        values = fa.transform(values, how)
+        window = _window(freq, native, arguments.get("zscore_window", 0))
+        z = fa.rolling_zscore(values, window)
+
+        result = {
+            "series_id": series_id,
+            "transform": how,
+            "frequency": freq or native.lower(),
+            **fa.summarize(values, tail=arguments.get("tail", 12)),
+            "zscore": {
+                "window": window,
+                "latest": round(float(z.iloc[-1]), 2) if not z.empty else None,
+                "min": round(float(z.min()), 2) if not z.empty else None,
+                "max": round(float(z.max()), 2) if not z.empty else None,
+            },
+            "sync": sync,
+        }
+        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+
+    elif name == "compare_series":
+        series_ids = list(dict.fromkeys(arguments["series_ids"]))
+        start = arguments.get("start_date", (datetime.today() - timedelta(days=10*365)).strftime("%Y-%m-%d"))
+        sync = _sync_all(series_ids)
+        natives = [(_store.meta(sid) or {}).get("frequency", "") for sid in series_ids]
+        freq = arguments.get("frequency") or fa.coarsest(natives)
+
+        frame = fa.align({sid: _store.series(sid, start) for sid in series_ids}, freq)
+        how = arguments.get("transform", "level")
+        if how != "level":
+            frame = frame.apply(lambda col: fa.transform(col, how)).dropna()
+
+        pairs = arguments.get("spreads") or [f"{series_ids[0]}-{sid}" for sid in series_ids[1:]]
+        window = _window(freq, "")
+        spreads = {}
+        for pair in pairs:
+            a, _, b = pair.partition("-")
+            if a not in frame or b not in frame:
+                spreads[pair] = {"error": "series_ids에 없는 시리즈"}
+                continue
+            spreads[pair] = fa.spread_summary(frame[a] - frame[b], window)
+
+        tail = arguments.get("tail", 5)
+        result = {
+            "series_ids": series_ids,
+            "frequency": freq,
+            "transform": how,
+            "count": len(frame),
+            "start": frame.index[0].strftime("%Y-%m-%d") if len(frame) else None,
+            "end": frame.index[-1].strftime("%Y-%m-%d") if len(frame) else None,
+            "latest": {sid: round(float(v), 4) for sid, v in frame.iloc[-1].items()} if len(frame) else {},
+            "spreads": spreads,
+            "correlation": fa.correlation(frame, arguments.get("correlation_on", "diff")),
+            "recent": [
+                {"date": d.strftime("%Y-%m-%d"), **{sid: round(float(v), 4) for sid, v in row.items()}}
+                for d, row in frame.iloc[-tail:].iterrows()
+            ] if tail else [],
+            "sync": sync,
+        }
         return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
 
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    try:
+        return await _executor.run(name, _call_tool, name, arguments)
+    except (ToolTimeout, ToolBusy) as e:
+        return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+
+
 async def main():
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, app.create_initialization_options())
@@ -4,6 +4,9 @@ Market Data MCP Server — 시장 가격/지표 데이터
 
 실행: python -m mcp_market_server
 의존성: pip install mcp yfinance pykrx
+
+가격 이력은 price_cache.PriceCache(프로세스 내 메모리)를 거친다 — 같은 세션에서 겹치는 티커는
+네트워크 대신 메모리에서, 모자란 구간만 yf.download로 묶어 받음.
 """
 
 import json
@@ -31,8 +34,32 @@ except ImportError:
     krx_stock = None
     krx_bond = None
 
+import numpy as np
+
+import correlation_engine as ce
+from price_cache import PriceCache
+from tool_executor import ToolBusy, ToolExecutor, ToolTimeout
+
 app = Server("market-data")
 
+# 도구 본문(yfinance/pykrx)은 스레드 풀에서 실행 — 느린 다운로드가 다른 도구 호출을 막지 않음
+# pykrx는 KRX 스크래핑이라 동시 1개로 제한
+_executor = ToolExecutor(
+    "market",
+    max_workers=8,
+    limits={
+        "get_price": 4, "get_multi_price": 2, "get_correlation": 2, "get_kospi_foreign_flow": 1,
+        "scan_correlation": 1,
+    },
+    timeouts={
+        "get_price": 30, "get_multi_price": 60, "get_correlation": 60, "get_kospi_foreign_flow": 60,
+        "scan_correlation": 180,
+    },
+)
+
+# (ticker, interval)별 OHLCV 캐시 — get_price·get_multi_price·get_correlation 공용
+_prices = PriceCache(download=yf.download) if yf else None
+
 # 자주 쓰는 티커 별칭
 TICKER_ALIASES = {
     "SPX": "^GSPC",
@@ -66,6 +93,12 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "기간: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd",
                         "default": "1y"
+                    },
+                    "interval": {
+                        "type": "string",
+                        "description": "봉 간격: 1d(일봉, 기본), 1wk(주봉), 1mo(월봉)",
+                        "enum": ["1d", "1wk", "1mo"],
+                        "default": "1d"
                     }
                 },
                 "required": ["ticker"]
@@ -129,6 +162,57 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["tickers"]
             }
+        ),
+        Tool(
+            name="scan_correlation",
+            description=(
+                "대규모 상관 스캔 (섹터·지수 구성종목 수백 개). N×N 행렬 대신 요약 반환: "
+                "가장 높은/낮은 상관 k쌍, 평균 상관, 클러스터 순서, 축소 추정 강도, 롤링 평균 상관."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tickers": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "티커 목록 (2개 이상, 수백 개 가능)"
+                    },
+                    "period": {"type": "string", "default": "1y"},
+                    "method": {
+                        "type": "string",
+                        "description": "pearson 또는 spearman (spearman은 열 전체 순위 기반 근사 — 결측이 많으면 pandas와 차이)",
+                        "enum": ["pearson", "spearman"],
+                        "default": "pearson"
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "반환할 최고/최저 상관 쌍 개수 (기본: 10)",
+                        "default": 10
+                    },
+                    "min_overlap": {
+                        "type": "integer",
+                        "description": "쌍별 최소 겹치는 관측치 수 (기본: 60)",
+                        "default": 60
+                    },
+                    "shrinkage": {
+                        "type": "string",
+                        "description": "축소 추정: none, identity, constant(평균 상관 목표)",
+                        "enum": ["none", "identity", "constant"],
+                        "default": "none"
+                    },
+                    "cluster_order": {
+                        "type": "boolean",
+                        "description": "true이면 상관이 비슷한 종목끼리 인접하도록 정렬한 티커 순서 반환",
+                        "default": False
+                    },
+                    "rolling_window": {
+                        "type": "integer",
+                        "description": "롤링 평균 상관 창 (관측치 수, 0이면 생략)",
+                        "default": 0
+                    }
+                },
+                "required": ["tickers"]
+            }
         )
     ]
 
@@ -137,18 +221,22 @@ def resolve_ticker(ticker: str) -> str:
     return TICKER_ALIASES.get(ticker.upper(), ticker)
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+def _round(value: float, digits: int = 4) -> float | None:
+    """JSON용 반올림 (NaN → None)"""
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def _call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """도구 실행 디스패처 (블로킹 — call_tool이 스레드 풀에서 실행)"""
     if not yf:
         return [TextContent(type="text", text="Error: yfinance 미설치. pip install yfinance")]
 
     if name == "get_price":
         t = resolve_ticker(arguments["ticker"])
         period = arguments.get("period", "1y")
-        data = yf.Ticker(t)
-        hist = data.history(period=period)
+        hist = _prices.history([t], period, arguments.get("interval", "1d")).get(t)
 
-        if hist.empty:
+        if hist is None:
             return [TextContent(type="text", text=f"데이터 없음: {t}")]
 
         latest = hist.iloc[-1]
@@ -175,12 +263,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     elif name == "get_multi_price":
         tickers = [resolve_ticker(t) for t in arguments["tickers"]]
         period = arguments.get("period", "1y")
-        data = yf.download(tickers, period=period, auto_adjust=True, progress=False)
+        close = _prices.closes(tickers, period)
 
-        if data.empty:
+        if close.empty:
             return [TextContent(type="text", text="데이터 없음")]
 
-        close = data["Close"] if "Close" in data.columns else data
         result = {}
         for ticker in tickers:
             if ticker in close.columns:
@@ -225,28 +312,83 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         period = arguments.get("period", "1y")
         method = arguments.get("method", "pearson")
 
-        data = yf.download(tickers, period=period, auto_adjust=True, progress=False)
-        close = data["Close"] if "Close" in data.columns else data
-        returns = close.pct_change().dropna()
-
-        if method == "pearson":
-            corr = returns.corr()
+        close = _prices.closes(tickers, period)
+        returns = close.pct_change(fill_method=None).iloc[1:]
+        if method == "spearman":
+            # 소수 종목 — pandas 쌍별 재순위 (엔진의 spearman은 결측이 있으면 근사)
+            corr = returns.corr(method="spearman", min_periods=3).to_numpy()
         else:
-            corr = returns.corr(method="spearman")
+            corr, _ = ce.pairwise_corr(returns.to_numpy(np.float32), min_periods=3)
+        names = list(returns.columns)
 
         result = {
             "method": method,
             "period": period,
             "matrix": {
-                col: {row: round(float(corr.loc[row, col]), 3) for row in corr.index}
-                for col in corr.columns
+                col: {
+                    row: None if np.isnan(corr[i, j]) else round(float(corr[i, j]), 3)
+                    for i, row in enumerate(names)
+                }
+                for j, col in enumerate(names)
             }
         }
         return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
 
+    elif name == "scan_correlation":
+        tickers = list(dict.fromkeys(resolve_ticker(t) for t in arguments["tickers"]))
+        period = arguments.get("period", "1y")
+        min_overlap = arguments.get("min_overlap", 60)
+
+        close = _prices.closes(tickers, period)
+        returns = close.pct_change(fill_method=None).iloc[1:]
+        names = list(returns.columns)
+        x = returns.to_numpy(np.float32)
+        corr, overlap = ce.pairwise_corr(x, min_periods=min_overlap, method=arguments.get("method", "pearson"))
+
+        result = {
+            "method": arguments.get("method", "pearson"),
+            "period": period,
+            "n_tickers": len(names),
+            "n_obs": len(returns),
+            "missing": [t for t in tickers if t not in names],
+            "mean_corr": _round(ce.mean_offdiag(corr)),
+        }
+        shrinkage = arguments.get("shrinkage", "none")
+        if shrinkage != "none":
+            corr, intensity = ce.shrink(corr, x, shrinkage)
+            result["shrinkage"] = {"target": shrinkage, "intensity": round(intensity, 4)}
+        result.update(ce.top_pairs(corr, names, arguments.get("top_k", 10), overlap))
+        if arguments.get("cluster_order"):
+            result["cluster_order"] = [names[i] for i in ce.cluster_order(corr)]
+        window = arguments.get("rolling_window", 0)
+        if window and len(returns) >= window:
+            step = max(1, window // 4)
+            points = ce.rolling_mean_corr(x, window, step=step, min_periods=min(min_overlap, window))
+            values = np.array([v for _, v in points])
+            finite = values[np.isfinite(values)]
+            result["rolling_mean_corr"] = {
+                "window": window,
+                "latest": _round(values[-1]),
+                "min": _round(finite.min()) if finite.size else None,
+                "max": _round(finite.max()) if finite.size else None,
+                "recent": [
+                    {"date": returns.index[i].strftime("%Y-%m-%d"), "value": _round(v)}
+                    for i, v in points[-8:]
+                ],
+            }
+        return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
+
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
+@app.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    try:
+        return await _executor.run(name, _call_tool, name, arguments)
+    except (ToolTimeout, ToolBusy) as e:
+        return [TextContent(type="text", text=json.dumps({"error": str(e)}, ensure_ascii=False))]
+
+
 async def main():
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, app.create_initialization_options())
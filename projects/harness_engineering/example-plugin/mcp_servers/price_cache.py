@@ -0,0 +1,236 @@
+"""
+시장 가격 이력 캐시 — mcp_market_server 전용 (프로세스 내 메모리)
+
+(ticker, interval)별 OHLCV DataFrame을 보관하고, 도구는 필요한 기간만 잘라 쓴다.
+같은 세션에서 get_price·get_multi_price·get_correlation이 겹치는 티커를 다시 받지 않도록.
+
+  - 증분 확장: 요청 기간이 캐시보다 길면 앞쪽만 받아 붙이고(backfill),
+    캐시가 오래되면 마지막 봉부터 다시 받아 뒤쪽을 갱신 (마지막 봉은 장중 값일 수 있어 덮어씀)
+  - 장 시간 기준 TTL: 장중이면 MARKET_CACHE_TTL(기본 60초), 장 마감 후에는 마감 이후에 받은 데이터면 계속 유효
+      crypto(-USD 등) 24/7 · kr(.KS/.KQ/^KS11/^KQ11) 09:00–15:30 KST · fx/선물(=X/=F) 평일 종일 · 그 외 us 09:30–16:00 ET
+      (휴장일은 고려하지 않음 — 휴장일에는 마감 시각 이후 한 번 더 받는 정도)
+  - 요청 합치기: 같은 키를 이미 받는 중이면 새로 받지 않고 그 결과를 기다림.
+    나머지 티커는 같은 다운로드 구간끼리 묶어 yf.download 한 번으로
+
+    cache = PriceCache(download=yf.download)
+    frames = cache.history(["^GSPC", "^VIX"], period="1y")   # {ticker: OHLCV DataFrame}
+    close = cache.closes(["^GSPC", "^VIX"], period="1y")     # 종가 DataFrame (열 = 티커)
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+OPEN_TTL_SEC = float(os.environ.get("MARKET_CACHE_TTL", "60"))
+
+# 세션: (시간대, 개장, 마감) — 주말은 휴장, 마감이 None이면 평일 종일
+_SESSIONS = {
+    "us": (ZoneInfo("America/New_York"), (9, 30), (16, 0)),
+    "kr": (ZoneInfo("Asia/Seoul"), (9, 0), (15, 30)),
+    "fx": (ZoneInfo("America/New_York"), (0, 0), None),
+}
+
+
+def market_of(ticker: str) -> str:
+    """티커 → 세션 종류 (crypto / kr / fx / us)"""
+    t = ticker.upper()
+    if t.endswith(("-USD", "-KRW", "-USDT", "-EUR")):
+        return "crypto"
+    if t.endswith((".KS", ".KQ")) or t in ("^KS11", "^KQ11", "^KS200"):
+        return "kr"
+    if t.endswith(("=X", "=F")) or t.startswith("DX-"):
+        return "fx"
+    return "us"
+
+
+def is_open(market: str, now: Optional[datetime] = None) -> bool:
+    if market == "crypto":
+        return True
+    tz, (oh, om), close = _SESSIONS[market]
+    local = (now or datetime.now(tz)).astimezone(tz)
+    if local.weekday() >= 5:
+        return False
+    if close is None:
+        return True
+    minutes = local.hour * 60 + local.minute
+    return oh * 60 + om <= minutes < close[0] * 60 + close[1]
+
+
+def last_close(market: str, now: Optional[datetime] = None) -> float:
+    """가장 최근 장 마감 시각 (epoch초). 종일 세션은 직전 금요일 자정(=토요일 0시)"""
+    tz, _, close = _SESSIONS[market]
+    local = (now or datetime.now(tz)).astimezone(tz)
+    hour, minute = close or (0, 0)
+    day = local.date() + (timedelta(days=1) if close is None else timedelta(0))
+    for _ in range(8):
+        candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz)
+        trading_day = (candidate - timedelta(days=1)) if close is None else candidate
+        if candidate <= local and trading_day.weekday() < 5:
+            return candidate.timestamp()
+        day -= timedelta(days=1)
+    return 0.0
+
+
+def period_start(period: str, today: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """yfinance period 문자열 → 필요한 시작일 (max → None). Nd는 영업일 N개가 들어가도록 여유"""
+    today = (today or pd.Timestamp.today()).normalize()
+    p = period.lower()
+    if p == "max":
+        return None
+    if p == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    if p.endswith("mo"):
+        return today - pd.DateOffset(months=int(p[:-2]))
+    if p.endswith("y"):
+        return today - pd.DateOffset(years=int(p[:-1]))
+    if p.endswith("d"):
+        return today - pd.Timedelta(days=int(p[:-1]) * 2 + 7)
+    raise ValueError(f"알 수 없는 기간: {period}")
+
+
+def slice_period(frame: pd.DataFrame, period: str) -> pd.DataFrame:
+    """캐시된 전체 이력 → period 구간 (Nd는 마지막 N개 거래일)"""
+    if frame.empty or period.lower() == "max":
+        return frame
+    if period.lower().endswith("d") and period.lower() != "ytd":
+        days = frame.index.normalize().unique()[-int(period[:-1]):]
+        return frame[frame.index.normalize() >= days[0]]
+    return frame[frame.index >= period_start(period)]
+
+
+@dataclass
+class _Entry:
+    frame: pd.DataFrame
+    start: Optional[pd.Timestamp]   # 받은 구간 시작 (None = 전체 이력)
+    fetched_at: float               # 뒤쪽을 마지막으로 받은 시각 (epoch초)
+
+
+class PriceCache:
+    def __init__(self, download: Callable[..., pd.DataFrame]):
+        self._download = download
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._inflight: dict[tuple[str, str], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    # ── 조회 ────────────────────────────────────────────────────────────
+
+    def history(self, tickers: list[str], period: str = "1y", interval: str = "1d") -> dict[str, pd.DataFrame]:
+        """{ticker: period 구간 OHLCV} (데이터 없는 티커는 빠짐)"""
+        need = period_start(period)
+        self._ensure(list(dict.fromkeys(tickers)), need, interval)
+        out = {}
+        with self._lock:
+            for ticker in tickers:
+                entry = self._entries.get((ticker, interval))
+                if entry is not None and not entry.frame.empty:
+                    out[ticker] = slice_period(entry.frame, period)
+        return {t: f for t, f in out.items() if not f.empty}
+
+    def closes(self, tickers: list[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """종가 DataFrame (열 = 티커, 날짜 합집합 — 티커별 결측은 NaN)"""
+        frames = self.history(tickers, period, interval)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat({t: f["Close"] for t, f in frames.items()}, axis=1).sort_index()
+
+    # ── 채우기 ──────────────────────────────────────────────────────────
+
+    def _plan(self, key: tuple[str, str], need: Optional[pd.Timestamp]) -> list[tuple]:
+        """키 하나에 필요한 다운로드 구간 목록 [(start, end)] (start None = 전체, end None = 현재까지)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return [(need, None)]
+        if need is None and entry.start is not None:
+            return [(None, None)]   # 전체 이력 요청 → 한 번에 다시 받음
+        plans = []
+        if entry.start is not None and need < entry.start:
+            plans.append((need, entry.start))
+        if self._stale(key[0], entry.fetched_at):
+            last = entry.frame.index[-1].normalize() if not entry.frame.empty else entry.start
+            plans.append((last, None))
+        return plans
+
+    @staticmethod
+    def _stale(ticker: str, fetched_at: float) -> bool:
+        market = market_of(ticker)
+        if is_open(market):
+            return time.time() - fetched_at > OPEN_TTL_SEC
+        return fetched_at < last_close(market)
+
+    def _ensure(self, tickers: list[str], need: Optional[pd.Timestamp], interval: str, wait: bool = True) -> None:
+        waits: list[threading.Event] = []
+        jobs: dict[tuple, list[str]] = {}
+        mine: list[tuple[str, str]] = []
+        with self._lock:
+            for ticker in tickers:
+                key = (ticker, interval)
+                if key in self._inflight:
+                    if wait:
+                        waits.append(self._inflight[key])
+                    continue
+                plans = self._plan(key, need)
+                if not plans:
+                    continue
+                self._inflight[key] = threading.Event()
+                mine.append(key)
+                for plan in plans:
+                    jobs.setdefault(plan, []).append(ticker)
+
+        try:
+            fetched_at = time.time()
+            for (start, end), group in jobs.items():
+                frames = self._fetch(group, start, end, interval)
+                with self._lock:
+                    for ticker in group:
+                        self._merge((ticker, interval), frames.get(ticker), start, end, fetched_at)
+        finally:
+            with self._lock:
+                for key in mine:
+                    self._inflight.pop(key).set()
+
+        for event in waits:
+            event.wait()
+        # 남이 받던 구간이 이번 요청보다 짧았거나 실패했을 수 있음 → 모자란 것만 한 번 더
+        if waits:
+            self._ensure(tickers, need, interval, wait=False)
+
+    def _merge(self, key, frame: Optional[pd.DataFrame], start, end, fetched_at: float) -> None:
+        entry = self._entries.get(key)
+        frame = frame if frame is not None else pd.DataFrame()
+        if entry is None:
+            self._entries[key] = _Entry(frame.sort_index(), start, fetched_at)
+            return
+        merged = pd.concat([entry.frame, frame])
+        entry.frame = merged[~merged.index.duplicated(keep="last")].sort_index()
+        if end is None:
+            entry.fetched_at = fetched_at
+        if start is None or (entry.start is not None and start < entry.start):
+            entry.start = start
+
+    def _fetch(self, tickers: list[str], start, end, interval: str) -> dict[str, pd.DataFrame]:
+        """yf.download 한 번으로 여러 티커 → {ticker: OHLCV} (시간대 제거, 전부 결측인 행 제외)"""
+        kwargs = {"interval": interval, "auto_adjust": True, "progress": False, "group_by": "ticker"}
+        if start is None and end is None:
+            kwargs["period"] = "max"
+        else:
+            if start is not None:
+                kwargs["start"] = start.strftime("%Y-%m-%d")
+            if end is not None:
+                kwargs["end"] = end.strftime("%Y-%m-%d")
+        data = self._download(tickers if len(tickers) > 1 else tickers[0], **kwargs)
+        if data is None or data.empty:
+            return {}
+        if data.index.tz is not None:
+            data.index = data.index.tz_localize(None)
+        if isinstance(data.columns, pd.MultiIndex):
+            names = data.columns.get_level_values(0).unique()
+            frames = {t: data[t] for t in tickers if t in names}
+        else:
+            frames = {tickers[0]: data}
+        return {t: f.dropna(how="all") for t, f in frames.items()}
@@ -0,0 +1,278 @@
+"""
+시세 스트리밍 구독 — mcp_broker_server 전용
+
+get_quotes/get_greeks 폴링 대신 스트림이 밀어 넣는 최신 시세·Greeks를 메모리 표(QuoteTable)에 두고
+도구는 표를 바로 읽는다 (REST 호출·rate limit 소모 없음).
+
+  - QuoteTable: 심볼별 최신 행 + 전역 seq. snapshot(symbols) / since=seq로 그 뒤 바뀐 행만(delta)
+  - DxLinkStream: TastyTrade DXLink 웹소켓 (LIVE). /api-quote-tokens로 토큰 발급 →
+      SETUP → AUTH → CHANNEL_REQUEST(FEED) → FEED_SETUP → FEED_SUBSCRIPTION, 끊기면 백오프 재연결
+      옵션 Greeks는 스트리머 심볼(예: .SPY240315C500)로 구독
+  - SimulatedStream: BROKER_DRY_RUN용 로컬 시뮬레이터 (랜덤워크 시세, 옵션 심볼은 Greeks 포함)
+
+표는 이벤트 루프 한 곳에서만 갱신·조회하므로 잠금이 없다.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Optional
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# DXLink 이벤트 → 표 필드
+_FEED_FIELDS = {
+    "Quote": ["eventType", "eventSymbol", "bidPrice", "askPrice", "bidSize", "askSize"],
+    "Trade": ["eventType", "eventSymbol", "price", "dayVolume"],
+    "Greeks": ["eventType", "eventSymbol", "price", "volatility", "delta", "gamma", "theta", "vega", "rho"],
+}
+_RENAME = {
+    "bidPrice": "bid", "askPrice": "ask", "bidSize": "bid_size", "askSize": "ask_size",
+    "dayVolume": "volume", "volatility": "implied_volatility",
+}
+_FEED_CHANNEL = 3
+_KEEPALIVE_SEC = 30
+
+
+def is_option(symbol: str) -> bool:
+    """스트리머 옵션 심볼(.SPY240315C500) 또는 OCC 심볼(SPY240315C00500000)"""
+    return symbol.startswith(".") or (len(symbol) > 10 and any(c.isdigit() for c in symbol))
+
+
+class QuoteTable:
+    """심볼별 최신 시세 행 (bid/ask/last/volume, 옵션은 Greeks 필드 추가)"""
+
+    def __init__(self) -> None:
+        self._rows: dict[str, dict] = {}
+        self._seq = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def update(self, symbol: str, fields: dict) -> None:
+        self._seq += 1
+        row = self._rows.setdefault(symbol, {"symbol": symbol})
+        row.update(fields)
+        row["seq"] = self._seq
+        row["updated_at"] = time.time()
+
+    def drop(self, symbols: list[str]) -> None:
+        for symbol in symbols:
+            self._rows.pop(symbol, None)
+
+    def read(self, symbols: Optional[list[str]] = None, since: int = 0) -> dict:
+        """
+        → {"seq": 현재 seq, "items": {symbol: 행}}
+        since > 0이면 seq가 since보다 큰(그 뒤 바뀐) 행만 — 다음 호출에 반환된 seq를 넘기면 delta 조회
+        """
+        now = time.time()
+        wanted = set(symbols) if symbols else None
+        items = {}
+        for symbol, row in self._rows.items():
+            if row["seq"] <= since or (wanted is not None and symbol not in wanted):
+                continue
+            items[symbol] = {**row, "age_ms": round((now - row["updated_at"]) * 1000, 1)}
+        return {"seq": self._seq, "items": items}
+
+
+class SimulatedStream:
+    """BROKER_DRY_RUN 시세 시뮬레이터 — tick초마다 구독 심볼의 시세를 랜덤워크로 갱신"""
+
+    name = "simulated"
+
+    def __init__(self, table: QuoteTable, tick: float = 0.25) -> None:
+        self.table = table
+        self.tick = tick
+        self.symbols: set[str] = set()
+        self._prices: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, symbols: list[str]) -> None:
+        for symbol in symbols:
+            if symbol not in self.symbols:
+                self.symbols.add(symbol)
+                self._prices[symbol] = 5.0 if is_option(symbol) else 100.0 + (hash(symbol) % 400)
+                self._emit(symbol)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        self.symbols.difference_update(symbols)
+        self.table.drop(symbols)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            for symbol in list(self.symbols):
+                self._emit(symbol)
+
+    def _emit(self, symbol: str) -> None:
+        price = self._prices[symbol] = max(0.01, self._prices[symbol] * (1 + random.gauss(0, 0.001)))
+        fields = {
+            "dry_run": True,
+            "bid": round(price - 0.05, 2),
+            "ask": round(price + 0.05, 2),
+            "last": round(price, 2),
+        }
+        if is_option(symbol):
+            fields.update({
+                "delta": round(0.45 + random.gauss(0, 0.01), 4),
+                "gamma": round(0.02 + random.gauss(0, 0.001), 4),
+                "theta": round(-0.15 + random.gauss(0, 0.005), 4),
+                "vega": round(0.25 + random.gauss(0, 0.005), 4),
+                "rho": 0.05,
+                "implied_volatility": round(0.18 + random.gauss(0, 0.002), 4),
+            })
+        self.table.update(symbol, fields)
+
+
+class DxLinkStream:
+    """
+    TastyTrade DXLink 웹소켓 스트림.
+    token_provider: async () -> (token, dxlink_url) — 재연결마다 새 토큰
+    """
+
+    name = "dxlink"
+
+    def __init__(self, table: QuoteTable, token_provider: Callable[[], Awaitable[tuple[str, str]]]) -> None:
+        if websockets is None:
+            raise RuntimeError("websockets 패키지 필요. pip install websockets")
+        self.table = table
+        self.symbols: set[str] = set()
+        self._token_provider = token_provider
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    async def subscribe(self, symbols: list[str]) -> None:
+        new = [s for s in symbols if s not in self.symbols]
+        self.symbols.update(new)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        if new and self._ready.is_set():
+            await self._send_subscription(add=new)
+
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        gone = [s for s in symbols if s in self.symbols]
+        self.symbols.difference_update(gone)
+        self.table.drop(gone)
+        if gone and self._ready.is_set():
+            await self._send_subscription(remove=gone)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._ws is not None:
+            await self._ws.close()
+
+    @staticmethod
+    def _entries(symbols: list[str]) -> list[dict]:
+        entries = []
+        for symbol in symbols:
+            entries.append({"type": "Quote", "symbol": symbol})
+            entries.append({"type": "Trade", "symbol": symbol})
+            if is_option(symbol):
+                entries.append({"type": "Greeks", "symbol": symbol})
+        return entries
+
+    async def _send(self, message: dict) -> None:
+        await self._ws.send(json.dumps(message))
+
+    async def _send_subscription(self, add: list[str] = (), remove: list[str] = ()) -> None:
+        message = {"type": "FEED_SUBSCRIPTION", "channel": _FEED_CHANNEL}
+        if add:
+            message["add"] = self._entries(list(add))
+        if remove:
+            message["remove"] = self._entries(list(remove))
+        await self._send(message)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                token, url = await self._token_provider()
+                async with websockets.connect(url) as ws:
+                    self._ws = ws
+                    await self._session(ws, token)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[broker] 시세 스트림 끊김: {e} — {backoff:g}초 후 재연결", file=sys.stderr)
+            finally:
+                self._ready.clear()
+                self._ws = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _session(self, ws, token: str) -> None:
+        await self._send({
+            "type": "SETUP", "channel": 0, "version": "0.1-DXF-JS/0.3.0",
+            "keepaliveTimeout": 60, "acceptKeepaliveTimeout": 60,
+        })
+        keepalive = asyncio.create_task(self._keepalive())
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                kind = message.get("type")
+                if kind == "AUTH_STATE":
+                    if message.get("state") == "UNAUTHORIZED":
+                        await self._send({"type": "AUTH", "channel": 0, "token": token})
+                    else:
+                        await self._send({
+                            "type": "CHANNEL_REQUEST", "channel": _FEED_CHANNEL,
+                            "service": "FEED", "parameters": {"contract": "AUTO"},
+                        })
+                elif kind == "CHANNEL_OPENED" and message.get("channel") == _FEED_CHANNEL:
+                    await self._send({
+                        "type": "FEED_SETUP", "channel": _FEED_CHANNEL,
+                        "acceptAggregationPeriod": 0.1, "acceptDataFormat": "FULL",
+                        "acceptEventFields": _FEED_FIELDS,
+                    })
+                    self._ready.set()
+                    if self.symbols:
+                        await self._send_subscription(add=sorted(self.symbols))
+                elif kind == "FEED_DATA":
+                    self._apply(message.get("data", []))
+                elif kind == "ERROR":
+                    print(
+                        f"[broker] DXLink 오류: {message.get('error')} {message.get('message', '')}",
+                        file=sys.stderr,
+                    )
+        finally:
+            keepalive.cancel()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(_KEEPALIVE_SEC)
+            await self._send({"type": "KEEPALIVE", "channel": 0})
+
+    def _apply(self, events: list) -> None:
+        for event in events:
+            if not isinstance(event, dict) or event.get("eventSymbol") not in self.symbols:
+                continue
+            kind = event.get("eventType")
+            fields = {}
+            for key, value in event.items():
+                if key in ("eventType", "eventSymbol") or value in (None, "NaN"):
+                    continue
+                name = _RENAME.get(key, key)
+                if kind == "Trade" and key == "price":
+                    name = "last"
+                elif kind == "Greeks" and key == "price":
+                    name = "option_price"
+                fields[name] = value
+            if fields:
+                self.table.update(event["eventSymbol"], fields)
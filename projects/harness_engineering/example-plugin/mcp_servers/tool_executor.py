@@ -0,0 +1,98 @@
+"""
+MCP 서버 공용 — 블로킹 도구 실행 계층
+
+FRED/market/EIMAS 서버의 도구 본문(requests, yfinance, pykrx, sqlite)은 동기 블로킹 호출이라
+async call_tool 안에서 그대로 실행하면 느린 호출 하나가 stdio 서버 전체를 멈춘다.
+ToolExecutor는 도구 본문을 제한된 스레드 풀에서 실행하고, 도구별 동시 실행 상한과 타임아웃을 건다.
+
+    executor = ToolExecutor("fred", limits={"fetch_series": 4}, timeouts={"fetch_series": 30})
+    result = await executor.run(name, _call_tool, name, arguments)
+
+- limits: 도구별 동시 실행 상한 (없으면 default_limit). 상한을 넘은 호출은 이벤트 루프에서 대기
+- timeouts: 도구별 타임아웃 초 (없으면 default_timeout, 슬롯 대기 시간 포함). 초과 시 ToolTimeout
+  (스레드의 작업 자체는 중단할 수 없어 끝까지 돌지만, 응답은 기다리지 않는다)
+
+슬롯은 await가 끝날 때가 아니라 스레드 작업이 실제로 끝날 때 반납한다 — 타임아웃된 호출도
+끝날 때까지 상한에 포함된다. 타임아웃된 호출이 남아 상한이 차 있으면 새 호출은 기다리지 않고
+ToolBusy로 거절 (멈춘 도구가 공유 스레드 풀을 계속 채우지 않도록).
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ToolTimeout(TimeoutError):
+    """도구 실행이 타임아웃을 넘김"""
+
+
+class ToolBusy(RuntimeError):
+    """타임아웃된 이전 호출이 아직 실행 중이라 동시 실행 상한이 참"""
+
+
+class ToolExecutor:
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 8,
+        default_limit: int = 4,
+        default_timeout: float = 30.0,
+        limits: Optional[dict[str, int]] = None,
+        timeouts: Optional[dict[str, float]] = None,
+    ) -> None:
+        self.name = name
+        self.default_limit = default_limit
+        self.default_timeout = default_timeout
+        self.limits = limits or {}
+        self.timeouts = timeouts or {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"mcp-{name}")
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._running: dict[str, int] = {}
+        self._abandoned: dict[str, int] = {}
+
+    def _slot(self, tool: str) -> asyncio.Semaphore:
+        slot = self._slots.get(tool)
+        if slot is None:
+            slot = self._slots[tool] = asyncio.Semaphore(self.limits.get(tool, self.default_limit))
+        return slot
+
+    def _finished(self, tool: str, abandoned: list[bool]) -> None:
+        """스레드 작업 종료 (이벤트 루프에서 호출) — 슬롯 반납"""
+        self._running[tool] -= 1
+        if abandoned[0]:
+            self._abandoned[tool] -= 1
+        self._slot(tool).release()
+
+    async def run(self, tool: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs)를 풀에서 실행 (tool 기준 상한·타임아웃 적용)"""
+        timeout = self.timeouts.get(tool, self.default_timeout)
+        limit = self.limits.get(tool, self.default_limit)
+        if self._abandoned.get(tool, 0) and self._running.get(tool, 0) >= limit:
+            raise ToolBusy(
+                f"[{self.name}] {tool} 사용 중 — 타임아웃된 호출 {self._abandoned[tool]}건이 아직 실행 중"
+            )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        slot = self._slot(tool)
+        try:
+            await asyncio.wait_for(slot.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise ToolTimeout(f"[{self.name}] {tool} 타임아웃 ({timeout:g}초, 실행 대기 중)") from None
+
+        self._running[tool] = self._running.get(tool, 0) + 1
+        abandoned = [False]
+        try:
+            work = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._finished(tool, abandoned)
+            raise
+        # 슬롯은 스레드 작업이 끝날 때 반납 (시작 전에 취소된 경우 포함)
+        work.add_done_callback(lambda _: loop.call_soon_threadsafe(self._finished, tool, abandoned))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(work), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            if not work.done():
+                abandoned[0] = True
+                self._abandoned[tool] = self._abandoned.get(tool, 0) + 1
+            raise ToolTimeout(f"[{self.name}] {tool} 타임아웃 ({timeout:g}초)") from None
@@ -1,11 +1,14 @@
 """
 AnalyzerAgent — 검색 결과를 Claude로 구조화 분석
+분석 입력 원문 해시로 AnalysisStore를 먼저 조회 → 같은 공고면 Claude 호출 없이 재사용 (reanalyze=True면 무시)
 """
 import json
 import anthropic
 
 from agents.base_agent import BaseAgent
 from config import API_CONFIG, MODELS
+from core.analysis_store import AnalysisStore
+from core.cache import content_hash
 from core.message_bus import JobContext, MessageType
 from core.models import Analysis, JobPosting
 
@@ -34,11 +37,18 @@ JSON만 출력하고, 다른 텍스트는 포함하지 마세요."""
 class AnalyzerAgent(BaseAgent):
     """Claude로 검색 결과 → 구조화된 분석"""
 
-    def __init__(self):
+    RAW_CHARS = 8000  # 분석 입력 원문 상한 (캐시 키도 이 범위 기준)
+
+    def __init__(self, reanalyze: bool = False):
+        self.reanalyze = reanalyze
         super().__init__("AnalyzerAgent")
 
     def _setup_client(self):
         self.client = anthropic.Anthropic(api_key=API_CONFIG.anthropic_key)
+        self._store = AnalysisStore()
+
+    def close(self) -> None:
+        self.client.close()
 
     def run(self, context: JobContext) -> Analysis:
         self.log_progress(f"분석 시작: {context.company} / {context.role}")
@@ -48,7 +58,7 @@ class AnalyzerAgent(BaseAgent):
             raise ValueError("JobPosting이 없습니다. SearchAgent를 먼저 실행하세요.")
 
         raw = posting.raw_search or posting.jd
-        structured = self._analyze(context.company, context.role, raw)
+        structured = self._analyze_cached(context.company, context.role, raw)
 
         # JobPosting 필드 보강
         posting.vision = structured.get("vision", "")
@@ -86,12 +96,27 @@ class AnalyzerAgent(BaseAgent):
         )
         return analysis
 
+    def _analyze_cached(self, company: str, role: str, raw: str) -> dict:
+        """저장소 적중 → 저장된 분석, 미스(또는 reanalyze) → Claude 분석 후 저장 (파싱 실패는 저장 안 함)"""
+        key = content_hash(MODELS["anthropic"], SYSTEM_PROMPT, company, role, raw[:self.RAW_CHARS])
+        if not self.reanalyze:
+            cached = self._store.get(company, role, key)
+            if cached is not None:
+                self.log_progress(f"분석 캐시 적중 (Claude 호출 생략): {self._store.path(company, role, key)}")
+                return cached
+
+        structured = self._analyze(company, role, raw)
+        if structured:
+            path = self._store.put(company, role, key, structured, model=MODELS["anthropic"])
+            self.log_progress(f"분석 저장: {path}")
+        return structured
+
     def _analyze(self, company: str, role: str, raw_search: str) -> dict:
         user_prompt = f"""아래는 '{company}'의 '{role}' 포지션에 대한 검색 결과입니다.
 이를 분석하여 JSON을 생성하세요.
 
 --- 검색 결과 ---
-{raw_search[:8000]}
+{raw_search[:self.RAW_CHARS]}
 --- 끝 ---
 """
         message = self.client.messages.create(
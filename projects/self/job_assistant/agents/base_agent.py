@@ -32,11 +32,24 @@ class BaseAgent(ABC):
         """컨텍스트를 받아 처리하고 결과 반환"""
         pass
 
+    def close(self) -> None:
+        """_setup_client()에서 만든 클라이언트 정리 (배치 모드는 모든 대상이 끝난 뒤 1번)"""
+        pass
+
+    def __enter__(self) -> "BaseAgent":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def log_progress(self, msg: str):
         self.logger.info(f"[{self.name}] {msg}")
 
     def log_success(self, msg: str):
         self.logger.info(f"[{self.name}] OK — {msg}")
 
+    def log_warning(self, msg: str):
+        self.logger.warning(f"[{self.name}] WARN — {msg}")
+
     def log_error(self, msg: str):
         self.logger.error(f"[{self.name}] ERR — {msg}")
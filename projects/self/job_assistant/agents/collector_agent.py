@@ -6,13 +6,23 @@ CollectorAgent — 멀티카테고리 수집 (Perplexity 기반)
   COMPANY  : 회사 비전, 인재상, 최근 사업 방향
   INSIDER  : 현직자 인터뷰, 블라인드, 팀 문화
   SUCCESS  : 합격수기, 면접 후기, 합격 스펙
+
+전체 쿼리(카테고리 × 템플릿)를 하나의 스레드 풀에서 독립 작업으로 실행하고
+결과는 카테고리별 템플릿 순서대로 다시 합친다. HTTP 연결은 에이전트 공유 클라이언트 1개로 재사용.
+
+쿼리 결과는 회사별 캐시(data/cache/research/{company}/)에 (회사, 쿼리 문자열) 키로 저장,
+카테고리별 유효기간(RESEARCH_TTL_DAYS) 안이면 재사용. 직무와 무관한 COMPANY 쿼리는
+같은 회사의 다른 직무 실행에서도 그대로 캐시 적중.
 """
+import os
+import threading
 import httpx
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from agents.base_agent import BaseAgent
-from config import API_CONFIG, MODELS
+from config import API_CONFIG, CACHE_DIR, MODELS, RESEARCH_TTL_DAYS
+from core.cache import ContentCache, content_hash, safe_dirname
 from core.message_bus import JobContext, MessageType
 from core.models import CollectedContent
 
@@ -45,15 +55,25 @@ class CollectorAgent(BaseAgent):
     """Perplexity로 4카테고리 멀티쿼리 수집"""
 
     BASE_URL = "https://api.perplexity.ai"
-    MAX_WORKERS = 4  # 카테고리 병렬 처리
+    MAX_WORKERS = 10  # 쿼리 단위 병렬 처리 상한 (현재 템플릿 총 10쿼리 → 1회전)
 
-    def __init__(self):
+    def __init__(self, refresh: bool = False):
         super().__init__("CollectorAgent")
+        self.refresh = refresh  # True → 캐시 무시하고 다시 수집 (결과는 캐시에 갱신)
 
     def _setup_client(self):
         self.api_key = API_CONFIG.perplexity_key
         if not self.api_key:
             self.logger.warning("PERPLEXITY_API_KEY 없음")
+        # 에이전트 수명 동안 공유 — 배치 모드에서 여러 대상이 연결 풀과 동시 요청 상한을 함께 쓴다
+        self._http = httpx.Client(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=self.MAX_WORKERS),
+        )
+        self._slots = threading.BoundedSemaphore(self.MAX_WORKERS)
+
+    def close(self) -> None:
+        self._http.close()
 
     def run(self, context: JobContext) -> CollectedContent:
         self.log_progress(f"수집 시작: {context.company} / {context.role}")
@@ -63,26 +83,60 @@ class CollectorAgent(BaseAgent):
             role=context.role,
         )
 
-        # 카테고리별 병렬 수집
-        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
-            futures = {
-                executor.submit(
-                    self._collect_category, category, templates, context
-                ): category
-                for category, templates in QUERY_TEMPLATES.items()
-            }
-
-            for future in as_completed(futures):
-                category = futures[future]
-                try:
-                    result = future.result()
-                    collected.raw[category] = result
-                    collected.sources_used.append(f"perplexity/{category}")
-                    self.log_progress(f"  수집 완료: {category} ({len(result)}자)")
-                except Exception as e:
-                    self.log_error(f"카테고리 실패 ({category}): {e}")
-                    context.errors.append(f"CollectorAgent/{category}: {e}")
-                    collected.raw[category] = ""
+        # 쿼리 단위 병렬 수집 — (category, 템플릿 순번)별 독립 작업
+        jobs = [
+            (category, idx, template.format(company=context.company, role=context.role))
+            for category, templates in QUERY_TEMPLATES.items()
+            for idx, template in enumerate(templates)
+        ]
+        parts: Dict[str, List[Optional[str]]] = {
+            category: [None] * len(templates)
+            for category, templates in QUERY_TEMPLATES.items()
+        }
+
+        # 캐시 적중 쿼리는 바로 채우고, 미스만 네트워크로
+        cache = ContentCache(os.path.join(CACHE_DIR, "research", safe_dirname(context.company)))
+        misses = []
+        for category, idx, query in jobs:
+            key = content_hash(context.company, query)
+            ttl = RESEARCH_TTL_DAYS.get(category, 7) * 86400
+            cached = None if self.refresh else cache.get(key, max_age_sec=ttl)
+            if cached is not None:
+                parts[category][idx] = cached
+            else:
+                misses.append((category, idx, query, key))
+        self.log_progress(f"  캐시 적중 {len(jobs) - len(misses)}/{len(jobs)}쿼리")
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        cache.get_or_compute,
+                        key,
+                        lambda query=query: self._call_perplexity(query),
+                        max_age_sec=RESEARCH_TTL_DAYS.get(category, 7) * 86400,
+                        refresh=self.refresh,
+                    ): (category, idx)
+                    for category, idx, query, key in misses
+                }
+                for future in as_completed(futures):
+                    category, idx = futures[future]
+                    try:
+                        parts[category][idx] = future.result()
+                    except Exception as e:
+                        self.log_error(f"쿼리 실패 ({category}#{idx + 1}): {e}")
+
+        # 카테고리별로 템플릿 순서대로 재조립 (실패한 쿼리는 제외)
+        for category in QUERY_TEMPLATES:
+            results = [r for r in parts[category] if r is not None]
+            if not results:
+                context.errors.append(f"CollectorAgent/{category}: 모든 쿼리 실패")
+            collected.raw[category] = "\n\n---\n\n".join(results)
+            collected.sources_used.append(f"perplexity/{category}")
+            self.log_progress(
+                f"  수집 완료: {category} ({len(results)}/{len(parts[category])}쿼리, "
+                f"{len(collected.raw[category])}자)"
+            )
 
         context.collected_content = collected
 
@@ -99,24 +153,6 @@ class CollectorAgent(BaseAgent):
         )
         return collected
 
-    def _collect_category(
-        self, category: str, templates: List[str], context: JobContext
-    ) -> str:
-        """카테고리 내 여러 쿼리 실행 후 합치기"""
-        parts = []
-        for template in templates:
-            query = template.format(
-                company=context.company,
-                role=context.role,
-            )
-            try:
-                result = self._call_perplexity(query)
-                parts.append(result)
-            except Exception as e:
-                self.log_error(f"쿼리 실패 ({category}): {e}")
-
-        return "\n\n---\n\n".join(parts)
-
     def _call_perplexity(self, query: str) -> str:
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -138,11 +174,11 @@ class CollectorAgent(BaseAgent):
             "temperature": 0.2,
             "return_citations": True,
         }
-        with httpx.Client(timeout=60.0) as client:
-            resp = client.post(
+        with self._slots:
+            resp = self._http.post(
                 f"{self.BASE_URL}/chat/completions",
                 headers=headers,
                 json=payload,
             )
-            resp.raise_for_status()
-            return resp.json()["choices"][0]["message"]["content"]
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"]
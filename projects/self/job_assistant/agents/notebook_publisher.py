@@ -1,34 +1,47 @@
 """
-NotebookPublisher — 소스 파일 생성 + NotebookLM 업로드 가이드 출력
-
-Python에서 NotebookLM API 직접 호출 불가 (MCP 기반).
-따라서:
-  1. 소스 텍스트를 data/notebooks/{company}_{role}/ 에 저장
-  2. Claude Code(MCP)에서 업로드할 수 있도록 업로드 가이드 출력
-  3. notebook_id가 주어지면 context에 저장
+NotebookPublisher — 소스 파일 생성 + 노트북 업로드
+
+  1. 소스 텍스트를 data/outputs/notebooks/{company}_{role}/ 에 저장 (회사/직무별 고정 디렉토리)
+  2. transport가 있으면 노트북 생성(또는 기존 notebook_id 재사용) 후 소스를 동시에 업로드
+     - _meta.json이 증분 매니페스트: 소스별 content_hash(파일), uploaded_hash·source_id(원격), notebook_id
+     - 내용이 같은 소스는 건너뜀, 바뀐 소스는 새로 올린 뒤 이전 소스 삭제, 사라진 카테고리는 삭제
+     - 업로드 실패한 소스는 이전 매니페스트 항목 유지 → 다음 실행에서 재시도
+  3. transport가 없으면(기본) 예전처럼 Claude Code(MCP) 업로드 가이드 출력
 """
 import os
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
 from agents.base_agent import BaseAgent
 from config import OUTPUTS_DIR
+from core.cache import content_hash, safe_dirname
 from core.message_bus import JobContext, MessageType
 from core.models import NotebookResult, SummarizedSource
+from core.notebook_transport import NotebookTransport
 
 
 NOTEBOOKS_DIR = os.path.join(OUTPUTS_DIR, "notebooks")
 
 
 class NotebookPublisher(BaseAgent):
-    """소스 파일 저장 + MCP 업로드 가이드 출력"""
+    """소스 파일 저장 + 노트북 업로드 (transport 없으면 MCP 업로드 가이드 출력)"""
+
+    UPLOAD_WORKERS = 4  # 소스 동시 업로드 상한
 
-    def __init__(self):
+    def __init__(self, transport: Optional[NotebookTransport] = None):
+        self.transport = transport
         super().__init__("NotebookPublisher")
 
     def _setup_client(self):
-        pass  # MCP 경유 → Python 클라이언트 불필요
+        pass  # 업로드 클라이언트는 transport가 가짐
+
+    def close(self) -> None:
+        """transport 정리 (stub이면 로컬 서버 종료)"""
+        if self.transport is not None:
+            self.transport.close()
 
     def run(self, context: JobContext) -> NotebookResult:
         self.log_progress(f"노트북 소스 생성: {context.company} / {context.role}")
@@ -37,63 +50,167 @@ class NotebookPublisher(BaseAgent):
         if not sources:
             raise ValueError("SummarizedSource 없음. SummarizerAgent를 먼저 실행하세요.")
 
-        # 저장 디렉토리 생성
-        safe_name = f"{context.company}_{context.role}".replace(" ", "_").replace("/", "-")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        output_dir = os.path.join(NOTEBOOKS_DIR, f"{safe_name}_{timestamp}")
+        # 회사/직무별 고정 디렉토리 — 이전 실행의 _meta.json을 이어받아 증분 처리
+        output_dir = os.path.join(NOTEBOOKS_DIR, safe_dirname(f"{context.company}_{context.role}"))
         os.makedirs(output_dir, exist_ok=True)
+        meta_path = os.path.join(output_dir, "_meta.json")
+        previous = self._load_meta(meta_path)
+        prev_sources = {s["category"]: s for s in previous.get("sources", [])}
 
-        # 소스 파일 저장
-        saved_files = []
+        # 소스 파일 저장 (내용이 같으면 다시 쓰지 않음)
+        entries = []
         for i, source in enumerate(sources, 1):
             filename = f"{i:02d}_{source.category}_{source.model_used}.md"
+            digest = content_hash(source.title, source.content)
+            prev = prev_sources.get(source.category, {})
             filepath = os.path.join(output_dir, filename)
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(f"# {source.title}\n\n")
-                f.write(source.content)
-            saved_files.append(filepath)
-            self.log_progress(f"  저장: {filename}")
+            if prev.get("content_hash") != digest or not os.path.exists(filepath):
+                with open(filepath, "w", encoding="utf-8") as f:
+                    f.write(f"# {source.title}\n\n")
+                    f.write(source.content)
+                self.log_progress(f"  저장: {filename}")
+            entries.append({
+                "title": source.title,
+                "category": source.category,
+                "model_used": source.model_used,
+                "char_count": len(source.content),
+                "file": filename,
+                "content_hash": digest,
+                "source_id": prev.get("source_id", ""),
+                "uploaded_hash": prev.get("uploaded_hash", ""),
+            })
+        current_files = {e["file"] for e in entries}
+        for prev in prev_sources.values():
+            stale = prev.get("file")
+            if stale and stale not in current_files and os.path.exists(os.path.join(output_dir, stale)):
+                os.remove(os.path.join(output_dir, stale))
+
+        notebook_title = f"{context.company} {context.role} — 지원 전략 분석"
+        notebook_id = ""
+        if self.transport is not None:
+            notebook_id = self._publish(context, notebook_title, sources, entries, previous)
 
-        # 메타데이터 저장
         meta = {
             "company": context.company,
             "role": context.role,
-            "created_at": timestamp,
-            "sources": [
-                {
-                    "title": s.title,
-                    "category": s.category,
-                    "model_used": s.model_used,
-                    "char_count": len(s.content),
-                }
-                for s in sources
-            ],
+            "created_at": previous.get("created_at") or datetime.now().strftime("%Y%m%d_%H%M"),
+            "updated_at": datetime.now().strftime("%Y%m%d_%H%M"),
+            "notebook_title": notebook_title,
+            "notebook_id": notebook_id or previous.get("notebook_id", ""),
+            "transport": self.transport.name if self.transport else previous.get("transport", ""),
+            "endpoint": self.transport.endpoint if self.transport else previous.get("endpoint", ""),
+            "sources": entries,
         }
-        meta_path = os.path.join(output_dir, "_meta.json")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+        self._save_meta(meta_path, meta)
 
-        # 업로드 가이드 출력
-        self._print_upload_guide(context, sources, output_dir)
+        if self.transport is None:
+            self._print_upload_guide(context, sources, output_dir)
 
         result = NotebookResult(
             company=context.company,
             role=context.role,
             sources=sources,
             output_dir=output_dir,
+            notebook_id=meta["notebook_id"],
         )
         context.notebook_result = result
 
         context.add_message(
             sender="NotebookPublisher",
             receiver="user",
-            content={"output_dir": output_dir, "source_count": len(sources)},
+            content={
+                "output_dir": output_dir,
+                "source_count": len(sources),
+                "notebook_id": meta["notebook_id"],
+            },
             msg_type=MessageType.RESULT,
         )
 
         self.log_success(f"소스 {len(sources)}개 저장 완료: {output_dir}")
         return result
 
+    def _publish(
+        self,
+        context: JobContext,
+        notebook_title: str,
+        sources: List[SummarizedSource],
+        entries: List[dict],
+        previous: dict,
+    ) -> str:
+        """
+        노트북에 소스 업로드 (entries의 source_id/uploaded_hash를 결과에 맞게 갱신) → notebook_id.
+        같은 transport·endpoint로 만든 노트북이 매니페스트에 있으면 재사용.
+        """
+        transport = self.transport
+        same_target = (
+            previous.get("notebook_id")
+            and previous.get("transport") == transport.name
+            and previous.get("endpoint") == transport.endpoint
+        )
+        prev_sources: Dict[str, dict] = (
+            {s["category"]: s for s in previous.get("sources", [])} if same_target else {}
+        )
+        if same_target:
+            notebook_id = previous["notebook_id"]
+        else:
+            notebook_id = transport.create_notebook(notebook_title)
+            self.log_progress(f"  노트북 생성: {notebook_id}")
+            for entry in entries:
+                entry["source_id"] = entry["uploaded_hash"] = ""
+
+        jobs = []
+        for source, entry in zip(sources, entries):
+            prev = prev_sources.get(source.category, {})
+            if prev.get("source_id") and prev.get("uploaded_hash") == entry["content_hash"]:
+                continue
+            jobs.append((source, entry, prev))
+        current = {s.category for s in sources}
+        stale = [p for c, p in prev_sources.items() if c not in current and p.get("source_id")]
+
+        def _upload(job) -> None:
+            source, entry, prev = job
+            try:
+                entry["source_id"] = transport.add_source(notebook_id, source.title, source.content)
+                entry["uploaded_hash"] = entry["content_hash"]
+            except Exception as e:
+                # 원격 상태는 이전 그대로 → 다음 실행에서 다시 올림
+                entry["source_id"] = prev.get("source_id", "")
+                entry["uploaded_hash"] = prev.get("uploaded_hash", "")
+                self.log_error(f"업로드 실패: {source.title} — {e}")
+                context.errors.append(f"NotebookPublisher 업로드 실패: {source.category} — {e}")
+                return
+            if prev.get("source_id"):
+                self._delete(notebook_id, prev["source_id"])
+
+        with ThreadPoolExecutor(max_workers=self.UPLOAD_WORKERS) as executor:
+            list(executor.map(_upload, jobs))
+            list(executor.map(lambda p: self._delete(notebook_id, p["source_id"]), stale))
+
+        self.log_progress(
+            f"  업로드: {len(jobs)}개, 변경 없음 건너뜀 {len(sources) - len(jobs)}개, "
+            f"삭제 {len(stale)}개 (notebook_id={notebook_id})"
+        )
+        return notebook_id
+
+    def _delete(self, notebook_id: str, source_id: str) -> None:
+        try:
+            self.transport.delete_source(notebook_id, source_id)
+        except Exception as e:
+            self.log_error(f"이전 소스 삭제 실패: {source_id} — {e}")
+
+    def _load_meta(self, meta_path: str) -> dict:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_meta(self, meta_path: str, meta: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(meta_path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, meta_path)
+
     def _print_upload_guide(
         self,
         context: JobContext,
@@ -8,14 +8,27 @@ SummarizerAgent — 멀티모델 요약
   Claude Sonnet      : PROFILE — 지원자 fit 매핑 (추론 필요)
 
 모델 키가 없으면 Claude Haiku로 폴백.
+
+카테고리 요약과 PROFILE 소스는 스레드 풀에서 동시에 실행하고,
+프로바이더별 동시 호출 수는 PROVIDER_LIMITS로 제한한다.
+Claude 폴백은 실패한 항목에만 해당 작업 안에서 바로 이어서 실행.
+
+긴 원문은 잘라내지 않고 map-reduce로 요약:
+  CollectorAgent 구분자(---) 단위 청크 → 병렬 부분 요약(map, 콘텐츠 해시 캐시)
+  → 부분 요약 통합(reduce). 부분 요약 합이 여전히 길면 한 단계 더 접는다.
+최종 요약과 PROFILE도 같은 캐시를 거치므로, 수집 캐시가 적중해 원문이 같으면 API 호출 없음.
 """
 import json
+import os
+import threading
 import httpx
 import anthropic
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from agents.base_agent import BaseAgent
-from config import API_CONFIG, MODELS
+from config import API_CONFIG, CACHE_DIR, MODELS
+from core.cache import ContentCache, content_hash
 from core.message_bus import JobContext, MessageType
 from core.models import CollectedContent, SummarizedSource
 
@@ -62,14 +75,49 @@ NOTEBOOK_TITLES = {
 }
 
 
+# map-reduce 설정
+CHUNK_CHARS = 8000                 # 모델 1회 호출 입력 상한
+CHUNK_SEPARATOR = "\n\n---\n\n"    # CollectorAgent가 쿼리 결과 사이에 넣는 구분자
+MAP_WORKERS = 4                    # 카테고리 1개 안의 청크 병렬 요약 수
+MAX_REDUCE_DEPTH = 3
+
+MAP_NOTE = (
+    "\n(아래는 전체 자료 중 일부입니다. 나중에 다른 부분과 합쳐지므로 "
+    "사실·수치·고유명사·인용을 빠짐없이 항목별로 추출하세요.)"
+)
+REDUCE_NOTE = (
+    "\n(아래는 같은 주제 자료를 부분별로 요약한 것입니다. "
+    "중복을 제거하고 하나의 정리본으로 통합하세요.)"
+)
+
+# 프로바이더별 동시 호출 상한 (rate limit 보호)
+PROVIDER_LIMITS = {
+    "openai":    4,
+    "gemini":    2,
+    "anthropic": 3,
+}
+
+
 class SummarizerAgent(BaseAgent):
     """카테고리별 최적 모델로 요약 → SummarizedSource 목록 생성"""
 
+    MAX_WORKERS = 6  # 카테고리 4 + PROFILE 1 동시 실행
+
     def __init__(self):
         super().__init__("SummarizerAgent")
 
     def _setup_client(self):
         self.anthropic = anthropic.Anthropic(api_key=API_CONFIG.anthropic_key)
+        self._slots = {
+            provider: threading.BoundedSemaphore(limit)
+            for provider, limit in PROVIDER_LIMITS.items()
+        }
+        self._cache = ContentCache(os.path.join(CACHE_DIR, "summaries"))
+        self._http = httpx.Client(timeout=60.0)  # OpenAI/Gemini 공유 연결 풀
+
+    def close(self) -> None:
+        self._http.close()
+        self.anthropic.close()
 
     def run(self, context: JobContext) -> List[SummarizedSource]:
         self.log_progress(f"요약 시작: {context.company} / {context.role}")
@@ -78,8 +126,7 @@ class SummarizerAgent(BaseAgent):
         if not collected:
             raise ValueError("CollectedContent 없음. CollectorAgent를 먼저 실행하세요.")
 
-        sources: List[SummarizedSource] = []
-
+        jobs = []
         for category, raw_text in collected.raw.items():
             if not raw_text.strip():
                 self.log_progress(f"  건너뜀 (빈 콘텐츠): {category}")
@@ -90,32 +137,30 @@ class SummarizerAgent(BaseAgent):
             title = NOTEBOOK_TITLES.get(category, f"{context.company} — {category}").format(
                 company=context.company, role=context.role
             )
+            jobs.append((category, raw_text, prompt, model_key, title))
 
-            self.log_progress(f"  요약 중: {category} (모델: {model_key})")
-            try:
-                summarized = self._summarize(raw_text, prompt, model_key)
+        # 카테고리 요약 + PROFILE 소스(지원자 역량 × 직무 매핑, Claude Sonnet) 동시 실행
+        # PROFILE은 원래도 요약 완료 전 context 기준(JD 원문)으로 만들어지므로 입력이 같다
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            profile_future = executor.submit(self._build_profile_source, context)
+            futures = [
+                (job, executor.submit(self._summarize_item, job, context))
+                for job in jobs
+            ]
+            sources: List[SummarizedSource] = []
+            for (category, _, _, _, title), future in futures:  # 카테고리 순서 유지
+                result = future.result()
+                if result is None:
+                    continue
+                content, model_used = result
                 sources.append(SummarizedSource(
                     title=title,
-                    content=summarized,
+                    content=content,
                     category=category,
-                    model_used=model_key,
+                    model_used=model_used,
                 ))
-            except Exception as e:
-                self.log_error(f"요약 실패 ({category}/{model_key}): {e} — Claude로 폴백")
-                context.errors.append(f"SummarizerAgent/{category}: {e}")
-                try:
-                    summarized = self._summarize_claude(raw_text, prompt, fast=True)
-                    sources.append(SummarizedSource(
-                        title=title,
-                        content=summarized,
-                        category=category,
-                        model_used="anthropic_fast(fallback)",
-                    ))
-                except Exception as e2:
-                    self.log_error(f"폴백도 실패 ({category}): {e2}")
-
-        # PROFILE 소스: 지원자 역량 × 직무 매핑 (Claude Sonnet)
-        profile_source = self._build_profile_source(context)
+            profile_source = profile_future.result()
+
         if profile_source:
             sources.append(profile_source)
 
@@ -131,6 +176,81 @@ class SummarizerAgent(BaseAgent):
         self.log_success(f"요약 완료: {len(sources)}개 소스 생성")
         return sources
 
+    def _summarize_item(
+        self, job: tuple, context: JobContext
+    ) -> Optional[Tuple[str, str]]:
+        """담당 모델로 요약, 실패 시 이 항목만 Claude Haiku 폴백 → (content, model_used)"""
+        category, raw_text, prompt, model_key, _ = job
+        self.log_progress(f"  요약 중: {category} (모델: {model_key}, {len(raw_text)}자)")
+        try:
+            summary = self._map_reduce(
+                raw_text, prompt, self._model_name(model_key),
+                lambda t, p: self._summarize(t, p, model_key),
+            )
+            return summary, model_key
+        except Exception as e:
+            self.log_error(f"요약 실패 ({category}/{model_key}): {e} — Claude로 폴백")
+            context.errors.append(f"SummarizerAgent/{category}: {e}")
+        try:
+            summary = self._map_reduce(
+                raw_text, prompt, MODELS["anthropic_fast"],
+                lambda t, p: self._summarize_claude(t, p, fast=True),
+            )
+            return summary, "anthropic_fast(fallback)"
+        except Exception as e2:
+            self.log_error(f"폴백도 실패 ({category}): {e2}")
+            return None
+
+    def _map_reduce(self, text: str, prompt: str, model_name: str, call) -> str:
+        """
+        CHUNK_CHARS 이하 → call 1회.
+        초과 → 청크별 병렬 요약(map) → 부분 요약을 다시 청크로 묶어 반복 → 최종 통합(reduce).
+        MAX_REDUCE_DEPTH 단계 뒤에도 여러 청크면 청크마다 같은 몫으로 잘라 CHUNK_CHARS에 맞춘다 (경고 로그).
+        모든 호출은 (모델, 프롬프트, 입력) 해시로 캐시 — 같은 입력은 다시 호출하지 않는다.
+        """
+        chunks = _pack([p for p in text.split(CHUNK_SEPARATOR) if p.strip()])
+        depth = 0
+        while len(chunks) > 1 and depth < MAX_REDUCE_DEPTH:
+            map_prompt = prompt + MAP_NOTE
+            with ThreadPoolExecutor(max_workers=MAP_WORKERS) as executor:
+                partials = list(executor.map(
+                    lambda chunk: self._cached_call(model_name, map_prompt, chunk, call),
+                    chunks,
+                ))
+            depth += 1
+            self.log_progress(
+                f"    map {depth}단계: {len(chunks)}청크 → {sum(len(p) for p in partials)}자"
+            )
+            chunks = _pack([p for p in partials if p.strip()])
+
+        final_text, dropped = _fit(chunks)
+        if dropped:
+            self.log_warning(
+                f"    reduce {MAX_REDUCE_DEPTH}단계 후에도 {len(chunks)}청크 — "
+                f"청크별로 잘라 {dropped}자 제외하고 통합"
+            )
+        final_prompt = prompt if depth == 0 else prompt + REDUCE_NOTE
+        return self._cached_call(model_name, final_prompt, final_text, call)
+
+    def _cached_call(self, model_name: str, prompt: str, chunk: str, call) -> str:
+        key = content_hash(model_name, prompt, chunk)
+        return self._cache.get_or_compute(key, lambda: call(chunk, prompt))
+
+    def _clip(self, text: str) -> str:
+        """모델 입력 상한 — _map_reduce()를 거친 입력은 넘지 않음, 넘는 입력은 잘라내고 경고"""
+        if len(text) <= CHUNK_CHARS:
+            return text
+        self.log_warning(f"    입력 {len(text)}자 → {CHUNK_CHARS}자로 잘라 호출")
+        return text[:CHUNK_CHARS]
+
+    def _model_name(self, model_key: str) -> str:
+        """_summarize()가 실제로 호출할 모델명 (캐시 키용)"""
+        if model_key == "openai" and API_CONFIG.openai_key:
+            return MODELS["openai"]
+        if model_key == "gemini" and API_CONFIG.gemini_key:
+            return MODELS["gemini"]
+        return MODELS["anthropic_fast"] if model_key == "anthropic_fast" else MODELS["anthropic"]
+
     def _summarize(self, text: str, prompt: str, model_key: str) -> str:
         """모델 키에 따라 적절한 API 호출"""
         if model_key == "openai" and API_CONFIG.openai_key:
@@ -143,14 +263,15 @@ class SummarizerAgent(BaseAgent):
 
     def _summarize_claude(self, text: str, prompt: str, fast: bool = False) -> str:
         model = MODELS["anthropic_fast"] if fast else MODELS["anthropic"]
-        msg = self.anthropic.messages.create(
-            model=model,
-            max_tokens=2048,
-            messages=[{
-                "role": "user",
-                "content": f"{prompt}\n\n---\n{text[:8000]}\n---",
-            }],
-        )
+        with self._slots["anthropic"]:
+            msg = self.anthropic.messages.create(
+                model=model,
+                max_tokens=2048,
+                messages=[{
+                    "role": "user",
+                    "content": f"{prompt}\n\n---\n{self._clip(text)}\n---",
+                }],
+            )
         return msg.content[0].text.strip()
 
     def _summarize_openai(self, text: str, prompt: str) -> str:
@@ -162,13 +283,13 @@ class SummarizerAgent(BaseAgent):
             "model": MODELS["openai"],
             "messages": [
                 {"role": "system", "content": prompt},
-                {"role": "user", "content": text[:8000]},
+                {"role": "user", "content": self._clip(text)},
             ],
             "temperature": 0.2,
             "max_tokens": 2048,
         }
-        with httpx.Client(timeout=60.0) as client:
-            resp = client.post(
+        with self._slots["openai"]:
+            resp = self._http.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers=headers,
                 json=payload,
@@ -184,12 +305,12 @@ class SummarizerAgent(BaseAgent):
         )
         payload = {
             "contents": [{
-                "parts": [{"text": f"{prompt}\n\n---\n{text[:8000]}\n---"}]
+                "parts": [{"text": f"{prompt}\n\n---\n{self._clip(text)}\n---"}]
             }],
             "generationConfig": {"temperature": 0.2, "maxOutputTokens": 2048},
         }
-        with httpx.Client(timeout=60.0) as client:
-            resp = client.post(url, json=payload)
+        with self._slots["gemini"]:
+            resp = self._http.post(url, json=payload)
             resp.raise_for_status()
             return resp.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
 
@@ -226,7 +347,10 @@ class SummarizerAgent(BaseAgent):
             company=context.company, role=context.role
         )
         try:
-            content = self._summarize_claude(prompt, "", fast=False)
+            content = self._cached_call(
+                MODELS["anthropic"], "", prompt,
+                lambda t, p: self._summarize_claude(t, p, fast=False),
+            )
             return SummarizedSource(
                 title=title,
                 content=content,
@@ -236,3 +360,51 @@ class SummarizerAgent(BaseAgent):
         except Exception as e:
             self.log_error(f"PROFILE 소스 생성 실패: {e}")
             return None
+
+
+def _pack(parts: List[str], limit: int = CHUNK_CHARS) -> List[str]:
+    """
+    조각들을 순서대로 limit 이하 청크로 묶기.
+    limit을 넘는 조각은 문단(빈 줄) 단위로, 그래도 넘으면 글자 수로 나눈다.
+    """
+    pieces: List[str] = []
+    for part in parts:
+        if len(part) <= limit:
+            pieces.append(part)
+            continue
+        buf = ""
+        for para in part.split("\n\n"):
+            while len(para) > limit:
+                if buf:
+                    pieces.append(buf)
+                    buf = ""
+                pieces.append(para[:limit])
+                para = para[limit:]
+            if buf and len(buf) + 2 + len(para) > limit:
+                pieces.append(buf)
+                buf = para
+            else:
+                buf = f"{buf}\n\n{para}" if buf else para
+        if buf:
+            pieces.append(buf)
+
+    chunks: List[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + len(CHUNK_SEPARATOR) + len(piece) <= limit:
+            chunks[-1] += CHUNK_SEPARATOR + piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+def _fit(chunks: List[str], limit: int = CHUNK_CHARS) -> Tuple[str, int]:
+    """
+    청크들을 구분자로 이어 limit 이하 텍스트로 → (텍스트, 잘려 나간 글자 수).
+    넘치면 앞 청크만 남기지 않도록 청크마다 같은 몫(구분자 제외)만 남긴다.
+    """
+    text = CHUNK_SEPARATOR.join(chunks)
+    if len(text) <= limit:
+        return text, 0
+    share = max((limit - len(CHUNK_SEPARATOR) * (len(chunks) - 1)) // len(chunks), 0)
+    fitted = CHUNK_SEPARATOR.join(chunk[:share] for chunk in chunks)
+    return fitted[:limit], len(text) - len(fitted[:limit])
@@ -1,18 +1,32 @@
 """
 WriterAgent — 자소서 항목별 소스 배분 + gap task 파일 생성
+
+기존 자소서는 통째로 붙이지 않고 CoverLetterIndex(BM25)로 항목마다 관련 문단 top-k만 뽑아 넣는다.
+인덱스가 없는 호출(cover_letters_raw만 채운 경우)은 예전처럼 전문을 이어 붙인다.
+
+per_section=True → 항목마다 자기 검색 문단만 넣은 작은 요청을 동시에 보내고(항목별 재시도),
+                   끝난 항목은 바로 gap task를 저장. 결과는 cover_letter_sections 순서로 병합
 """
 import json
 import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Optional
 
 import anthropic
 
 from agents.base_agent import BaseAgent
 from config import API_CONFIG, MODELS, TASKS_PENDING_DIR, OUTPUTS_DIR
+from core.corpus_index import CoverLetterIndex, Passage
 from core.message_bus import JobContext, MessageType
 from core.models import Analysis, CoverLetterResult, CoverLetterSection
 
+TOP_K = 3                    # 항목당 검색 문단 수
+COVER_LETTER_CHARS = 6000    # 프롬프트에 넣는 기존 자소서 분량 상한
+
 
 SYSTEM_PROMPT = """당신은 자소서 전략가입니다.
 채용공고 분석 결과와 지원자의 기존 자소서를 바탕으로,
@@ -31,15 +45,37 @@ SYSTEM_PROMPT = """당신은 자소서 전략가입니다.
 
 JSON 배열만 출력하고, 다른 텍스트는 포함하지 마세요."""
 
+SECTION_SYSTEM_PROMPT = """당신은 자소서 전략가입니다.
+채용공고 분석 결과와 지원자의 기존 자소서 중 관련 문단을 바탕으로,
+주어진 자소서 항목 1개에 어떤 경험을 어떻게 배분할지 전략을 세우세요.
+
+반드시 아래 JSON 객체를 출력하세요:
+{
+  "title": "항목명",
+  "source": "기존 자소서에서 재사용할 핵심 내용 (있다면 원문 인용, 없으면 빈 문자열)",
+  "tailored": "이 기업/역할에 맞게 조정하는 방향과 포인트 (구체적)",
+  "gap": "부족한 부분 또는 추가로 작성해야 할 내용 (없으면 빈 문자열)"
+}
+
+JSON 객체만 출력하고, 다른 텍스트는 포함하지 마세요."""
+
 
 class WriterAgent(BaseAgent):
     """기존 자소서 + 분석 결과 → 항목별 소스 배분, gap task 저장"""
 
-    def __init__(self):
+    SECTION_WORKERS = 4   # 항목별 모드 동시 요청 상한 (배치 모드에서도 에이전트 전체 기준)
+    SECTION_RETRIES = 2   # 항목별 모드 실패/파싱 오류 시 재시도 횟수
+
+    def __init__(self, per_section: bool = False):
+        self.per_section = per_section
         super().__init__("WriterAgent")
 
     def _setup_client(self):
         self.client = anthropic.Anthropic(api_key=API_CONFIG.anthropic_key)
+        self._slots = threading.BoundedSemaphore(self.SECTION_WORKERS)
+
+    def close(self) -> None:
+        self.client.close()
 
     def run(self, context: JobContext) -> CoverLetterResult:
         self.log_progress(f"자소서 매핑 시작: {context.company} / {context.role}")
@@ -48,7 +84,21 @@ class WriterAgent(BaseAgent):
         if not analysis:
             raise ValueError("Analysis가 없습니다. AnalyzerAgent를 먼저 실행하세요.")
 
-        if not context.cover_letters_raw:
+        index = context.cover_letter_index
+        os.makedirs(TASKS_PENDING_DIR, exist_ok=True)
+
+        if index is not None and len(index):
+            retrieved = self._retrieve(index, analysis)
+            cl_files = sorted({p.file for passages in retrieved.values() for p in passages})
+            self.log_progress(
+                f"관련 문단 검색: {len(analysis.cover_letter_sections)}개 항목, "
+                f"{sum(len(p) for p in retrieved.values())}개 문단 ({len(cl_files)}개 파일)"
+            )
+            if self.per_section and retrieved:
+                sections = self._map_sections_parallel(context, analysis, retrieved)
+                return self._finish(context, sections, cl_files)
+            cover_letters_text = self._format_passages(retrieved)
+        elif not context.cover_letters_raw:
             self.log_error("자소서 파일이 없습니다. data/cover_letters/ 에 .md 또는 .txt 파일을 추가하세요.")
             cover_letters_text = "(자소서 없음)"
             cl_files = []
@@ -57,31 +107,33 @@ class WriterAgent(BaseAgent):
             cl_files = list(context.cover_letters_raw.keys())
 
         sections_data = self._map_sections(analysis, cover_letters_text)
-        sections = []
+        sections = [self._to_section(context, analysis, item) for item in sections_data]
+        return self._finish(context, sections, cl_files)
 
-        os.makedirs(TASKS_PENDING_DIR, exist_ok=True)
-
-        for item in sections_data:
-            task_file = None
-            if item.get("gap"):
-                task_file = self._save_task(context, analysis, item)
-
-            sections.append(
-                CoverLetterSection(
-                    title=item.get("title", ""),
-                    source=item.get("source", ""),
-                    tailored=item.get("tailored", ""),
-                    gap=item.get("gap", ""),
-                    task_file=task_file,
-                )
-            )
+    def _to_section(self, context: JobContext, analysis: Analysis, item: dict) -> CoverLetterSection:
+        """매핑 결과 1개 → CoverLetterSection (gap이 있으면 task 파일 저장)"""
+        task_file = None
+        if item.get("gap"):
+            task_file = self._save_task(context, analysis, item)
+        return CoverLetterSection(
+            title=item.get("title", ""),
+            source=item.get("source", ""),
+            tailored=item.get("tailored", ""),
+            gap=item.get("gap", ""),
+            task_file=task_file,
+        )
 
+    def _finish(
+        self, context: JobContext, sections: List[CoverLetterSection], cl_files: List[str]
+    ) -> CoverLetterResult:
+        """섹션 목록 → CoverLetterResult (context 기록 + 완료 메시지)"""
         result = CoverLetterResult(
             company=context.company,
             role=context.role,
             sections=sections,
             cover_letters_used=cl_files,
         )
+        context.cover_letter_result = result
 
         context.add_message(
             sender="WriterAgent",
@@ -102,9 +154,40 @@ class WriterAgent(BaseAgent):
             parts.append(f"=== {filename} ===\n{content}")
         return "\n\n".join(parts)
 
-    def _map_sections(self, analysis: Analysis, cover_letters_text: str) -> list:
+    def _retrieve(self, index: CoverLetterIndex, analysis: Analysis) -> Dict[str, List[Passage]]:
+        """자소서 항목 → 관련 문단 top-k (질의: 항목명 + 강조 키워드 + 핵심 역량)"""
+        hints = " ".join(analysis.keywords + analysis.key_competencies)
+        return {
+            section: index.search(f"{section} {hints}", k=TOP_K)
+            for section in analysis.cover_letter_sections
+        }
+
+    def _format_passages(self, retrieved: Dict[str, List[Passage]]) -> str:
+        """
+        항목별 검색 문단 → 프롬프트 텍스트.
+        여러 항목에 걸린 문단은 처음 한 번만 본문 포함, 문단마다 COVER_LETTER_CHARS를 균등 배분
+        """
+        unique = {(p.file, p.text) for passages in retrieved.values() for p in passages}
+        per_passage = COVER_LETTER_CHARS // max(1, len(unique))
+        parts = []
+        seen = {}
+        for section, passages in retrieved.items():
+            lines = [f"### [{section}] 관련 문단"]
+            if not passages:
+                lines.append("(관련 문단 없음)")
+            for p in passages:
+                key = (p.file, p.text)
+                if key in seen:
+                    lines.append(f"- (위 {seen[key]} 참고) {p.label()}")
+                    continue
+                seen[key] = f"문단 {len(seen) + 1}"
+                lines.append(f"- {seen[key]} — {p.label()}\n{p.text[:per_passage]}")
+            parts.append("\n".join(lines))
+        return "\n\n".join(parts)
+
+    def _posting_brief(self, analysis: Analysis) -> str:
         posting = analysis.posting
-        user_prompt = f"""
+        return f"""
 ## 채용공고 분석 결과
 - 회사: {posting.company}
 - 직무: {posting.role}
@@ -116,33 +199,88 @@ class WriterAgent(BaseAgent):
 - 핵심 역량: {', '.join(analysis.key_competencies)}
 - 강조 키워드: {', '.join(analysis.keywords)}
 - 조직문화: {analysis.culture_fit}
-
-## 자소서 항목 목록
-{chr(10).join(f'- {s}' for s in analysis.cover_letter_sections)}
-
-## 기존 자소서 내용
-{cover_letters_text[:6000]}
-
-위 정보를 바탕으로 각 자소서 항목에 대한 소스 배분 전략을 JSON으로 작성하세요.
 """
+
+    def _complete(self, system: str, user_prompt: str, max_tokens: int) -> str:
         message = self.client.messages.create(
             model=MODELS["anthropic"],
-            max_tokens=4096,
-            system=SYSTEM_PROMPT,
+            max_tokens=max_tokens,
+            system=system,
             messages=[{"role": "user", "content": user_prompt}],
         )
-
         raw_output = message.content[0].text.strip()
         if raw_output.startswith("```"):
             lines = raw_output.split("\n")
             raw_output = "\n".join(lines[1:-1])
+        return raw_output
+
+    def _map_sections(self, analysis: Analysis, cover_letters_text: str) -> list:
+        user_prompt = f"""{self._posting_brief(analysis)}
+## 자소서 항목 목록
+{chr(10).join(f'- {s}' for s in analysis.cover_letter_sections)}
 
+## 기존 자소서 내용
+{cover_letters_text[:COVER_LETTER_CHARS]}
+
+위 정보를 바탕으로 각 자소서 항목에 대한 소스 배분 전략을 JSON으로 작성하세요.
+"""
+        raw_output = self._complete(SYSTEM_PROMPT, user_prompt, max_tokens=4096)
         try:
             return json.loads(raw_output)
         except json.JSONDecodeError as e:
             self.log_error(f"JSON 파싱 실패: {e}")
             return []
 
+    def _map_section(self, analysis: Analysis, section: str, passages: List[Passage]) -> dict:
+        """항목 1개 매핑 (그 항목의 검색 문단만 사용). 호출 실패·JSON 오류는 예외"""
+        user_prompt = f"""{self._posting_brief(analysis)}
+## 자소서 항목
+- {section}
+
+## 기존 자소서 관련 문단
+{self._format_passages({section: passages})}
+
+위 정보를 바탕으로 이 자소서 항목의 소스 배분 전략을 JSON으로 작성하세요.
+"""
+        with self._slots:
+            raw_output = self._complete(SECTION_SYSTEM_PROMPT, user_prompt, max_tokens=1024)
+        item = json.loads(raw_output)
+        if isinstance(item, list):  # 배열로 감싸 돌려준 경우
+            item = item[0] if item else {}
+        if not isinstance(item, dict):
+            raise ValueError(f"JSON 객체가 아님: {type(item).__name__}")
+        item["title"] = item.get("title") or section
+        return item
+
+    def _map_sections_parallel(
+        self,
+        context: JobContext,
+        analysis: Analysis,
+        retrieved: Dict[str, List[Passage]],
+    ) -> List[CoverLetterSection]:
+        """항목별 독립 요청을 동시 실행 → cover_letter_sections 순서로 병합 (실패 항목은 제외하고 errors에 기록)"""
+        self.log_progress(f"항목별 매핑: {len(retrieved)}개 항목 동시 요청")
+
+        def _one(section: str) -> Optional[CoverLetterSection]:
+            for attempt in range(self.SECTION_RETRIES + 1):
+                try:
+                    item = self._map_section(analysis, section, retrieved[section])
+                    break
+                except Exception as e:
+                    if attempt < self.SECTION_RETRIES:
+                        self.log_progress(f"  재시도 {attempt + 1}/{self.SECTION_RETRIES}: {section} — {e}")
+                        time.sleep(1.5 * (attempt + 1))
+                        continue
+                    self.log_error(f"항목 매핑 실패: {section} — {e}")
+                    context.errors.append(f"WriterAgent 항목 매핑 실패: {section} — {e}")
+                    return None
+            # 끝난 항목은 다른 항목을 기다리지 않고 바로 gap task 저장
+            return self._to_section(context, analysis, item)
+
+        with ThreadPoolExecutor(max_workers=self.SECTION_WORKERS) as executor:
+            mapped = list(executor.map(_one, retrieved))
+        return [section for section in mapped if section is not None]
+
     def _save_task(self, context: JobContext, analysis: Analysis, section: dict) -> str:
         """gap이 있는 항목을 tasks/pending/에 JSON task 파일로 저장"""
         task_id = str(uuid.uuid4())[:8]
@@ -61,5 +61,19 @@ COVER_LETTERS_DIR = os.path.join(DATA_DIR, "cover_letters")
 OUTPUTS_DIR = os.path.join(DATA_DIR, "outputs")
 TASKS_PENDING_DIR = os.path.join(DATA_DIR, "tasks", "pending")
 TASKS_DONE_DIR = os.path.join(DATA_DIR, "tasks", "done")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+ANALYSES_DIR = os.path.join(DATA_DIR, "analyses")  # AnalyzerAgent 분석 저장소 (eco_system_v2 연동)
+
+# 수집 캐시 유효기간 (일) — 회사 정보는 천천히, 채용공고는 빨리 바뀐다
+RESEARCH_TTL_DAYS = {
+    "JD":      3,
+    "COMPANY": 21,
+    "INSIDER": 14,
+    "SUCCESS": 14,
+}
+
+# 노트북 업로드 (--notebook-transport http) — HttpTransport 프로토콜을 구현한 업로드 엔드포인트
+NOTEBOOK_API_URL = os.getenv("NOTEBOOK_API_URL", "")
+NOTEBOOK_API_TOKEN = os.getenv("NOTEBOOK_API_TOKEN")
 
 API_CONFIG = APIConfig.from_env()
@@ -0,0 +1,63 @@
+"""
+Job Assistant — 분석 결과 저장소
+AnalyzerAgent의 구조화 분석을 채용공고 원문 해시로 보관 → 원문이 같으면 Claude 호출 없이 재사용.
+
+키: content_hash(모델, 시스템 프롬프트, 회사, 직무, 분석 입력 원문) — 프롬프트나 원문이 바뀌면 새 키
+파일: {directory}/{회사}_{직무}_{key[:12]}_analysis.json (원자적 쓰기)
+  - eco_system_v2 profile_loader가 그대로 읽는 평면 JSON (company, role, key_competencies, ...)
+  - 공고 필드(jd, requirements, preferred) + content_hash, analyzed_at, model 추가
+  - 같은 공고를 다시 돌리면 같은 파일 → 날짜별 파일이 쌓이지 않음
+적중 시 파일 mtime 갱신 → 디렉토리에서 가장 최근 파일 = 가장 최근에 쓰인 분석
+(eco_system_v2 `--load-profile 디렉토리`가 이 기준으로 고른다)
+"""
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+from config import ANALYSES_DIR
+from core.cache import safe_dirname
+
+
+class AnalysisStore:
+    """해시 키 → 분석 JSON 파일"""
+
+    def __init__(self, directory: str = ANALYSES_DIR):
+        self.directory = directory
+
+    def _prefix(self, company: str, role: str) -> str:
+        return f"{safe_dirname(company)}_{safe_dirname(role)}_"
+
+    def path(self, company: str, role: str, key: str) -> str:
+        return os.path.join(self.directory, f"{self._prefix(company, role)}{key[:12]}_analysis.json")
+
+    def get(self, company: str, role: str, key: str) -> Optional[dict]:
+        path = self.path(company, role, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if record.get("content_hash") != key:
+            return None
+        os.utime(path)
+        return record
+
+    def put(self, company: str, role: str, key: str, record: dict, model: str = "") -> str:
+        """record(분석 필드) + 메타데이터 저장 → 파일 경로"""
+        record = {
+            "company": company,
+            "role": role,
+            **record,
+            "content_hash": key,
+            "analyzed_at": datetime.now().isoformat(),
+            "model": model,
+        }
+        path = self.path(company, role, key)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
@@ -0,0 +1,106 @@
+"""
+Job Assistant — 콘텐츠 해시 캐시
+같은 입력이면 같은 출력을 쓰는 작업(청크 요약 등)의 결과를 파일로 보관.
+
+키: content_hash(모델, 프롬프트, 본문 ...) — 입력이 한 글자라도 바뀌면 다른 키
+저장: {directory}/{key[:2]}/{key}.txt (원자적 쓰기, 스레드 동시 접근 안전)
+유효기간: get(key, max_age_sec) — 파일 수정 시각 기준, 지나면 미스
+get_or_compute(): 같은 키를 여러 스레드가 동시에 요청하면 계산은 1번만 (배치 모드 중복 호출 방지)
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+
+def content_hash(*parts: str) -> str:
+    """입력 조각들의 sha256 (조각 경계 구분 포함)"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def safe_dirname(name: str) -> str:
+    """회사명 등을 디렉토리 이름으로 (경로 구분자·공백 치환)"""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", name.strip()) or "_"
+
+
+class ContentCache:
+    """해시 키 → 텍스트 파일 캐시"""
+
+    # 진행 중인 계산 (경로 → Future) — 같은 디렉토리를 가리키는 인스턴스끼리 공유
+    _inflight: Dict[str, Future] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key: str, max_age_sec: Optional[float] = None) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if max_age_sec is not None and time.time() - os.path.getmtime(path) > max_age_sec:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp, path)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], str],
+        max_age_sec: Optional[float] = None,
+        refresh: bool = False,
+    ) -> str:
+        """
+        캐시 적중 → 반환. 미스 → compute() 결과 저장 후 반환.
+        같은 키를 이미 다른 스레드가 계산 중이면 그 결과를 기다린다.
+        refresh=True → 캐시를 읽지 않고 다시 계산 (결과는 덮어씀)
+        """
+        if not refresh:
+            cached = self.get(key, max_age_sec=max_age_sec)
+            if cached is not None:
+                return cached
+
+        slot = self._path(key)
+        with ContentCache._lock:
+            future = ContentCache._inflight.get(slot)
+            owner = future is None
+            if owner and not refresh:
+                # 위 확인 이후 다른 스레드가 계산을 끝내고 _inflight에서 뺐을 수 있음 → 잠금 안에서 다시 확인
+                cached = self.get(key, max_age_sec=max_age_sec)
+                if cached is not None:
+                    return cached
+            if owner:
+                future = ContentCache._inflight[slot] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with ContentCache._lock:
+                ContentCache._inflight.pop(slot, None)
@@ -0,0 +1,226 @@
+"""
+Job Assistant — 자소서 코퍼스 검색 인덱스
+data/cover_letters/ 의 자소서를 문단 단위로 쪼개 BM25로 색인하고,
+자소서 항목별로 관련 문단 top-k만 뽑아 WriterAgent 프롬프트에 넣는다.
+
+  - 청크: 빈 줄 기준 문단. 짧은 줄(제목·표 머리 등)은 다음 문단에 붙임, 긴 문단은 문장 경계로 분할
+  - 토큰: 영문/숫자 단어 + 한글은 음절 바이그램 (조사가 붙어도 어간이 맞도록)
+  - 저장: {CACHE_DIR}/cover_letter_index/{디렉토리 해시}.json
+  - 갱신: refresh() — 파일별 (mtime, size)가 바뀐 파일만 다시 읽고 청크/토큰 재계산, 삭제된 파일은 제거
+  - 검색: search(query, k) — BM25 (k1=1.5, b=0.75), 통계(df, 평균 길이)는 로드 시 1회 계산
+
+refresh() 이후에는 읽기 전용이라 배치 모드에서 여러 스레드가 공유해도 안전.
+"""
+import json
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import CACHE_DIR
+from core.cache import content_hash
+
+INDEX_VERSION = 1
+EXTENSIONS = (".md", ".txt")
+
+MIN_CHUNK_CHARS = 80      # 이보다 짧은 문단은 다음 문단과 합침
+MAX_CHUNK_CHARS = 1200    # 이보다 긴 문단은 문장 경계로 분할
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*|[가-힣]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?。])\s+")
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+
+
+@dataclass
+class Passage:
+    """검색 결과 문단 1개"""
+    file: str
+    heading: str
+    text: str
+    score: float = 0.0
+
+    def label(self) -> str:
+        return f"{self.file} · {self.heading}" if self.heading else self.file
+
+
+def tokenize(text: str) -> List[str]:
+    """영문/숫자 단어는 그대로, 한글 어절은 음절 바이그램으로 (1음절 어절은 그대로)"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+
+def chunk_document(text: str) -> List[Dict[str, str]]:
+    """문서 → [{"heading", "text"}] 문단 청크 (가장 가까운 마크다운 제목 유지)"""
+    chunks: List[Dict[str, str]] = []
+    heading = ""
+    pending = ""
+
+    def _emit(body: str) -> None:
+        body = body.strip()
+        if not body:
+            return
+        if len(body) <= MAX_CHUNK_CHARS:
+            chunks.append({"heading": heading, "text": body})
+            return
+        piece = ""
+        for sentence in _SENTENCE_RE.split(body):
+            if piece and len(piece) + len(sentence) + 1 > MAX_CHUNK_CHARS:
+                chunks.append({"heading": heading, "text": piece.strip()})
+                piece = ""
+            piece += sentence + " "
+        if piece.strip():
+            chunks.append({"heading": heading, "text": piece.strip()})
+
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block or set(block) <= set("-=*_ "):
+            continue
+        match = _HEADING_RE.match(block)
+        if match and "\n" not in block:
+            _emit(pending)
+            pending = ""
+            heading = match.group(1).strip()
+            continue
+        pending = f"{pending}\n{block}" if pending else block
+        if len(pending) >= MIN_CHUNK_CHARS:
+            _emit(pending)
+            pending = ""
+    _emit(pending)
+    return chunks
+
+
+class CoverLetterIndex:
+    """자소서 디렉토리 → 문단 BM25 인덱스 (파일 mtime 기준 증분 갱신)"""
+
+    def __init__(self, directory: str, index_dir: Optional[str] = None):
+        self.directory = directory
+        index_dir = index_dir or os.path.join(CACHE_DIR, "cover_letter_index")
+        key = content_hash(os.path.abspath(directory))[:16]
+        self.path = os.path.join(index_dir, f"{key}.json")
+        # 파일명 → {"mtime", "size", "chunks": [{"heading", "text", "tf": {토큰: 빈도}, "len"}]}
+        self._files: Dict[str, dict] = {}
+        self._df: Counter = Counter()
+        self._avg_len = 0.0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def files(self) -> List[str]:
+        return sorted(self._files)
+
+    # ── 갱신 ─────────────────────────────────────────────
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self._files = data.get("files", {})
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "directory": os.path.abspath(self.directory),
+                 "files": self._files},
+                f, ensure_ascii=False,
+            )
+        os.replace(tmp, self.path)
+
+    def refresh(self) -> List[str]:
+        """디렉토리와 저장된 인덱스를 비교해 바뀐 파일만 재색인 → 재색인한 파일명 목록"""
+        self._load()
+        dir_path = Path(self.directory)
+        present = {}
+        if dir_path.exists():
+            for filepath in sorted(dir_path.iterdir()):
+                if filepath.suffix in EXTENSIONS and filepath.is_file():
+                    stat = filepath.stat()
+                    present[filepath.name] = (filepath, stat.st_mtime, stat.st_size)
+
+        changed = []
+        for name, (filepath, mtime, size) in present.items():
+            entry = self._files.get(name)
+            if entry and entry["mtime"] == mtime and entry["size"] == size:
+                continue
+            try:
+                content = filepath.read_text(encoding="utf-8")
+            except Exception as e:
+                print(f"  자소서 로드 실패: {name} — {e}")
+                self._files.pop(name, None)
+                continue
+            chunks = []
+            for chunk in chunk_document(content):
+                tokens = tokenize(f"{chunk['heading']} {chunk['text']}")
+                chunks.append({**chunk, "tf": dict(Counter(tokens)), "len": len(tokens)})
+            self._files[name] = {"mtime": mtime, "size": size, "chunks": chunks}
+            changed.append(name)
+
+        removed = [name for name in self._files if name not in present]
+        for name in removed:
+            del self._files[name]
+
+        if changed or removed:
+            self._save()
+        self._build_stats()
+        return changed
+
+    def _build_stats(self) -> None:
+        self._df = Counter()
+        total = 0
+        self._size = 0
+        for entry in self._files.values():
+            for chunk in entry["chunks"]:
+                self._df.update(chunk["tf"].keys())
+                total += chunk["len"]
+                self._size += 1
+        self._avg_len = total / self._size if self._size else 0.0
+
+    # ── 검색 ─────────────────────────────────────────────
+
+    def search(self, query: str, k: int = 3) -> List[Passage]:
+        """BM25 상위 k개 문단 (점수 0인 문단 제외, 동점은 파일·문단 순서)"""
+        terms = set(tokenize(query))
+        if not terms or not self._size:
+            return []
+
+        idf = {
+            t: math.log(1 + (self._size - self._df[t] + 0.5) / (self._df[t] + 0.5))
+            for t in terms if self._df.get(t)
+        }
+        scored = []
+        for name in sorted(self._files):
+            for chunk in self._files[name]["chunks"]:
+                tf = chunk["tf"]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * chunk["len"] / (self._avg_len or 1))
+                score = sum(
+                    weight * tf[t] * (BM25_K1 + 1) / (tf[t] + norm)
+                    for t, weight in idf.items() if t in tf
+                )
+                if score > 0:
+                    scored.append((score, name, chunk))
+
+        scored.sort(key=lambda item: -item[0])
+        return [
+            Passage(file=name, heading=chunk["heading"], text=chunk["text"], score=round(score, 3))
+            for score, name, chunk in scored[:k]
+        ]
@@ -60,7 +60,9 @@ class JobContext:
     collected_content: Optional[Any] = None # CollectedContent (CollectorAgent)
     summarized_sources: Optional[Any] = None# List[SummarizedSource] (SummarizerAgent)
     notebook_result: Optional[Any] = None   # NotebookResult (NotebookPublisher)
+    cover_letter_result: Optional[Any] = None  # CoverLetterResult (WriterAgent)
     cover_letters_raw: Dict[str, str] = field(default_factory=dict)
+    cover_letter_index: Optional[Any] = None   # CoverLetterIndex (자소서 문단 검색)
     errors: List[str] = field(default_factory=list)
     messages: List[Message] = field(default_factory=list)
 
@@ -83,6 +85,11 @@ class JobContext:
             f"Search done: {self.search_result is not None}\n"
             f"Posting parsed: {self.job_posting is not None}\n"
             f"Analysis done: {self.analysis is not None}\n"
-            f"Cover letters loaded: {list(self.cover_letters_raw.keys())}\n"
+            f"Cover letters loaded: {self._cover_letter_files()}\n"
             f"Errors: {len(self.errors)}"
         )
+
+    def _cover_letter_files(self) -> List[str]:
+        if self.cover_letter_index is not None:
+            return self.cover_letter_index.files()
+        return list(self.cover_letters_raw.keys())
@@ -0,0 +1,192 @@
+"""
+Job Assistant — 노트북 업로드 전송 계층
+NotebookPublisher가 소스를 올리는 대상을 교체 가능하게 분리.
+
+  - NotebookTransport: create_notebook / add_source / delete_source 3개 연산
+  - HttpTransport: 위 연산을 JSON REST로 호출 (NOTEBOOK_API_URL — 업로드 브리지/사내 프록시 등)
+      POST   {base}/notebooks                       {"title"}            → {"id"}
+      POST   {base}/notebooks/{id}/sources          {"title", "content"} → {"id"}
+      DELETE {base}/notebooks/{id}/sources/{sid}
+  - StubServer: 같은 프로토콜의 로컬 인메모리 서버 (테스트·리허설용, 표준 라이브러리만 사용)
+
+get_transport("none" | "http" | "stub") → 전송 객체 (none → None: 파일 저장 + 업로드 가이드만)
+전송 객체는 다 쓰면 close() (또는 with 블록) — HTTP 연결 정리, stub은 로컬 서버 종료까지.
+"""
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import httpx
+
+from config import NOTEBOOK_API_TOKEN, NOTEBOOK_API_URL
+
+TRANSPORTS = ("none", "http", "stub")
+
+
+class NotebookTransport(ABC):
+    """노트북 업로드 대상"""
+
+    name = "base"
+    endpoint = ""   # 매니페스트에 기록 — 엔드포인트가 바뀌면 notebook_id를 재사용하지 않음
+
+    @abstractmethod
+    def create_notebook(self, title: str) -> str:
+        """노트북 생성 → notebook_id"""
+
+    @abstractmethod
+    def add_source(self, notebook_id: str, title: str, content: str) -> str:
+        """소스 추가 → source_id"""
+
+    @abstractmethod
+    def delete_source(self, notebook_id: str, source_id: str) -> None:
+        """소스 삭제 (없으면 무시)"""
+
+    def close(self) -> None:
+        """연결·리소스 정리"""
+
+    def __enter__(self) -> "NotebookTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HttpTransport(NotebookTransport):
+    """JSON REST 업로드 (공유 httpx.Client — 동시 업로드 시 연결 재사용)"""
+
+    name = "http"
+
+    def __init__(self, base_url: str, token: Optional[str] = None, max_connections: int = 8):
+        if not base_url:
+            raise ValueError("NOTEBOOK_API_URL이 비어 있습니다. export NOTEBOOK_API_URL=...")
+        self.endpoint = base_url.rstrip("/")
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._http = httpx.Client(
+            base_url=self.endpoint,
+            headers=headers,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def create_notebook(self, title: str) -> str:
+        response = self._http.post("/notebooks", json={"title": title})
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def add_source(self, notebook_id: str, title: str, content: str) -> str:
+        response = self._http.post(
+            f"/notebooks/{notebook_id}/sources",
+            json={"title": title, "content": content},
+        )
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def delete_source(self, notebook_id: str, source_id: str) -> None:
+        response = self._http.delete(f"/notebooks/{notebook_id}/sources/{source_id}")
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def close(self) -> None:
+        self._http.close()
+
+
+class StubTransport(HttpTransport):
+    """StubServer를 띄워 붙는 HttpTransport — close()가 서버도 종료"""
+
+    name = "stub"
+
+    def __init__(self, server: Optional["StubServer"] = None):
+        self.server = server or StubServer().start()
+        super().__init__(self.server.url)
+
+    def close(self) -> None:
+        super().close()
+        self.server.stop()
+
+
+class StubServer:
+    """
+    HttpTransport 프로토콜의 로컬 인메모리 서버.
+    notebooks: {notebook_id: {"title", "sources": {source_id: {"title", "content"}}}}
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.notebooks: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # 요청 로그 생략
+                pass
+
+            def _reply(self, status: int, body: Optional[dict] = None) -> None:
+                data = json.dumps(body or {}, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                parts = self.path.strip("/").split("/")
+                with stub._lock:
+                    if parts == ["notebooks"]:
+                        notebook_id = f"nb_{uuid.uuid4().hex[:10]}"
+                        stub.notebooks[notebook_id] = {"title": body.get("title", ""), "sources": {}}
+                        return self._reply(201, {"id": notebook_id})
+                    if len(parts) == 3 and parts[0] == "notebooks" and parts[2] == "sources":
+                        notebook = stub.notebooks.get(parts[1])
+                        if notebook is None:
+                            return self._reply(404, {"error": "notebook not found"})
+                        source_id = f"src_{uuid.uuid4().hex[:10]}"
+                        notebook["sources"][source_id] = {
+                            "title": body.get("title", ""),
+                            "content": body.get("content", ""),
+                        }
+                        return self._reply(201, {"id": source_id})
+                self._reply(404, {"error": "not found"})
+
+            def do_DELETE(self):
+                parts = self.path.strip("/").split("/")
+                with stub._lock:
+                    if len(parts) == 4 and parts[0] == "notebooks" and parts[2] == "sources":
+                        notebook = stub.notebooks.get(parts[1], {"sources": {}})
+                        if notebook["sources"].pop(parts[3], None) is not None:
+                            return self._reply(200)
+                self._reply(404, {"error": "not found"})
+
+        return Handler
+
+
+def get_transport(name: str) -> Optional[NotebookTransport]:
+    """--notebook-transport 값 → 전송 객체 (stub은 로컬 서버를 띄워 연결)"""
+    if name == "none":
+        return None
+    if name == "http":
+        return HttpTransport(NOTEBOOK_API_URL, token=NOTEBOOK_API_TOKEN)
+    if name == "stub":
+        return StubTransport()
+    raise ValueError(f"알 수 없는 전송: {name} (가능: {', '.join(TRANSPORTS)})")
@@ -0,0 +1,100 @@
+"""
+Job Assistant — 스테이지 그래프 실행기
+각 단계가 JobContext에서 읽는 필드(inputs)와 채우는 필드(outputs)를 선언하면
+의존 관계를 계산해 서로 독립인 단계는 동시에 실행한다.
+
+  - 단계 본문(동기 에이전트 run)은 asyncio.to_thread로 실행
+  - io_only 단계(파일 저장 등)는 백그라운드 writer 스레드 1개에서 순서대로 처리 — 다른 단계를 막지 않음
+  - 입력이 비어 있으면(앞 단계 미선택/빈 결과) 건너뜀, 앞 단계가 예외로 끝났으면 조용히 건너뜀
+  - 모든 단계가 끝난 뒤 첫 번째 예외(선언 순서 기준)를 다시 던진다
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.message_bus import JobContext
+
+
+@dataclass
+class Stage:
+    """파이프라인 단계 1개"""
+    name: str
+    label: str                              # 진행 로그 표시 이름
+    run: Callable[[JobContext], Any]
+    inputs: Tuple[str, ...] = ()            # 읽는 JobContext 필드
+    outputs: Tuple[str, ...] = ()           # 채우는 JobContext 필드
+    any_input: bool = False                 # True → inputs 중 하나만 채워져 있어도 실행
+    io_only: bool = False                   # True → 백그라운드 writer에서 실행
+    skip_note: str = ""                     # 입력 없어 건너뛸 때 출력할 문구 (없으면 조용히)
+    counted: bool = True                    # 진행 표시 [i/total]에 포함
+
+    def ready(self, context: JobContext) -> bool:
+        if not self.inputs:
+            return True
+        present = [bool(getattr(context, f, None)) for f in self.inputs]
+        return any(present) if self.any_input else all(present)
+
+
+def dependencies(stages: List[Stage]) -> Dict[str, set]:
+    """단계 이름 → 선행 단계 이름 집합 (inputs를 outputs로 내는 단계)"""
+    producers: Dict[str, str] = {}
+    for stage in stages:
+        for out in stage.outputs:
+            producers.setdefault(out, stage.name)
+    return {
+        stage.name: {
+            producers[f] for f in stage.inputs
+            if f in producers and producers[f] != stage.name
+        }
+        for stage in stages
+    }
+
+
+async def run_stages(
+    context: JobContext,
+    stages: List[Stage],
+    prefix: str = "",
+) -> Dict[str, Any]:
+    """stages 실행 → {단계 이름: 반환값} (건너뛴 단계는 없음)"""
+    deps = dependencies(stages)
+    loop = asyncio.get_running_loop()
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-writer")
+    tasks: Dict[str, asyncio.Task] = {}
+    results: Dict[str, Any] = {}
+    total = sum(1 for s in stages if s.counted)
+    started = [0]
+
+    async def _run(stage: Stage) -> Any:
+        upstream = [tasks[name] for name in deps[stage.name]]
+        if upstream:
+            await asyncio.gather(*upstream, return_exceptions=True)
+            if any(t.exception() for t in upstream):
+                return None
+        if not stage.ready(context):
+            if stage.skip_note:
+                print(f"\n{prefix}[{stage.name}] {stage.label} — {stage.skip_note}")
+            return None
+
+        if stage.counted:
+            started[0] += 1
+            print(f"\n{prefix}[{started[0]}/{total}] {stage.label}")
+        if stage.io_only:
+            value = await loop.run_in_executor(writer, stage.run, context)
+        else:
+            value = await asyncio.to_thread(stage.run, context)
+        results[stage.name] = value
+        return value
+
+    try:
+        # 모든 태스크를 먼저 등록한 뒤 실행되므로 _run 안에서 tasks 조회 가능
+        for stage in stages:
+            tasks[stage.name] = asyncio.create_task(_run(stage))
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        writer.shutdown(wait=True)
+
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return results
@@ -6,18 +6,32 @@ Usage:
   python main.py --company 카카오 --role "백엔드 엔지니어"
   python main.py --company 네이버 --role "데이터 분석가" --url https://...
   python main.py --company 에이브랩스 --role "Decision Scientist" --no-search
+  python main.py --batch targets.csv --concurrency 3
+
+배치 CSV 형식 (헤더 필수, url 열은 선택):
+  company,role,url
+  카카오,백엔드 엔지니어,
+  네이버,데이터 분석가,https://...
 """
 import argparse
+import asyncio
+import csv
 import json
 import os
 import sys
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
 
 # 프로젝트 루트를 sys.path에 추가
 sys.path.insert(0, os.path.dirname(__file__))
 
 from config import API_CONFIG, COVER_LETTERS_DIR, OUTPUTS_DIR
+from core.corpus_index import CoverLetterIndex
 from core.message_bus import JobContext
+from core.notebook_transport import TRANSPORTS, get_transport
+from core.pipeline import Stage, run_stages
 from agents.search_agent import SearchAgent
 from agents.analyzer_agent import AnalyzerAgent
 from agents.writer_agent import WriterAgent
@@ -25,10 +39,10 @@ from agents.collector_agent import CollectorAgent
 from agents.summarizer_agent import SummarizerAgent
 from agents.notebook_publisher import NotebookPublisher
 
-# 사용 가능한 파이프라인 단계
+# 사용 가능한 파이프라인 단계 (의존 관계는 build_stages()가 선언 → 독립 단계는 동시 실행)
 # collect  : CollectorAgent — 4카테고리 Perplexity 수집
 # summarize: SummarizerAgent — OpenAI/Gemini/Claude 요약
-# notebook : NotebookPublisher — 소스 파일 저장 + 업로드 가이드
+# notebook : NotebookPublisher — 소스 파일 저장 + 업로드 (--notebook-transport)
 # analyze  : AnalyzerAgent — Claude 구조화 분석
 # write    : WriterAgent — 자소서 초안
 ALL_STEPS = ["collect", "summarize", "notebook", "analyze", "write"]
@@ -42,23 +56,16 @@ logging.basicConfig(
 )
 
 
-def load_cover_letters(directory: str) -> dict:
-    """data/cover_letters/ 에서 .md, .txt 파일 로드"""
-    cover_letters = {}
-    dir_path = Path(directory)
-    if not dir_path.exists():
-        return cover_letters
-
-    for ext in ("*.md", "*.txt"):
-        for filepath in dir_path.glob(ext):
-            try:
-                content = filepath.read_text(encoding="utf-8")
-                cover_letters[filepath.name] = content
-                print(f"  자소서 로드: {filepath.name} ({len(content)} chars)")
-            except Exception as e:
-                print(f"  자소서 로드 실패: {filepath.name} — {e}")
-
-    return cover_letters
+def load_cover_letters(directory: str) -> CoverLetterIndex:
+    """data/cover_letters/ 문단 인덱스 갱신 (mtime이 바뀐 .md, .txt만 다시 읽음)"""
+    index = CoverLetterIndex(directory)
+    changed = set(index.refresh())
+    for name in index.files():
+        note = "재색인" if name in changed else "캐시"
+        print(f"  자소서: {name} ({note})")
+    if index.files():
+        print(f"  문단 {len(index)}개 색인")
+    return index
 
 
 def print_result(result, verbose: bool = False):
@@ -90,33 +97,6 @@ def print_result(result, verbose: bool = False):
     print("\n" + "=" * 60)
 
 
-def save_analysis(analysis, output_dir: str) -> str:
-    """AnalyzerAgent 분석 결과를 JSON으로 저장 (eco_system_v2 연동용)"""
-    os.makedirs(output_dir, exist_ok=True)
-    from datetime import date
-    filename = f"{analysis.posting.company}_{analysis.posting.role}_{date.today()}_analysis.json"
-    filepath = os.path.join(output_dir, filename)
-
-    data = {
-        "company": analysis.posting.company,
-        "role": analysis.posting.role,
-        "vision": analysis.posting.vision,
-        "recent_work": analysis.posting.recent_work,
-        "key_competencies": analysis.key_competencies,
-        "technical_skills": analysis.technical_skills,
-        "soft_skills": analysis.soft_skills,
-        "culture_fit": analysis.culture_fit,
-        "keywords": analysis.keywords,
-        "cover_letter_sections": analysis.cover_letter_sections,
-    }
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    print(f"  분석 저장: {filepath}")
-    return filepath
-
-
 def save_result(result, output_dir: str):
     """결과를 JSON으로 저장"""
     os.makedirs(output_dir, exist_ok=True)
@@ -147,6 +127,243 @@ def save_result(result, output_dir: str):
     return filepath
 
 
+def build_agents(
+    refresh: bool = False,
+    per_section: bool = False,
+    reanalyze: bool = False,
+    notebook_transport: str = "none",
+) -> Dict[str, object]:
+    """
+    파이프라인 에이전트 1세트.
+    배치 모드에서는 모든 대상이 이 세트를 공유 — SDK/HTTP 클라이언트, 프로바이더별 동시 호출 상한,
+    수집·요약 캐시를 함께 쓴다.
+    """
+    return {
+        "collector": CollectorAgent(refresh=refresh),
+        "search": SearchAgent(),
+        "summarizer": SummarizerAgent(),
+        "notebook": NotebookPublisher(transport=get_transport(notebook_transport)),
+        "analyzer": AnalyzerAgent(reanalyze=reanalyze),
+        "writer": WriterAgent(per_section=per_section),
+    }
+
+
+def close_agents(agents: Dict[str, object]) -> None:
+    """build_agents() 세트 정리 — 에이전트별 HTTP/SDK 클라이언트와 업로드 서버 종료"""
+    for agent in agents.values():
+        agent.close()
+
+
+def _posting_from_collected(context: JobContext) -> None:
+    """collected_content → job_posting 변환 (collect 결과를 AnalyzerAgent 입력으로)"""
+    if context.collected_content and not context.job_posting:
+        from core.models import JobPosting
+        jd_raw = context.collected_content.raw.get("JD", "")
+        context.job_posting = JobPosting(
+            company=context.company,
+            role=context.role,
+            vision="",
+            jd=jd_raw,
+            requirements=[],
+            preferred=[],
+            recent_work="",
+            raw_search=jd_raw,
+        )
+
+
+def build_stages(
+    steps: set,
+    agents: Dict[str, object],
+    no_search: bool = False,
+    verbose: bool = False,
+    quiet: bool = False,
+) -> List[Stage]:
+    """
+    --steps 선택 → 스테이지 그래프.
+    analyze는 수집 결과만 읽으므로 summarize/notebook과 동시에 실행된다.
+    파일 저장(notebook — 업로드 없을 때, 결과 JSON)은 io_only → 백그라운드 writer.
+    """
+    stages: List[Stage] = []
+
+    # [collect] CollectorAgent — 4카테고리 수집
+    if "collect" in steps:
+        stages.append(Stage(
+            "collect", "CollectorAgent — 멀티카테고리 수집",
+            agents["collector"].run, outputs=("collected_content",),
+        ))
+    # 레거시 호환: collect 없이 search만 지정한 경우
+    elif not no_search and "analyze" in steps:
+        stages.append(Stage(
+            "search", "SearchAgent (레거시) — Perplexity 검색",
+            agents["search"].run, outputs=("job_posting",),
+        ))
+
+    # [summarize] SummarizerAgent — 멀티모델 요약
+    if "summarize" in steps:
+        stages.append(Stage(
+            "summarize", "SummarizerAgent — 멀티모델 요약",
+            agents["summarizer"].run,
+            inputs=("collected_content",), outputs=("summarized_sources",),
+        ))
+
+    # [notebook] NotebookPublisher — 소스 저장 + 업로드 (transport 없으면 업로드 가이드)
+    # 업로드가 있으면 네트워크 대기라 writer 스레드를 막지 않도록 일반 단계로 실행
+    if "notebook" in steps:
+        uploads = agents["notebook"].transport is not None
+        stages.append(Stage(
+            "notebook",
+            "NotebookPublisher — 소스 업로드" if uploads else "NotebookPublisher — 소스 파일 생성",
+            agents["notebook"].run,
+            inputs=("summarized_sources",), outputs=("notebook_result",), io_only=not uploads,
+        ))
+
+    # [analyze] AnalyzerAgent — 구조화 분석
+    if "analyze" in steps:
+        def _analyze(context: JobContext):
+            _posting_from_collected(context)
+            return agents["analyzer"].run(context)
+
+        stages.append(Stage(
+            "analyze", "AnalyzerAgent — Claude 분석", _analyze,
+            inputs=("job_posting", "collected_content"), outputs=("analysis",),
+            any_input=True, skip_note="JobPosting 없음, 건너뜀",
+        ))
+
+    # [write] WriterAgent — 자소서 초안
+    if "write" in steps:
+        def _write(context: JobContext):
+            result = agents["writer"].run(context)
+            if not quiet:
+                print_result(result, verbose=verbose)
+            return result
+
+        stages.append(Stage(
+            "write", "WriterAgent — 자소서 매핑", _write,
+            inputs=("analysis",), outputs=("cover_letter_result",),
+            skip_note="Analysis 없음, 건너뜀",
+        ))
+        stages.append(Stage(
+            "save_result", "결과 JSON 저장",
+            lambda context: save_result(context.cover_letter_result, OUTPUTS_DIR),
+            inputs=("cover_letter_result",), io_only=True, counted=False,
+        ))
+
+    return stages
+
+
+def run_pipeline(
+    context: JobContext,
+    steps: set,
+    agents: Dict[str, object],
+    no_search: bool = False,
+    verbose: bool = False,
+    quiet: bool = False,
+    prefix: str = "",
+):
+    """
+    선택된 단계를 스테이지 그래프로 실행 (core/pipeline.py). 자소서 결과(CoverLetterResult)가 있으면 반환.
+    quiet: 결과 상세 출력 생략 (배치 모드), prefix: 진행 로그 앞머리 (배치 모드 대상 구분)
+    """
+    stages = build_stages(steps, agents, no_search=no_search, verbose=verbose, quiet=quiet)
+    asyncio.run(run_stages(context, stages, prefix=prefix))
+    return context.cover_letter_result
+
+
+def load_targets(path: str) -> List[Dict[str, str]]:
+    """배치 CSV → [{company, role, url}] (빈 줄, company/role 없는 행은 건너뜀)"""
+    targets = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            company = (row.get("company") or "").strip()
+            role = (row.get("role") or "").strip()
+            if company and role:
+                targets.append({
+                    "company": company,
+                    "role": role,
+                    "url": (row.get("url") or "").strip(),
+                })
+    return targets
+
+
+def run_batch(
+    targets: List[Dict[str, str]],
+    steps: set,
+    cover_letters: CoverLetterIndex,
+    args,
+) -> List[dict]:
+    """
+    대상별 파이프라인을 최대 args.concurrency개 동시 실행.
+    대상마다 JobContext가 독립이라 한 대상의 실패/오류가 다른 대상에 번지지 않는다.
+    """
+    agents = build_agents(
+        refresh=args.refresh, per_section=args.per_section, reanalyze=args.reanalyze,
+        notebook_transport=args.notebook_transport,
+    )
+
+    def _one(target: Dict[str, str]) -> dict:
+        context = JobContext(
+            task_id=str(uuid.uuid4())[:8],
+            company=target["company"],
+            role=target["role"],
+            url=target["url"],
+            cover_letter_index=cover_letters,
+        )
+        started = time.time()
+        summary = {
+            "company": context.company,
+            "role": context.role,
+            "task_id": context.task_id,
+            "status": "ok",
+        }
+        try:
+            result = run_pipeline(
+                context, steps, agents,
+                no_search=args.no_search,
+                verbose=args.verbose,
+                quiet=True,
+                prefix=f"[{context.company}/{context.role}] ",
+            )
+            if result:
+                summary["sections"] = len(result.sections)
+                summary["gaps"] = len(result.pending_tasks())
+        except Exception as e:
+            summary["status"] = "failed"
+            summary["error"] = str(e)
+        summary["elapsed_sec"] = round(time.time() - started, 1)
+        summary["errors"] = list(context.errors)
+        summary["sources"] = len(context.summarized_sources or [])
+        return summary
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            return list(executor.map(_one, targets))
+    finally:
+        close_agents(agents)
+
+
+def print_batch_summary(results: List[dict], output_dir: str) -> str:
+    """배치 결과 표 출력 + batch_{timestamp}.json 저장"""
+    print("\n" + "=" * 60)
+    print(f"  배치 결과: {sum(r['status'] == 'ok' for r in results)}/{len(results)} 성공")
+    print("=" * 60)
+    for r in results:
+        mark = "OK  " if r["status"] == "ok" else "FAIL"
+        detail = (
+            f"항목 {r.get('sections', '-')} / gap {r.get('gaps', '-')} / 소스 {r['sources']}"
+            if r["status"] == "ok" else r.get("error", "")
+        )
+        warn = f" (경고 {len(r['errors'])}건)" if r["errors"] else ""
+        print(f"  {mark} {r['company']} / {r['role']} — {detail} [{r['elapsed_sec']}s]{warn}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n  배치 요약 저장: {filepath}")
+    print("=" * 60)
+    return filepath
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="job-assistant",
@@ -157,6 +374,8 @@ def main():
   python main.py --company 카카오 --role "백엔드 엔지니어"
   python main.py --company 네이버 --role "데이터 분석가" --url https://...
   python main.py --company 에이브랩스 --role "Decision Scientist" --no-search
+  python main.py --company 카카오 --role "백엔드 엔지니어" --refresh   # 수집 캐시 무시
+  python main.py --batch targets.csv --concurrency 3                  # 여러 대상 동시 처리
   python main.py --check-env
         """,
     )
@@ -184,6 +403,43 @@ def main():
         action="store_true",
         help="Perplexity 검색 건너뜀 (기존 raw_search 사용, 레거시)",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="수집 캐시를 무시하고 다시 수집 (결과는 캐시에 갱신)",
+    )
+    parser.add_argument(
+        "--notebook-transport",
+        choices=TRANSPORTS,
+        default="none",
+        help=(
+            "notebook 단계 업로드 대상 — none: 파일 + 업로드 가이드(기본), "
+            "http: NOTEBOOK_API_URL, stub: 로컬 스텁 서버 (리허설)"
+        ),
+    )
+    parser.add_argument(
+        "--reanalyze",
+        action="store_true",
+        help="분석 저장소를 무시하고 Claude로 다시 분석 (결과는 저장소에 갱신)",
+    )
+    parser.add_argument(
+        "--per-section",
+        action="store_true",
+        help="자소서 항목마다 관련 문단만 넣어 동시에 매핑 (항목별 재시도)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default="",
+        metavar="CSV",
+        help="대상 목록 CSV (company,role[,url]) — 여러 대상을 동시에 처리",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=3,
+        help="--batch 동시 처리 대상 수 (기본: 3)",
+    )
     parser.add_argument(
         "--check-env",
         action="store_true",
@@ -204,7 +460,7 @@ def main():
             print(f"  {name}: {mark}")
         sys.exit(0)
 
-    if not args.company or not args.role:
+    if not args.batch and (not args.company or not args.role):
         parser.print_help()
         sys.exit(1)
 
@@ -218,101 +474,51 @@ def main():
     # 자소서 로드
     print(f"\n자소서 로드 중: {args.cover_letters_dir}")
     cover_letters = load_cover_letters(args.cover_letters_dir)
-    if not cover_letters:
+    if not len(cover_letters):
         print("  (자소서 없음 — writer는 gap만 생성합니다)")
 
+    # 실행 단계 파싱
+    steps_input = args.steps.lower()
+    if steps_input == "all":
+        steps = set(ALL_STEPS)
+    else:
+        steps = set(s.strip() for s in steps_input.split(","))
+
+    # --batch: 대상별 독립 실행 + 통합 요약
+    if args.batch:
+        targets = load_targets(args.batch)
+        if not targets:
+            print(f"\nERROR: 대상 없음 — {args.batch}")
+            sys.exit(1)
+        print(f"\n배치 시작: {len(targets)}개 대상, 동시 {args.concurrency}개")
+        print(f"  실행 단계: {', '.join(s for s in ALL_STEPS if s in steps)}")
+        try:
+            results = run_batch(targets, steps, cover_letters, args)
+        except KeyboardInterrupt:
+            print("\n\n중단됨")
+            sys.exit(1)
+        print_batch_summary(results, OUTPUTS_DIR)
+        sys.exit(0 if all(r["status"] == "ok" for r in results) else 1)
+
     # 컨텍스트 초기화
     context = JobContext(
         task_id=str(uuid.uuid4())[:8],
         company=args.company,
         role=args.role,
         url=args.url,
-        cover_letters_raw=cover_letters,
+        cover_letter_index=cover_letters,
     )
 
     print(f"\n작업 시작 | task_id={context.task_id}")
     print(f"  대상: {args.company} / {args.role}")
-
-    # 실행 단계 파싱
-    steps_input = args.steps.lower()
-    if steps_input == "all":
-        steps = set(ALL_STEPS)
-    else:
-        steps = set(s.strip() for s in steps_input.split(","))
-
     print(f"  실행 단계: {', '.join(s for s in ALL_STEPS if s in steps)}")
 
-    # 파이프라인 실행
-    total = len([s for s in ALL_STEPS if s in steps])
-    current = 0
-
+    agents = build_agents(
+        refresh=args.refresh, per_section=args.per_section, reanalyze=args.reanalyze,
+        notebook_transport=args.notebook_transport,
+    )
     try:
-        # [collect] CollectorAgent — 4카테고리 수집
-        if "collect" in steps:
-            current += 1
-            print(f"\n[{current}/{total}] CollectorAgent — 멀티카테고리 수집")
-            collector = CollectorAgent()
-            collector.run(context)
-
-        # 레거시 호환: collect 없이 search만 지정한 경우
-        elif not args.no_search and "analyze" in steps:
-            current += 1
-            print(f"\n[{current}/{total}] SearchAgent (레거시) — Perplexity 검색")
-            search_agent = SearchAgent()
-            search_agent.run(context)
-
-        # [summarize] SummarizerAgent — 멀티모델 요약
-        if "summarize" in steps and context.collected_content:
-            current += 1
-            print(f"\n[{current}/{total}] SummarizerAgent — 멀티모델 요약")
-            summarizer = SummarizerAgent()
-            summarizer.run(context)
-
-        # [notebook] NotebookPublisher — 소스 저장 + 업로드 가이드
-        if "notebook" in steps and context.summarized_sources:
-            current += 1
-            print(f"\n[{current}/{total}] NotebookPublisher — 소스 파일 생성")
-            publisher = NotebookPublisher()
-            publisher.run(context)
-
-        # [analyze] AnalyzerAgent — 구조화 분석
-        if "analyze" in steps:
-            # collected_content → job_posting 변환 (collect 결과 활용)
-            if context.collected_content and not context.job_posting:
-                from core.models import JobPosting
-                jd_raw = context.collected_content.raw.get("JD", "")
-                context.job_posting = JobPosting(
-                    company=context.company,
-                    role=context.role,
-                    vision="",
-                    jd=jd_raw,
-                    requirements=[],
-                    preferred=[],
-                    recent_work="",
-                    raw_search=jd_raw,
-                )
-
-            if context.job_posting:
-                current += 1
-                print(f"\n[{current}/{total}] AnalyzerAgent — Claude 분석")
-                analyzer = AnalyzerAgent()
-                analyzer.run(context)
-                if context.analysis:
-                    save_analysis(context.analysis, OUTPUTS_DIR)
-            else:
-                print(f"\n[{current}/{total}] AnalyzerAgent — JobPosting 없음, 건너뜀")
-
-        # [write] WriterAgent — 자소서 초안
-        if "write" in steps and context.analysis:
-            current += 1
-            print(f"\n[{current}/{total}] WriterAgent — 자소서 매핑")
-            writer = WriterAgent()
-            result = writer.run(context)
-            print_result(result, verbose=args.verbose)
-            save_result(result, OUTPUTS_DIR)
-        elif "write" in steps:
-            print(f"\n[write] WriterAgent — Analysis 없음, 건너뜀")
-
+        run_pipeline(context, steps, agents, no_search=args.no_search, verbose=args.verbose)
     except KeyboardInterrupt:
         print("\n\n중단됨")
         sys.exit(1)
@@ -322,6 +528,8 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        close_agents(agents)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""ContentCache.get_or_compute — 같은 키는 1번만 계산"""
+
+import threading
+
+from core.cache import ContentCache, content_hash
+
+
+class _StaleFirstRead(ContentCache):
+    """첫 get()만 미스 — 잠금 전 확인과 잠금 사이에 다른 스레드가 계산을 끝낸 상황"""
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self._reads = 0
+
+    def get(self, key, max_age_sec=None):
+        self._reads += 1
+        if self._reads == 1:
+            return None
+        return super().get(key, max_age_sec=max_age_sec)
+
+
+def test_rechecks_cache_inside_lock(tmp_path):
+    key = content_hash("model", "prompt", "본문")
+    ContentCache(str(tmp_path)).put(key, "먼저 끝난 결과")
+    cache = _StaleFirstRead(str(tmp_path))
+
+    calls = []
+    value = cache.get_or_compute(key, lambda: calls.append(1) or "다시 계산")
+
+    assert value == "먼저 끝난 결과"
+    assert calls == []
+
+
+def test_concurrent_callers_compute_once(tmp_path):
+    cache = ContentCache(str(tmp_path))
+    key = content_hash("model", "prompt", "동시")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "요약"
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+    owner.start()
+    started.wait(5)
+    waiters = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+        for _ in range(4)
+    ]
+    for t in waiters:
+        t.start()
+    release.set()
+    for t in [owner, *waiters]:
+        t.join(5)
+
+    assert results == ["요약"] * 5
+    assert calls == [1]
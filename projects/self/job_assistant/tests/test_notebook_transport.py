@@ -0,0 +1,73 @@
+"""NotebookPublisher → StubServer 업로드 + _meta.json 증분 매니페스트"""
+
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from agents import notebook_publisher
+from agents.notebook_publisher import NotebookPublisher
+from core.message_bus import JobContext
+from core.models import SummarizedSource
+from core.notebook_transport import StubTransport
+
+
+def _sources(company_text: str = "회사 개요") -> list:
+    return [
+        SummarizedSource(title="JD 요약", content="직무 기술서", category="JD", model_used="haiku"),
+        SummarizedSource(title="회사 요약", content=company_text, category="COMPANY", model_used="haiku"),
+    ]
+
+
+def _publish(publisher: NotebookPublisher, sources: list) -> JobContext:
+    context = JobContext(task_id="t1", company="테스트사", role="퀀트", summarized_sources=sources)
+    publisher.run(context)
+    return context
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    monkeypatch.setattr(notebook_publisher, "NOTEBOOKS_DIR", str(tmp_path))
+    transport = StubTransport()
+    yield transport
+    transport.close()
+
+
+def test_publish_then_skip_unchanged_and_replace_changed(stub, tmp_path):
+    publisher = NotebookPublisher(transport=stub)
+
+    first = _publish(publisher, _sources())
+    notebook_id = first.notebook_result.notebook_id
+    meta_path = tmp_path / "테스트사_퀀트" / "_meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    ids = {s["category"]: s["source_id"] for s in meta["sources"]}
+    assert first.errors == []
+    assert set(stub.server.notebooks[notebook_id]["sources"]) == set(ids.values())
+
+    # 내용이 같으면 다시 올리지 않음 — 노트북·source_id 그대로
+    second = _publish(publisher, _sources())
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    assert second.notebook_result.notebook_id == notebook_id
+    assert {s["category"]: s["source_id"] for s in meta["sources"]} == ids
+    assert len(stub.server.notebooks) == 1
+
+    # 바뀐 소스만 새로 올리고 이전 소스는 삭제
+    _publish(publisher, _sources("회사 개요 (갱신)"))
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    new_ids = {s["category"]: s["source_id"] for s in meta["sources"]}
+    remote = stub.server.notebooks[notebook_id]["sources"]
+    assert new_ids["JD"] == ids["JD"]
+    assert new_ids["COMPANY"] != ids["COMPANY"]
+    assert set(remote) == set(new_ids.values())
+    assert remote[new_ids["COMPANY"]]["content"] == "회사 개요 (갱신)"
+
+
+def test_close_stops_stub_server():
+    transport = StubTransport()
+    url = transport.server.url
+    transport.close()
+    import httpx
+
+    with pytest.raises(httpx.HTTPError):
+        httpx.post(f"{url}/notebooks", json={"title": "x"}, timeout=1.0)
@@ -0,0 +1,48 @@
+"""SummarizerAgent._map_reduce — MAX_REDUCE_DEPTH 이후에도 최종 입력은 CHUNK_CHARS 이하"""
+
+import logging
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("anthropic")
+
+from agents import summarizer_agent
+from agents.summarizer_agent import CHUNK_CHARS, CHUNK_SEPARATOR, SummarizerAgent, _fit
+from core.cache import ContentCache
+
+
+def test_fit_keeps_every_chunk_under_limit():
+    chunks = [letter * 7000 for letter in "ABC"]
+    text, dropped = _fit(chunks)
+
+    assert len(text) <= CHUNK_CHARS
+    assert all(letter in text for letter in "ABC")
+    assert dropped == len(CHUNK_SEPARATOR.join(chunks)) - len(text)
+
+
+def test_fit_leaves_short_input_alone():
+    assert _fit(["a", "b"]) == ("a" + CHUNK_SEPARATOR + "b", 0)
+
+
+def test_depth_limit_forces_final_fit(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(summarizer_agent, "MAX_REDUCE_DEPTH", 1)
+    agent = SummarizerAgent.__new__(SummarizerAgent)
+    agent.name = "SummarizerAgent"
+    agent.logger = logging.getLogger("SummarizerAgent")
+    agent._cache = ContentCache(str(tmp_path))
+
+    inputs = []
+
+    def call(text, prompt):
+        # 줄이지 못하는 요약 — 부분 요약이 입력과 같은 길이
+        inputs.append(text)
+        return text
+
+    text = CHUNK_SEPARATOR.join(letter * 6000 for letter in "ABCD")
+    with caplog.at_level(logging.WARNING):
+        agent._map_reduce(text, "요약", "model", call)
+
+    assert len(inputs[-1]) <= CHUNK_CHARS
+    assert all(letter in inputs[-1] for letter in "ABCD")
+    assert "WARN" in caplog.text